@@ -0,0 +1,93 @@
+"""
+Benchmark: load and export times, CSV/xlsx path vs columnar (Parquet/Feather) path.
+
+The listing CSV is replicated to --rows rows, converted once with ep.convert_listing,
+then loaded back (full frame, column-pruned, partition-filtered). Derived summary tables
+are exported to xlsx (the notebook's current path) and to Parquet/Feather/CSV.
+
+Requires pyarrow; the xlsx rows are skipped when openpyxl is not installed.
+
+Usage:
+    python benchmarks/bench_columnar.py [--rows 1000000] [--repeat 3] [--csv bmw.csv]
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import eda_package as ep  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def make_csv(src, rows, workdir):
+    df = pd.read_csv(src, skipinitialspace=True)
+    reps = max(1, -(-rows // len(df)))
+    path = os.path.join(workdir, 'listing.csv')
+    pd.concat([df] * reps, ignore_index=True).iloc[:rows].to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(os.path.dirname(__file__), '..', 'bmw.csv'))
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_columnar_')
+    try:
+        csv_path = make_csv(args.csv, args.rows, workdir)
+        dataset = os.path.join(workdir, 'listing_parquet')
+
+        convert = best_of(lambda: ep.convert_listing(csv_path, dataset), 1)
+
+        results = [
+            ('load  csv (load_listing)', best_of(lambda: ep.load_listing(csv_path, headless=True), args.repeat)),
+            ('load  parquet, all columns', best_of(lambda: ep.load_listing_columnar(dataset), args.repeat)),
+            ('load  parquet, price+mileage', best_of(
+                lambda: ep.load_listing_columnar(dataset, columns=['price', 'mileage']), args.repeat)),
+            ('load  parquet, Hybrid/Electric', best_of(
+                lambda: ep.load_listing_columnar(dataset, filters=[('fuelType', 'in', ['Hybrid', 'Electric'])]),
+                args.repeat)),
+        ]
+
+        # Tabel turunan seperti di notebook: frame utama dan ringkasan CI per model/year
+        df = ep.load_listing_columnar(dataset)
+        summary = ep.segment_confidence_intervals(df, n_boot=0, top_n=None)
+        tables = {'tableaudfutama': df, 'dfno5': summary}
+        formats = ['.parquet', '.feather', '.csv']
+        if importlib.util.find_spec('openpyxl') is not None:
+            formats.append('.xlsx')
+        for name, table in tables.items():
+            for ext in formats:
+                path = os.path.join(workdir, name + ext)
+                repeat = 1 if ext == '.xlsx' else args.repeat
+                results.append((f'export {name}{ext}', best_of(lambda: ep.export_table(table, path), repeat)))
+
+        print(f"rows                            : {args.rows:,}")
+        print(f"convert csv -> parquet (once)   : {convert:8.3f} s")
+        for label, seconds in results:
+            print(f"{label:<32}: {seconds:8.3f} s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
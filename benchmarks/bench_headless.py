@@ -0,0 +1,82 @@
+"""
+Benchmark: full bmw.csv EDA workflow, interactive mode vs headless mode.
+
+Interactive mode is run with the non-interactive Agg backend and stdout discarded,
+so the measured difference is the cost of building figures and formatting output.
+
+Usage:
+    python benchmarks/bench_headless.py [--repeat 3] [--csv bmw.csv]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import eda_package as ep  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+
+def load(csv_path):
+    df = pd.read_csv(csv_path, skipinitialspace=True).reset_index(drop=True)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def workflow(df, headless):
+    num_cols = df.select_dtypes(include='number').columns.tolist()
+    cat_cols = df.select_dtypes(include=['object', 'string']).columns.tolist()
+
+    ep.data_explore(df, headless=headless)
+    ep.descriptive_statistics(df, headless=headless)
+    ep.plot_distributions(df, cat_cols, plot_type='categorical', headless=headless)
+    ep.plot_distributions(df, num_cols, plot_type='numeric', headless=headless)
+    ep.check_outlier(df[num_cols], plot=True, headless=headless)
+    ep.correlation_analysis(df, headless=headless)
+    ep.calculate_value_percentage(df, 'fuelType', plot=True, headless=headless)
+    ep.plot_relationship(df, None, ['fuelType'], kind='count', headless=headless)
+    ep.anova_analysis_with_input(df, 'fuelType', 'price', headless=headless)
+    ep.chi_square_analysis(df, 'fuelType', 'transmission', headless=headless)
+    plt.close('all')
+
+
+def time_workflow(df, headless, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            workflow(df, headless)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(os.path.dirname(__file__), '..', 'bmw.csv'))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = load(args.csv)
+    # Warm-up run so import and first-draw costs are not counted
+    time_workflow(df, headless=True, repeat=1)
+
+    interactive = time_workflow(df, headless=False, repeat=args.repeat)
+    headless = time_workflow(df, headless=True, repeat=args.repeat)
+
+    print(f"rows               : {len(df):,}")
+    print(f"interactive (Agg)  : {interactive:8.3f} s")
+    print(f"headless           : {headless:8.3f} s")
+    print(f"time saved         : {interactive - headless:8.3f} s ({(1 - headless / interactive) * 100:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: import time of eda_package, with a budget that can be used as a CI gate.
+
+Each run starts a fresh interpreter with `python -X importtime -c "import eda_package"`
+and reads the cumulative import time of eda_package from the importtime log. The run also
+checks that no heavy dependency (matplotlib, seaborn, scipy, sklearn, IPython) is loaded
+by the import itself; those are imported lazily on first use.
+
+Exit code is 1 when the best run exceeds --budget-ms or a heavy module is imported eagerly.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 1500]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'scipy', 'sklearn', 'IPython']
+
+PROBE = (
+    "import sys, eda_package; "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def import_once():
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    # importtime lines look like: "import time: self [us] | cumulative | package"
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*eda_package\s*$', line)
+        if match:
+            cumulative = int(match.group(2)) / 1000
+    loaded = [name for name in proc.stdout.strip().split(',') if name]
+    return cumulative, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1500.0)
+    args = parser.parse_args()
+
+    runs = [import_once() for _ in range(args.repeat)]
+    timings = [ms for ms, _ in runs]
+    eager = sorted({name for _, loaded in runs for name in loaded})
+
+    print(f"import eda_package (best)   : {min(timings):8.1f} ms")
+    print(f"import eda_package (median) : {sorted(timings)[len(timings) // 2]:8.1f} ms")
+    print(f"budget                      : {args.budget_ms:8.1f} ms")
+    print(f"heavy modules loaded eagerly: {', '.join(eager) if eager else '-'}")
+
+    if eager or min(timings) > args.budget_ms:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
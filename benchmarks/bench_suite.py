@@ -0,0 +1,226 @@
+"""
+Benchmark suite: wall time and peak memory of the eda_package hot paths on synthetic listings.
+
+Synthetic frames follow the bmw.csv schema. The source is read with ep.load_listing and cast to
+ep.LISTING_DTYPES (category keys, int16/int32/float32 numerics), so every case runs on the compact
+frame the notebook uses. Rows are resampled from bmw.csv, and price/mileage/mpg get
+multiplicative noise so that large frames do not consist of exact copies. A binary 'Status' column (price above the median) serves as the target for the
+binary-target functions.
+
+Every case runs in a forked child process. The child shares the generated frame copy-on-write,
+so a case that mutates the frame does not affect later cases. Lazy imports are warmed up in the
+parent before forking, so import time is not counted. A case that exceeds --timeout is
+killed and recorded as 'timeout'; a child that dies on its own (e.g. out of memory) is recorded
+as 'crashed'. Peak memory is the tracemalloc peak of the call, which covers
+numpy and pandas buffers. Plotting is disabled (headless mode, Agg backend) and the analysis
+cache is off.
+
+Results are written as JSON. When a baseline file exists, each case is compared with it. A case
+is flagged as a regression when its time or peak memory exceeds the baseline by more than
+--tolerance and by more than the --min-seconds / --min-mb noise floor. A case that used to finish
+and now times out or crashes is also flagged. A case that does not finish is always flagged and
+is never stored by --update-baseline. The exit code is 1 if any regression was found.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10000 1000000 10000000] [--only correlation_analysis]
+                                     [--timeout 300] [--output benchmarks/results.json]
+                                     [--baseline benchmarks/baseline.json] [--update-baseline]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+import eda_package as ep  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+NUMERIC = ['year', 'price', 'mileage', 'tax', 'mpg', 'engineSize']
+CATEGORICAL = ['model', 'transmission', 'fuelType']
+
+
+def synthetic_listing(n_rows, csv_path, seed=0):
+    """
+    Listing frame of n_rows with the bmw.csv schema and LISTING_DTYPES, resampled from csv_path with noise.
+    """
+    source = ep.load_listing(csv_path, headless=True).astype(ep.LISTING_DTYPES)
+    rng = np.random.default_rng(seed)
+    df = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+    for col, scale in [('price', 0.05), ('mileage', 0.10), ('mpg', 0.02)]:
+        noisy = df[col].to_numpy(dtype=np.float64) * rng.normal(1.0, scale, n_rows)
+        df[col] = np.maximum(noisy, 0).astype(df[col].dtype)
+    df['Status'] = (df['price'] > df['price'].median()).astype(np.int8)
+    return df
+
+
+# name -> callable(df); cases that do not take a target drop the synthetic 'Status' column
+CASES = {
+    'data_explore': lambda df: ep.data_explore(df[ep.LISTING_COLUMNS]),
+    'descriptive_statistics': lambda df: ep.descriptive_statistics(df[ep.LISTING_COLUMNS]),
+    'check_outlier': lambda df: ep.check_outlier(df[NUMERIC], plot=False),
+    'correlation_analysis': lambda df: ep.correlation_analysis(df[ep.LISTING_COLUMNS]),
+    'correlation_analysis_binary': lambda df: ep.correlation_analysis_binary(df, 'Status'),
+    'analyze_feature_correlations': lambda df: ep.analyze_feature_correlations(
+        df, target='Status', numeric_features=['price', 'mileage', 'mpg'],
+        ordinal_features=['year'], nominal_features=CATEGORICAL),
+    'anova_analysis_with_input': lambda df: ep.anova_analysis_with_input(df, 'fuelType', 'price'),
+    'chi_square_analysis': lambda df: ep.chi_square_analysis(df, 'fuelType', 'transmission'),
+}
+
+
+def _run_case(name, conn):
+    # Child process: _FRAME is inherited from the parent through fork
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        CASES[name](_FRAME)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.send({'status': 'ok', 'seconds': seconds, 'peak_mb': peak / 1024 ** 2})
+    except Exception as exc:  # recorded in the results, the suite keeps going
+        conn.send({'status': 'error', 'error': f'{type(exc).__name__}: {exc}'})
+    finally:
+        conn.close()
+
+
+def run_case(name, timeout):
+    ctx = multiprocessing.get_context('fork')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_case, args=(name, child))
+    proc.start()
+    child.close()
+    if parent.poll(timeout):
+        try:
+            result = parent.recv()
+        except EOFError:
+            # Child died without reporting (e.g. killed by the OOM killer)
+            proc.join()
+            return {'status': 'crashed', 'seconds': None, 'peak_mb': None, 'exitcode': proc.exitcode}
+    else:
+        proc.kill()
+        result = {'status': 'timeout', 'seconds': None, 'peak_mb': None}
+    proc.join()
+    return result
+
+
+def compare(results, baseline, tolerance, min_seconds, min_mb):
+    """
+    List of regression messages of results against baseline (both keyed by 'function@rows').
+    """
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if current['status'] != 'ok':
+            # A case that does not finish is always flagged, with or without a baseline entry
+            since = f" (baseline {base['seconds']:.3f} s)" if base is not None and base['status'] == 'ok' else ''
+            regressions.append(f"{key}: {current['status']}{since}")
+            continue
+        if base is None or base['status'] != 'ok':
+            continue
+        for metric, floor, unit in [('seconds', min_seconds, 's'), ('peak_mb', min_mb, 'MB')]:
+            old, new = base[metric], current[metric]
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{key}: {metric} {old:.3f} -> {new:.3f} {unit} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.path.join(HERE, '..', 'bmw.csv'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), default=None)
+    parser.add_argument('--timeout', type=float, default=300.0)
+    parser.add_argument('--output', default=os.path.join(HERE, 'results.json'))
+    parser.add_argument('--baseline', default=os.path.join(HERE, 'baseline.json'))
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-seconds', type=float, default=0.05)
+    parser.add_argument('--min-mb', type=float, default=5.0)
+    args = parser.parse_args()
+
+    global _FRAME
+    ep.set_headless(True)
+    ep.disable_cache()
+    names = args.only or list(CASES)
+
+    # Warm-up on a small frame in the parent: lazy imports (scipy, sklearn) and first-call costs
+    # are paid once here and inherited by every forked case
+    warm = synthetic_listing(1_000, args.csv)
+    for name in names:
+        CASES[name](warm.copy())
+
+    results = {}
+    print(f"{'case':<46}{'time (s)':>12}{'peak (MB)':>12}")
+    for n_rows in args.sizes:
+        _FRAME = synthetic_listing(n_rows, args.csv)
+        for name in names:
+            key = f'{name}@{n_rows}'
+            result = run_case(name, args.timeout)
+            result.update(function=name, rows=n_rows)
+            results[key] = result
+            if result['status'] == 'ok':
+                print(f"{key:<46}{result['seconds']:>12.3f}{result['peak_mb']:>12.1f}")
+            else:
+                print(f"{key:<46}{result['status']:>12}  {result.get('error', '')}")
+        _FRAME = None
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count(), 'numpy': np.__version__, 'pandas': pd.__version__},
+        'timeout': args.timeout,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)['results']
+        # Only the measured cases are replaced, other sizes/functions in the baseline are kept.
+        # Cases that did not finish are never stored as the expected result
+        failed = sorted(key for key, result in results.items() if result['status'] != 'ok')
+        report['results'] = {key: result for key, result in {**baseline, **results}.items()
+                             if result['status'] == 'ok'}
+        if failed:
+            print(f"not stored in baseline (did not finish): {', '.join(failed)}")
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("no baseline found, run with --update-baseline to store one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance, args.min_seconds, args.min_mb)
+    if regressions:
+        print("\nREGRESSIONS")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("no regressions against baseline")
+
+
+_FRAME = None
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+
+
+# Kurva depresiasi: log(price) = b0 + b_age * umur + b_mileage * (mileage / 10.000) per segmen.
+# Segmen tersusun bertingkat (global -> model -> model x fuelType); koefisien setiap segmen
+# di-shrink ke kurva induknya, sehingga segmen kecil (mis. i3 Electric) tetap punya kurva stabil.
+DEFAULT_LEVELS = (('model',), ('model', 'fuelType'))
+MILEAGE_UNIT = 10_000
+TERMS = ['intercept', 'age', 'mileage']
+
+
+@dataclass
+class DepreciationModel:
+    """
+    Hasil fit_depreciation. Level 0 adalah kurva global, level terakhir yang paling detail.
+
+    levels: list of tuple
+        Kolom kunci per level, mis. [(), ('model',), ('model', 'fuelType')].
+    keys: list of DataFrame
+        Nilai kunci setiap segmen per level (baris ke-i = segmen ke-i).
+    coef: list of ndarray
+        Koefisien (n_segmen, 3) per level, urutan TERMS.
+    sigma2: list of ndarray
+        Varians residual log-price per segmen (juga di-shrink ke induk).
+    n: list of ndarray
+        Jumlah listing per segmen.
+    reference_year: int
+        Tahun acuan untuk umur (age = reference_year - year).
+    prior_strength: float
+        Bobot kurva induk, dalam jumlah pseudo-listing.
+    """
+    levels: list
+    keys: list
+    coef: list
+    sigma2: list
+    n: list
+    reference_year: int
+    prior_strength: float
+    price_col: str = 'price'
+
+    def __post_init__(self):
+        # Lookup padat per level: kode per kolom kunci -> nomor segmen (-1 jika tidak ada)
+        self._vocabs, self._tables = [], []
+        for keys in self.keys:
+            vocabs = [pd.Index(pd.unique(keys[col])) for col in keys.columns]
+            shape = tuple(len(vocab) for vocab in vocabs)
+            table = np.full(int(np.prod(shape, dtype=np.int64)), -1, dtype=np.int64)
+            if vocabs:
+                flat = np.ravel_multi_index([vocab.get_indexer(keys[col]) for vocab, col in zip(vocabs, keys.columns)],
+                                            shape)
+                table[flat] = np.arange(len(keys))
+            else:
+                table[0] = 0
+            self._vocabs.append(vocabs)
+            self._tables.append(table)
+        self._offsets = np.cumsum([0] + [len(c) for c in self.coef])
+        self._all_coef = np.concatenate(self.coef)
+        self._all_sigma2 = np.concatenate(self.sigma2)
+
+    def _segment_codes(self, factorized, level):
+        # Nomor segmen setiap baris pada level ini, -1 jika kombinasi kunci tidak dikenal
+        vocabs, cols = self._vocabs[level], self.levels[level]
+        codes = [_key_codes(*factorized[col], vocab) for col, vocab in zip(cols, vocabs)]
+        known = np.logical_and.reduce([code >= 0 for code in codes])
+        shape = tuple(len(vocab) for vocab in vocabs)
+        flat = np.ravel_multi_index([np.where(known, code, 0) for code in codes], shape)
+        return np.where(known, self._tables[level][flat], -1)
+
+    def segment_index(self, df):
+        """
+        Baris koefisien (gabungan semua level) untuk setiap listing: level terdetail yang dikenal,
+        mundur ke level induk untuk kombinasi yang tidak ada saat fit.
+        """
+        # Setiap kolom kunci difaktorisasi sekali; per level hanya nilai uniknya yang dipetakan
+        factorized = {col: _factorize(df[col]) for cols in self.levels for col in cols}
+        index = np.full(len(df), self._offsets[0], dtype=np.int64)
+        for level in range(1, len(self.levels)):
+            codes = self._segment_codes(factorized, level)
+            index = np.where(codes >= 0, self._offsets[level] + codes, index)
+        return index
+
+    def predict(self, df, log=False, years_ahead=0, annual_mileage=0):
+        """
+        Prediksi harga untuk setiap listing (vektor penuh, tanpa loop per segmen).
+
+        Parameters:
+        df: DataFrame
+            Listing dengan kolom year, mileage, dan kolom kunci segmen.
+        log: bool, optional, default=False
+            True untuk log-price; False untuk harga harapan exp(mu + sigma^2 / 2).
+        years_ahead: float, optional, default=0
+            Umur tambahan, mis. lama kepemilikan armada.
+        annual_mileage: float, optional, default=0
+            Mileage tambahan per tahun selama years_ahead.
+
+        Returns:
+        Series dengan index yang sama dengan df.
+        """
+        index = self.segment_index(df)
+        age = self.reference_year - df['year'].to_numpy(dtype=np.float64) + years_ahead
+        mileage = (df['mileage'].to_numpy(dtype=np.float64) + years_ahead * annual_mileage) / MILEAGE_UNIT
+        coef = self._all_coef
+        mu = coef[index, 0] + coef[index, 1] * age + coef[index, 2] * mileage
+        values = mu if log else np.exp(mu + self._all_sigma2[index] / 2)
+        return pd.Series(values, index=df.index, name=f'log_{self.price_col}' if log else f'expected_{self.price_col}')
+
+    def residual_value(self, df, years=3, annual_mileage=8_000):
+        """
+        Harga harapan setelah listing dipakai `years` tahun dengan `annual_mileage` mil per tahun.
+        Bisa langsung dipakai sebagai objective optimize_fleet.
+        """
+        return self.predict(df, years_ahead=years, annual_mileage=annual_mileage).rename('residual_value')
+
+    def retention(self, df, years=3, annual_mileage=8_000):
+        """
+        Fraksi nilai yang tersisa setelah `years` tahun: residual_value / harga harapan saat ini.
+        """
+        now = self.predict(df, log=True)
+        later = self.predict(df, log=True, years_ahead=years, annual_mileage=annual_mileage)
+        return np.exp(later - now).rename('retention')
+
+    def coefficients(self, level=-1):
+        """
+        Tabel koefisien per segmen pada satu level, plus turunannya:
+        annual_depreciation (1 - exp(b_age)) dan per_10k_miles (1 - exp(b_mileage)).
+        """
+        level = level % len(self.levels)
+        table = self.keys[level].copy()
+        table[TERMS] = self.coef[level]
+        table['sigma'] = np.sqrt(self.sigma2[level])
+        table['n'] = self.n[level]
+        table['annual_depreciation'] = 1 - np.exp(table['age'])
+        table['per_10k_miles'] = 1 - np.exp(table['mileage'])
+        return table
+
+
+def _factorize(series):
+    # (kode baris, nilai unik); kolom category langsung memakai kode kategorinya
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+
+def _key_codes(codes, uniques, vocab):
+    # Kode baris ke vocab, -1 untuk nilai yang tidak ada di vocab atau missing
+    mapping = np.append(vocab.get_indexer(uniques), -1)
+    return mapping[np.where(codes >= 0, codes, len(uniques))]
+
+
+def _normal_equations(X, y, codes, n_groups):
+    # X'X (G, p, p), X'y (G, p), y'y dan n per segmen lewat bincount (satu pass per suku)
+    p = X.shape[1]
+    xtx = np.empty((n_groups, p, p))
+    for i in range(p):
+        for j in range(i, p):
+            xtx[:, i, j] = xtx[:, j, i] = np.bincount(codes, weights=X[:, i] * X[:, j], minlength=n_groups)
+    xty = np.column_stack([np.bincount(codes, weights=X[:, i] * y, minlength=n_groups) for i in range(p)])
+    yty = np.bincount(codes, weights=y * y, minlength=n_groups)
+    return xtx, xty, yty
+
+
+def _shrunk_solve(xtx, xty, yty, n, prior_coef, prior_xtx, prior_sigma2, strength):
+    """
+    Least squares bertumpuk dengan shrinkage ke kurva induk.
+
+    beta = (X'X + k S)^-1 (X'y + k S beta_induk), dengan S = X'X induk / n induk: setara dengan
+    menambahkan k pseudo-listing dari induk yang harganya mengikuti kurva induk.
+    """
+    p = xtx.shape[1]
+    A = xtx + strength * prior_xtx
+    b = xty + strength * np.einsum('gij,gj->gi', prior_xtx, prior_coef)
+    # Segmen yang tetap singular (mis. prior_strength=0 dengan satu tahun saja) memakai kurva induk
+    solvable = np.linalg.cond(A) < 1e12
+    A = np.where(solvable[:, None, None], A, np.eye(p))
+    coef = np.where(solvable[:, None], np.linalg.solve(A, b[..., None])[..., 0], prior_coef)
+    rss = yty - 2 * np.einsum('gi,gi->g', coef, xty) + np.einsum('gi,gij,gj->g', coef, xtx, coef)
+    dof = np.maximum(n - p, 0)
+    # Tanpa derajat bebas (prior_strength=0 dan n <= jumlah parameter) varians juga mewarisi induknya
+    weight = dof + strength
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma2 = (np.maximum(rss, 0) + strength * prior_sigma2) / weight
+    sigma2 = np.where(weight > 0, sigma2, prior_sigma2)
+    return coef, sigma2
+
+
+def fit_depreciation(df, levels=DEFAULT_LEVELS, prior_strength=20.0, reference_year=None, price_col='price'):
+    """
+    Fit kurva depresiasi log(price) ~ umur + mileage untuk semua segmen sekaligus.
+
+    Normal equations setiap segmen dihitung dengan bincount (tanpa loop Python per segmen) lalu
+    diselesaikan bertumpuk dengan np.linalg.solve. Setiap level di-shrink ke level sebelumnya
+    (global -> model -> model x fuelType).
+
+    Parameters:
+    df: DataFrame
+        Data listing dengan kolom year, mileage, price_col dan kolom kunci.
+    levels: sequence of tuple, optional, default=DEFAULT_LEVELS
+        Kolom kunci per level, dari kasar ke detail; setiap level harus memuat kolom level sebelumnya.
+    prior_strength: float, optional, default=20.0
+        Bobot kurva induk dalam jumlah pseudo-listing. 0 berarti OLS murni per segmen
+        (segmen yang singular mewarisi kurva induknya).
+    reference_year: int, optional, default=None
+        Tahun acuan umur. Default tahun terbaru di data.
+    price_col: str, optional, default='price'
+        Kolom harga.
+
+    Returns:
+    DepreciationModel
+    """
+    levels = [()] + [tuple(level) for level in levels]
+    for parent, child in zip(levels, levels[1:]):
+        if not set(parent) <= set(child):
+            raise ValueError(f"Level {child} harus memuat semua kolom level induk {parent}.")
+
+    price = df[price_col].to_numpy(dtype=np.float64)
+    # Hanya kolom yang dipakai yang ikut disalin
+    columns = list(dict.fromkeys([price_col, 'year', 'mileage'] + [col for cols in levels for col in cols]))
+    data = df.loc[(price > 0) & df['year'].notna().to_numpy() & df['mileage'].notna().to_numpy(), columns]
+    if reference_year is None:
+        reference_year = int(data['year'].max())
+    y = np.log(data[price_col].to_numpy(dtype=np.float64))
+    X = np.column_stack([np.ones(len(data)),
+                         reference_year - data['year'].to_numpy(dtype=np.float64),
+                         data['mileage'].to_numpy(dtype=np.float64) / MILEAGE_UNIT])
+
+    model_keys, coefs, sigmas, counts = [], [], [], []
+    parent_codes = None
+    for level, cols in enumerate(levels):
+        if cols:
+            grouped = data.groupby(list(cols), sort=True, observed=True, dropna=True)
+            codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+            keys = grouped.size().index.to_frame(index=False)
+        else:
+            codes = np.zeros(len(data), dtype=np.int64)
+            keys = pd.DataFrame(index=[0])
+        valid = codes >= 0
+        n_groups = len(keys)
+        if valid.all():
+            xtx, xty, yty = _normal_equations(X, y, codes, n_groups)
+        else:
+            xtx, xty, yty = _normal_equations(X[valid], y[valid], codes[valid], n_groups)
+        n = np.bincount(codes[valid], minlength=n_groups).astype(np.float64)
+
+        if parent_codes is None:
+            # Level global: OLS biasa
+            prior_coef = np.zeros((n_groups, X.shape[1]))
+            prior_xtx = np.zeros_like(xtx)
+            prior_sigma2 = np.zeros(n_groups)
+            strength = 0.0
+        else:
+            # Induk setiap segmen: kode induk dari salah satu barisnya (level bersarang)
+            parent = np.empty(n_groups, dtype=np.int64)
+            parent[codes[valid]] = parent_codes[valid]
+            parent_xtx = parent_stats / np.maximum(parent_n, 1)[:, None, None]
+            prior_coef, prior_xtx = coefs[-1][parent], parent_xtx[parent]
+            prior_sigma2 = sigmas[-1][parent]
+            strength = prior_strength
+
+        coef, sigma2 = _shrunk_solve(xtx, xty, yty, n, prior_coef, prior_xtx, prior_sigma2, strength)
+        model_keys.append(keys)
+        coefs.append(coef)
+        sigmas.append(sigma2)
+        counts.append(n.astype(np.int64))
+        parent_codes, parent_stats, parent_n = codes, xtx, n
+
+    return DepreciationModel(levels=levels, keys=model_keys, coef=coefs, sigma2=sigmas, n=counts,
+                             reference_year=reference_year, prior_strength=prior_strength, price_col=price_col)
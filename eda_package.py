@@ -1,21 +1,385 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.cm as cm
-import seaborn as sns
-from scipy.stats import chi2_contingency, pointbiserialr, kendalltau, spearmanr, pearsonr
-from IPython.display import display
-from sklearn.preprocessing import OrdinalEncoder # type: ignore
-from scipy import stats
-from sklearn.metrics import confusion_matrix, classification_report # type: ignore
+from dataclasses import dataclass, field
+from collections import OrderedDict
+import copy
+import functools
+import hashlib
+import importlib
+import itertools
+import json
+import logging
+import math
+import os
+import pickle
+import time
+import tracemalloc
+
+
+# Lazy import untuk dependency berat (matplotlib, seaborn, scipy.stats, IPython, sklearn).
+# Modul baru di-import saat atribut pertamanya dipakai, sehingga worker yang hanya memanggil
+# descriptive_statistics / persentase_missing_value tidak membayar waktu import plotting.
+class _LazyModule:
+    """
+    Proxy modul yang meng-import modul aslinya pada akses atribut pertama.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+plt = _LazyModule('matplotlib.pyplot')
+cm = _LazyModule('matplotlib.cm')
+sns = _LazyModule('seaborn')
+stats = _LazyModule('scipy.stats')
+pq = _LazyModule('pyarrow.parquet')
+
+
+def display(obj):
+    # IPython.display baru di-import saat ada output yang ditampilkan
+    from IPython.display import display as ipython_display
+    return ipython_display(obj)
+
+# 0. Headless mode
+# Saat HEADLESS aktif, fungsi-fungsi analisis tidak membuat figure, tidak memanggil print/display,
+# dan mengembalikan objek hasil terstruktur (DataFrame / dataclass) untuk dipakai di batch job.
+HEADLESS = False
+
+
+def set_headless(enabled=True):
+    """
+    Mengaktifkan atau menonaktifkan headless mode untuk seluruh modul.
+
+    Parameters:
+    enabled: bool, optional, default=True
+        True untuk mode batch tanpa figure dan tanpa output ke layar.
+    """
+    global HEADLESS
+    HEADLESS = bool(enabled)
+
+
+def _is_headless(headless):
+    # Argumen per-call menimpa pengaturan global
+    return HEADLESS if headless is None else headless
+
+
+# 0a. Instrumentation
+# Span waktu bernama di sekitar setiap fase internal (statistik, encoding, heatmap, display).
+# Tidak aktif sampai enable_instrumentation() dipanggil; saat tidak aktif span() hanya
+# mengembalikan context manager kosong yang sama sehingga biayanya hampir nol.
+_INSTRUMENTATION = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('inst', 'name', 'attrs', 'path', 'start', 'start_wall', 'mem_start', 'max_peak')
+
+    def __init__(self, inst, name, attrs):
+        self.inst = inst
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = self.inst.stack
+        self.path = (stack[-1].path + '/' if stack else '') + self.name
+        if self.inst.track_memory:
+            # Peak tracemalloc bersifat global: simpan peak yang berjalan ke span induk lalu reset
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].max_peak = max(stack[-1].max_peak, peak)
+            tracemalloc.reset_peak()
+            self.mem_start, self.max_peak = current, current
+        stack.append(self)
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        stack = self.inst.stack
+        stack.pop()
+        record = {
+            'span': self.path,
+            'name': self.name,
+            'depth': len(stack),
+            'start': self.start_wall,
+            'seconds': seconds,
+            'error': None if exc_type is None else exc_type.__name__,
+        }
+        if self.inst.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.max_peak = max(self.max_peak, peak)
+            tracemalloc.reset_peak()
+            if stack:
+                stack[-1].max_peak = max(stack[-1].max_peak, self.max_peak)
+            record['memory_peak_mb'] = (self.max_peak - self.mem_start) / 1024 ** 2
+            record['memory_delta_mb'] = (current - self.mem_start) / 1024 ** 2
+        if self.attrs:
+            record['attrs'] = self.attrs
+        self.inst.emit(record)
+        return False
+
+
+class MemorySink:
+    """
+    Sink yang menyimpan semua record span di memori (records), dengan ringkasan per fase.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def clear(self):
+        self.records = []
+
+    def summary(self):
+        """
+        Breakdown per span: count, total/mean/max detik, dan peak memori maksimum (jika dilacak).
+        """
+        if not self.records:
+            return pd.DataFrame(columns=['count', 'total_s', 'mean_s', 'max_s'])
+        frame = pd.DataFrame(self.records)
+        agg = {'count': ('seconds', 'size'), 'total_s': ('seconds', 'sum'),
+               'mean_s': ('seconds', 'mean'), 'max_s': ('seconds', 'max')}
+        if 'memory_peak_mb' in frame.columns:
+            agg['peak_mb'] = ('memory_peak_mb', 'max')
+        # Urutan span mengikuti kemunculan pertama agar fase tetap berurutan seperti di kode
+        return frame.groupby('span', sort=False).agg(**agg)
+
+
+class LoggingSink:
+    """
+    Sink yang menulis setiap span ke logger (default logger 'eda_package', level INFO).
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger if logger is not None else logging.getLogger('eda_package')
+        self.level = level
+
+    def __call__(self, record):
+        memory = f" peak={record['memory_peak_mb']:.1f}MB" if 'memory_peak_mb' in record else ''
+        self.logger.log(self.level, "span %s %.4fs%s", record['span'], record['seconds'], memory)
+
+
+class JsonLinesSink:
+    """
+    Sink yang menambahkan satu baris JSON per span ke file (mode append, aman untuk beberapa run).
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, record):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+
+
+class Instrumentation:
+    """
+    Pengumpul span aktif: meneruskan setiap record ke sink.
+
+    Parameters:
+    sink: callable
+        Dipanggil dengan satu dict per span (span, name, depth, start, seconds, error,
+        memory_peak_mb, memory_delta_mb, attrs).
+    track_memory: bool, optional, default=False
+        True untuk melacak peak memori per span dengan tracemalloc (menambah overhead alokasi).
+    """
+
+    def __init__(self, sink, track_memory=False):
+        self.sink = sink
+        self.track_memory = track_memory
+        self.stack = []
+        self._started_tracemalloc = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def emit(self, record):
+        self.sink(record)
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+def enable_instrumentation(sink='memory', track_memory=False):
+    """
+    Mengaktifkan span instrumentasi untuk seluruh modul dan mengembalikan Instrumentation-nya.
+
+    Parameters:
+    sink: str or callable, optional, default='memory'
+        'memory' (MemorySink, lihat .sink.summary()), 'logging' (LoggingSink), path file
+        berakhiran .jsonl (JsonLinesSink), atau callable(record) sendiri.
+    track_memory: bool, optional, default=False
+        Lacak peak memori per span dengan tracemalloc.
+    """
+    global _INSTRUMENTATION
+    if sink == 'memory':
+        sink = MemorySink()
+    elif sink == 'logging':
+        sink = LoggingSink()
+    elif isinstance(sink, str):
+        if not sink.endswith('.jsonl'):
+            raise ValueError("sink harus 'memory', 'logging', path .jsonl, atau callable.")
+        sink = JsonLinesSink(sink)
+    disable_instrumentation()
+    _INSTRUMENTATION = Instrumentation(sink, track_memory=track_memory)
+    return _INSTRUMENTATION
+
+
+def disable_instrumentation():
+    """
+    Menonaktifkan instrumentasi (tracemalloc dihentikan jika dimulai oleh enable_instrumentation).
+    """
+    global _INSTRUMENTATION
+    if _INSTRUMENTATION is not None:
+        _INSTRUMENTATION.close()
+    _INSTRUMENTATION = None
+
+
+def span(name, **attrs):
+    """
+    Context manager span bernama, mis. `with span('kendall'):`. Span bersarang diberi nama
+    berjenjang ('correlation_analysis/compute/kendall'). Tanpa instrumentasi aktif tidak melakukan apa pun.
+    """
+    if _INSTRUMENTATION is None:
+        return _NULL_SPAN
+    return _Span(_INSTRUMENTATION, name, attrs)
+
+
+def _traced(func):
+    # Span dengan nama fungsi di sekitar seluruh pemanggilan fungsi analisis publik
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _INSTRUMENTATION is None:
+            return func(*args, **kwargs)
+        with _Span(_INSTRUMENTATION, func.__name__, {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class DataExploreResult:
+    summary: pd.DataFrame
+    duplicates: pd.DataFrame
+
+
+@dataclass
+class CorrelationResult:
+    normal_cols: list
+    skewed_cols: list
+    object_cols: list
+    pearson: pd.DataFrame = None
+    pearson_pvalues: pd.DataFrame = None
+    spearman: pd.DataFrame = None
+    spearman_pvalues: pd.DataFrame = None
+    kendall: pd.DataFrame = None
+    kendall_pvalues: pd.DataFrame = None
+    # Mode approximate: ukuran sampel, ukuran populasi, dan {metode: (lower, upper)} CI korelasi
+    sample_size: int = None
+    population_size: int = None
+    bounds: dict = None
+
+
+@dataclass
+class BinaryCorrelationResult:
+    target_col: str
+    point_biserial: pd.DataFrame = None
+    chi_square: pd.DataFrame = None
+
+
+@dataclass
+class HypothesisTestResult:
+    test: str
+    target_col: str
+    feature_col: str
+    statistic: float
+    p_value: float
+    alpha: float
+    significant: bool
+    details: dict = field(default_factory=dict)
+
+
+@dataclass
+class ModelReportResult:
+    report_train: dict
+    report_test: dict
+    confusion_train: np.ndarray
+    confusion_test: np.ndarray
 
 # 1. Data Exploration
-def data_explore(df):
+@_traced
+def data_explore(df, headless=None, profile=False, top_k=10):
+    """
+    Menampilkan info DataFrame, jumlah missing value, unique value, dan baris duplikat.
+
+    Parameters:
+    df: DataFrame
+        DataFrame yang akan dieksplorasi.
+    headless: bool or None, optional, default=None
+        True untuk tidak menampilkan apa pun dan mengembalikan DataExploreResult.
+        None mengikuti pengaturan global HEADLESS.
+    profile: bool, optional, default=False
+        True untuk profil cepat pada data besar: hanya top_k nilai terbanyak per kolom
+        ('Top Unique Items') dan duplikat dihitung dari hash baris.
+    top_k: int, optional, default=10
+        Jumlah nilai unik terbanyak per kolom pada mode profile.
+    """
+    headless = _is_headless(headless)
+
     # Display DataFrame info
-    print("=== DataFrame Info ===")
-    df.info() 
-    print()
+    if not headless:
+        print("=== DataFrame Info ===")
+        df.info() 
+        print()
+
+    if profile:
+        result = _cached_call('data_explore_profile', _data_explore_profile, df, top_k)
+    else:
+        result = _cached_call('data_explore', _data_explore_compute, df)
+    if headless:
+        return result
+
+    summary = result.summary.copy()
+    summary['Missing Value Count'] = (summary['Missing Value Count'].astype(str) + ' ('
+                                      + summary['Missing Value Percentage'].map('{:.2f}%)'.format))
+    summary.drop(columns=['Missing Value Percentage'], inplace=True)
+
+    print("\n=== Missing & Unique Values ===")
+    display(summary)
+
+    print("\n=== Duplicate Values & Total Rows ===")
+    display(result.duplicates)
+
 
+def _data_explore_compute(df):
+    # Bagian data_explore yang mahal (duplicated, nunique, unique), hasilnya bisa di-cache
     # Count duplicates and total rows
     duplicates = df.duplicated().sum()
     total_rows = len(df)
@@ -29,9 +393,6 @@ def data_explore(df):
     permiss_val = (missing['Missing Value Count'] / total_rows) * 100
     permiss_val = permiss_val.reset_index(drop=True)
     missing['Missing Value Percentage'] = permiss_val
-    missing['Missing Value Count'] = missing.apply(
-        lambda row: f"{row['Missing Value Count']} ({row['Missing Value Percentage']:.2f}%)", axis=1)
-    missing.drop(columns=['Missing Value Percentage'], inplace=True)
 
     # DataFrame showing unique value counts per column
     unique_counts = df.nunique().reset_index()
@@ -54,41 +415,266 @@ def data_explore(df):
     summary = pd.merge(missing, unique_counts, on='Column')
     summary = pd.merge(summary, unique_items, on='Column')
 
-    print("\n=== Missing & Unique Values ===")
-    display(summary)
+    return DataExploreResult(summary=summary, duplicates=dup)
 
-    print("\n=== Duplicate Values & Total Rows ===")
-    display(dup)
+def _row_hash(df):
+    """
+    Hash 64-bit per baris untuk menghitung duplikat tanpa df.duplicated().
+
+    Setiap kolom diubah menjadi bit uint64 (kode kategori / factorize untuk object, bit nilai untuk
+    numerik) lalu digabung secara polinomial: h = h * P + bits (mod 2^64, P ganjil). Dua baris yang
+    berbeda di satu kolom saja tidak mungkin bertabrakan; selain itu peluang tabrakan ~ n^2 / 2^65.
+    """
+    prime = np.uint64(0x100000001B3)
+    h = np.zeros(len(df), dtype=np.uint64)
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            bits = series.cat.codes.to_numpy().astype(np.int64).view(np.uint64)
+        elif pd.api.types.is_float_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            # Samakan representasi NaN dan -0.0 agar nilai yang sama memberi bit yang sama
+            values = np.where(np.isnan(values), np.nan, values + 0.0)
+            bits = values.view(np.uint64)
+        elif pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans:
+            bits = series.to_numpy(dtype=np.int64).view(np.uint64)
+        else:
+            bits = pd.factorize(series)[0].astype(np.int64).view(np.uint64)
+        h *= prime
+        h += bits
+    return h
+
+
+def _data_explore_profile(df, top_k):
+    """
+    Versi data_explore untuk data besar: statistik per kolom tanpa list seluruh nilai unik.
+
+    Setiap kolom diproses sendiri (memori sementara satu kolom, bukan mask boolean selebar frame).
+    Nilai unik diringkas menjadi top_k nilai terbanyak; duplikat dihitung dari hash 64-bit per baris.
+    """
+    total_rows = len(df)
+    rows = []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Kolom kategori: frekuensi langsung dari kode (bincount), kode -1 adalah NaN
+            freq = np.bincount(series.cat.codes.to_numpy().astype(np.intp) + 1,
+                               minlength=len(series.cat.categories) + 1)[1:]
+            counts = pd.Series(freq, index=series.cat.categories)
+            counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        else:
+            # value_counts memakai hash table, ukurannya sebanding jumlah nilai unik
+            counts = series.value_counts(sort=True)
+        n_missing = total_rows - int(counts.sum())
+        top = counts.iloc[:top_k]
+        rows.append({
+            'Column': col,
+            'Missing Value Count': n_missing,
+            'Missing Value Percentage': n_missing / total_rows * 100 if total_rows else 0.0,
+            'Unique Value Count': len(counts),
+            'Top Unique Items': top.index.tolist(),
+            'Top Coverage (%)': top.sum() / total_rows * 100 if total_rows else 0.0,
+        })
+    summary = pd.DataFrame(rows)
+
+    # Duplikat dari hash baris: satu array uint64, tidak ada mask boolean per kolom
+    # (hash disort in-place, baris duplikat = hash yang sama dengan tetangganya)
+    row_hash = _row_hash(df)
+    row_hash.sort()
+    duplicates = int(np.count_nonzero(row_hash[1:] == row_hash[:-1]))
+
+    dup = pd.DataFrame({
+        'Category': ['Duplicate Rows Count', 'Total Rows Count'],
+        'Count': [duplicates, total_rows],
+        'Percentage': [duplicates / total_rows * 100 if total_rows else 0.0, 100]
+    })
+
+    return DataExploreResult(summary=summary, duplicates=dup)
 
 # 2. Descriptive Statistics (Central Tendency)
-def descriptive_statistics(df):
+DESCRIPTIVE_STATS = ['count', 'mean', 'median', 'mode', 'std', 'range', 'skew', 'kurtosis',
+                     'min', 'q1', 'q2', 'q3', 'max']
+
+
+def _grouped_moments(values, codes, n_groups):
+    """
+    Semua statistik deskriptif untuk satu kolom numerik per grup, dengan satu kali sort.
+
+    values dan codes sudah bebas NaN; codes adalah nomor grup 0..n_groups-1.
+    Hasil: dict {nama statistik: ndarray panjang n_groups}, definisi sama seperti pandas
+    (std ddof=1, skew/kurtosis adjusted Fisher-Pearson, quantile interpolasi linear, mode terkecil).
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    has = counts > 0
+    last = np.where(has, starts + counts - 1, 0)
+    first = np.where(has, starts, 0)
+
+    # Momen dihitung langsung dari data asli (urutan tidak berpengaruh)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nobs = counts.astype(np.float64)
+        mean = np.bincount(codes, weights=values, minlength=n_groups) / nobs
+        dev = values - mean[codes]
+        dev2 = dev * dev
+        m2 = np.bincount(codes, weights=dev2, minlength=n_groups)
+        m3 = np.bincount(codes, weights=dev2 * dev, minlength=n_groups)
+        m4 = np.bincount(codes, weights=dev2 * dev2, minlength=n_groups)
+
+        std = np.sqrt(m2 / (nobs - 1))
+        skew = (nobs * (nobs - 1) ** 0.5 / (nobs - 2)) * (m3 / m2 ** 1.5)
+        kurt = (nobs * (nobs + 1) * (nobs - 1) * m4 / ((nobs - 2) * (nobs - 3) * m2 ** 2)
+                - 3 * (nobs - 1) ** 2 / ((nobs - 2) * (nobs - 3)))
+        skew = np.where(m2 == 0, 0.0, skew)
+        kurt = np.where(m2 == 0, 0.0, kurt)
+        skew = np.where(nobs < 3, np.nan, skew)
+        kurt = np.where(nobs < 4, np.nan, kurt)
+
+    # Satu sort per kolom untuk min, max, median, kuartil, dan modus:
+    # data dipartisi per grup (stable counting sort pada kode grup), lalu tiap blok disort in-place
+    if n_groups == 1:
+        v = np.sort(values)
+        g = np.zeros(len(v), dtype=np.int64)
+    else:
+        order = np.argsort(codes.astype(np.min_scalar_type(n_groups)), kind='stable')
+        v = values[order]
+        g = codes[order]
+        for start, count in zip(starts[has], counts[has]):
+            v[start:start + count].sort()
+
+    def quantile(q):
+        pos = q * (counts - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        lo_val = v[np.where(has, starts + lo, 0)]
+        hi_val = v[np.where(has, starts + hi, 0)]
+        return np.where(has, lo_val + (pos - lo) * (hi_val - lo_val), np.nan)
+
+    # Modus: run terpanjang pada data yang sudah tersortir, ambil nilai terkecil jika seri
+    run_start = np.flatnonzero(np.r_[True, (v[1:] != v[:-1]) | (g[1:] != g[:-1])])
+    run_len = np.diff(np.r_[run_start, len(v)])
+    run_group = g[run_start]
+    best = np.lexsort((run_start, -run_len, run_group))
+    _, first_run = np.unique(run_group[best], return_index=True)
+    mode = np.full(n_groups, np.nan)
+    mode[run_group[best][first_run]] = v[run_start[best][first_run]]
+
+    vmin = np.where(has, v[first], np.nan)
+    vmax = np.where(has, v[last], np.nan)
+
+    return {
+        'count': counts,
+        'mean': mean,
+        'median': quantile(0.50),
+        'mode': mode,
+        'std': std,
+        'range': vmax - vmin,
+        'skew': skew,
+        'kurtosis': kurt,
+        'min': vmin,
+        'q1': quantile(0.25),
+        'q2': quantile(0.50),
+        'q3': quantile(0.75),
+        'max': vmax,
+    }
+
+
+def descriptive_table(df, by=None, columns=None):
+    """
+    Menghitung seluruh statistik deskriptif untuk semua kolom numerik dalam satu engine.
+
+    Parameters:
+    df: DataFrame
+        DataFrame input.
+    by: str or list, optional, default=None
+        Kolom pengelompokan (mis. 'fuelType' atau ['fuelType', 'model']).
+    columns: list, optional, default=None
+        Kolom numerik yang dihitung. Default semua kolom numerik selain kolom `by`.
+
+    Returns:
+    DataFrame dengan baris kolom (atau (grup..., kolom) jika `by` diberikan) dan kolom DESCRIPTIVE_STATS.
+    """
+    by_cols = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    if columns is None:
+        columns = [col for col in df.select_dtypes(include='number').columns if col not in by_cols]
+
+    if by_cols:
+        grouped = df.groupby(by_cols, sort=True, observed=True)
+        group_codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        group_index = grouped.size().index
+    else:
+        group_codes = np.zeros(len(df), dtype=np.int64)
+        group_index = None
+    n_groups = 1 if group_index is None else len(group_index)
+
+    frames = []
+    for col in columns:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values) & (group_codes >= 0)
+        result = _grouped_moments(values[valid], group_codes[valid], n_groups)
+        frames.append(pd.DataFrame(result, columns=DESCRIPTIVE_STATS).assign(column=col))
+
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=DESCRIPTIVE_STATS + ['column'])
+
+    if group_index is None:
+        return table.set_index('column').rename_axis(None)
+
+    # Susun index (grup..., kolom), urut per grup lalu kolom
+    group_frame = group_index.to_frame(index=False)
+    keys = pd.concat([group_frame] * len(columns), ignore_index=True)
+    table = pd.concat([keys, table], axis=1).set_index(by_cols + ['column'])
+    return table.sort_index(level=list(range(len(by_cols))), sort_remaining=False)
+
+
+@_traced
+def descriptive_statistics(df, by=None, headless=None):
     """
     Calculates descriptive statistics such as mean, median, standard deviation, max, min, and quartiles.
     Also includes skewness and kurtosis.
+
+    All statistics for all numeric columns come from descriptive_table (one sort per column).
+    Use by='fuelType' (or a list of columns) to get the same statistics per group.
+    df may also be a StreamingStats accumulator built over a chunked stream.
+    In headless mode nothing is printed and the columns-by-statistics DataFrame is returned.
     """
-    # Loop through each numeric column in the dataframe
-    for col in df.select_dtypes(exclude=object).columns:  # Only for numeric columns
-        print(f"\nDescriptive Statistics for column ====> {col}")
-        print(f"Mean                         : {df[col].mean():,.2f}")
-        print(f"Median                       : {df[col].median():,.2f}")
-        print(f"Mode                         : {df[col].mode()[0]:,.2f}")
-        print(f"Standard Deviation           : {df[col].std():,.2f}")
+    headless = _is_headless(headless)
+
+    if isinstance(df, StreamingStats):
+        if by is not None:
+            raise ValueError("by= tidak didukung untuk StreamingStats.")
+        table = df.describe()
+    else:
+        table = descriptive_table(df, by=by)
+
+    if headless:
+        return table
+
+    for key, st in table.iterrows():
+        if by is None:
+            print(f"\nDescriptive Statistics for column ====> {key}")
+        else:
+            *group, col = key if isinstance(key, tuple) else (key,)
+            print(f"\nDescriptive Statistics for column ====> {col} ({by} = {', '.join(map(str, group))})")
+        print(f"Mean                         : {st['mean']:,.2f}")
+        print(f"Median                       : {st['median']:,.2f}")
+        print(f"Mode                         : {st['mode']:,.2f}")
+        print(f"Standard Deviation           : {st['std']:,.2f}")
         
         # Calculate and display range (max - min)
-        range_value = df[col].max() - df[col].min()
-        print(f"Range                         : {range_value:,.2f}")
+        print(f"Range                         : {st['range']:,.2f}")
         
         # Skewness and Kurtosis
-        print(f"Skewness                      : {df[col].skew():.2f}")
-        print(f"Kurtosis                      : {df[col].kurt():.2f}")
-        print(f"Minimum Value (Min)          : {df[col].min():.2f}")
-        print(f"Quartile 1 Distribution       : {df[col].quantile(0.25):.2f}")
-        print(f"Quartile 2 Distribution       : {df[col].quantile(0.50):.2f}")
-        print(f"Quartile 3 Distribution       : {df[col].quantile(0.75):.2f}")
-        print(f"Maximum Value (Max)          : {df[col].max():.2f}")
+        print(f"Skewness                      : {st['skew']:.2f}")
+        print(f"Kurtosis                      : {st['kurtosis']:.2f}")
+        print(f"Minimum Value (Min)          : {st['min']:.2f}")
+        print(f"Quartile 1 Distribution       : {st['q1']:.2f}")
+        print(f"Quartile 2 Distribution       : {st['q2']:.2f}")
+        print(f"Quartile 3 Distribution       : {st['q3']:.2f}")
+        print(f"Maximum Value (Max)          : {st['max']:.2f}")
 
 # 3. Plot Distribution
-def plot_distributions(df, columns, plot_type='categorical', kde=False, n_cols=3):
+@_traced
+def plot_distributions(df, columns, plot_type='categorical', kde=False, n_cols=3, headless=None, approx=None,
+                       aggregate=None):
     """
     Function to plot distributions of categorical and numeric variables.
     
@@ -103,22 +689,69 @@ def plot_distributions(df, columns, plot_type='categorical', kde=False, n_cols=3
         If True, adds KDE to the numeric plot.
     n_cols: int, optional, default=3
         Number of columns in the plot layout (number of plots per row).
+    headless: bool or None, optional, default=None
+        If True, no figure is built. None follows the module-wide HEADLESS setting.
+    approx: bool, int or StratifiedSample, optional, default=None
+        Approximate mode for large frames. Numeric histograms are drawn from a stratified sample
+        (True for the default size, an int for a sample size) weighted back to the population;
+        categorical counts stay exact. The sample size is shown in each title.
+    aggregate: bool or None, optional, default=None
+        If True, counts and histograms are computed once (value_counts / np.histogram) and drawn
+        from those aggregates instead of passing raw rows to seaborn. None switches to this path
+        for frames with at least AGGREGATE_ROWS rows.
     """
+    if plot_type not in ('categorical', 'numeric'):
+        raise ValueError("plot_type must be 'categorical' or 'numeric'")
+    if _is_headless(headless):
+        return
+
+    sample = None
+    if approx and plot_type == 'numeric':
+        with span('sample'):
+            sample = _resolve_sample(df, approx)
     
     n_vars = len(columns)
     n_rows = (n_vars + n_cols - 1) // n_cols  # Calculate number of rows for plots
     
     fig = plt.figure(figsize=(20, 4*n_rows))
+
+    if _use_aggregate(aggregate, len(df)):
+        with span('aggregate'):
+            if sample is not None:
+                aggregates = distribution_aggregates(sample.data, columns, plot_type, kde, weights=sample.weights)
+            else:
+                aggregates = distribution_aggregates(df, columns, plot_type, kde)
+        for i, agg in enumerate(aggregates, 1):
+            if sample is not None:
+                agg.title += f' (sample n={sample.sample_size:,} of {sample.n_rows:,})'
+            ax = plt.subplot(n_rows, n_cols, i)
+            draw_aggregate(agg, ax)
+            ax.tick_params(axis='x', labelrotation=45)
+        plt.tight_layout()
+        plt.show()
+        return
     
     # Loop through each selected column
     for i, var in enumerate(columns, 1):
         plt.subplot(n_rows, n_cols, i)
         
-        if plot_type == 'categorical':
+        if plot_type == 'categorical' and approx:
+            # Hitungan kategori exact dari value_counts, tanpa countplot di atas seluruh baris
+            counts = df[var].value_counts(sort=False)
+            sns.barplot(x=counts.index.astype(str), y=counts.to_numpy())
+            plt.title(f'Distribution of {var} (exact counts, n={len(df):,})')
+            plt.xticks(rotation=45)
+
+        elif plot_type == 'categorical':
             sns.countplot(data=df, x=var)
             plt.title(f'Distribution of {var}')
             plt.xticks(rotation=45)
         
+        elif plot_type == 'numeric' and sample is not None:
+            sns.histplot(x=sample.data[var], weights=sample.weights, kde=kde)
+            plt.title(f'Distribution of {var} (sample n={sample.sample_size:,} of {sample.n_rows:,})')
+            plt.xticks(rotation=45)
+
         elif plot_type == 'numeric':
             if kde:
                 sns.histplot(data=df, x=var, kde=True)
@@ -134,14 +767,17 @@ def plot_distributions(df, columns, plot_type='categorical', kde=False, n_cols=3
     plt.show()
 
 # 4. Check Outliers
-def check_outlier(X_train_num, plot=True):
+@_traced
+def check_outlier(X_train_num, plot=True, headless=None):
     """
     Menghitung batas bawah, batas atas, dan persentase outlier untuk fitur numerik.
     Juga menampilkan plot distribusi tiap fitur dengan batas outlier.
 
     Parameters:
-    - X_train_num: DataFrame berisi fitur numerik dari data training.
+    - X_train_num: DataFrame berisi fitur numerik dari data training, atau StreamingStats
+      (batas dan persentase outlier dihitung dari akumulator, tanpa plot).
     - plot: Boolean, jika True maka akan memunculkan plot distribusi setiap fitur.
+    - headless: Boolean atau None, jika True plot tidak dibuat (None mengikuti HEADLESS global).
 
     Returns:
     - DataFrame dengan kolom:
@@ -149,355 +785,892 @@ def check_outlier(X_train_num, plot=True):
         'lower_boundary', 'upper_boundary', 'percentage_total_outlier'
     """
 
-    column = []
-    skew_vals = []
-    distribusi = []
-    lower_bound = []
-    upper_bound = []
-    percent_total_outlier = []
+    if isinstance(X_train_num, StreamingStats):
+        return _check_outlier_stream(X_train_num)
 
-    for i, col in enumerate(X_train_num.columns):
-        skew_val = round(X_train_num[col].skew(), 1)
-        distrib = 'normal' if -0.5 <= skew_val <= 0.5 else 'skewed'
-        
-        # Hitung batas bawah & atas berdasarkan distribusi
-        if distrib == 'skewed':
-            Q1 = X_train_num[col].quantile(0.25)
-            Q3 = X_train_num[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower = Q1 - 3 * IQR
-            upper = Q3 + 3 * IQR
-        else:
-            mean = X_train_num[col].mean()
-            std = X_train_num[col].std()
-            lower = mean - 3 * std
-            upper = mean + 3 * std
-
-        # Hitung persentase outlier
-        n_upper = (X_train_num[col] > upper).sum()
-        n_lower = (X_train_num[col] < lower).sum()
-        outlier_percent = ((n_upper + n_lower) / len(X_train_num)) * 100
-
-        # Simpan semua nilai
-        column.append(col)
-        skew_vals.append(skew_val)
-        distribusi.append(distrib)
-        lower_bound.append(round(lower, 2))
-        upper_bound.append(round(upper, 2))
-        percent_total_outlier.append(outlier_percent)
-
-        # Plot distribusi dan batas
-        if plot:
+    if _is_headless(headless):
+        plot = False
+
+    outliers = _cached_call('check_outlier', _check_outlier_compute, X_train_num)
+
+    # Plot distribusi dan batas
+    if plot:
+        for _, row in outliers.iterrows():
+            col = row['column']
             plt.figure(figsize=(8, 2))
             sns.boxplot(x=X_train_num[col], color='skyblue')
-            plt.axvline(lower, color='green', linestyle='--', label='Lower Bound')
-            plt.axvline(upper, color='red', linestyle='--', label='Upper Bound')
-            plt.title(f'Boxplot Fitur: {col} (Skewness: {skew_val})')
+            plt.axvline(row['lower_boundary'], color='green', linestyle='--', label='Lower Bound')
+            plt.axvline(row['upper_boundary'], color='red', linestyle='--', label='Upper Bound')
+            plt.title(f'Boxplot Fitur: {col} (Skewness: {row["Skewness Value"]})')
             plt.xlabel(col)
             plt.legend()
             plt.tight_layout()
             plt.show()
 
+    return outliers
 
-    # Buat DataFrame hasil
-    outliers = pd.DataFrame({
-        'column': column,
-        'Skewness Value': skew_vals,
-        'Distribusi': distribusi,
-        'lower_boundary': lower_bound,
-        'upper_boundary': upper_bound,
-        'percentage_total_outlier (%)': percent_total_outlier
-    })
 
-    return outliers
+def _check_outlier_compute(X_train_num):
+    result = detect_outliers(X_train_num)
+    return result.table
 
-# 5. Correlation Analysis
-def correlation_analysis(df, nilai_skew=0.5):
-    """
-    Menghitung dan memvisualisasikan korelasi antar fitur numerik.
-    
-    - Pearson: jika semua kolom numerik berskew rendah (< nilai_skew)
-    - Spearman: jika ada kolom dengan skew tinggi
-    - Point-Biserial: jika disediakan target_col biner
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        Dataset input
-    target_col : str or None
-        Nama kolom target biner (default None)
-    nilai_skew : float
-        Batas ambang skewness (default 0.5)
-    alpha : float
-        Level signifikansi untuk Point-Biserial correlation (default 0.05)
-    """
 
-    # Pilih kolom object
-    df_obj = df.select_dtypes(include='object')    
-    # Pilih kolom numerik saja
-    df_num = df.select_dtypes(include='number')
+# 4a. Vectorized outlier engine
+@dataclass
+class OutlierBounds:
+    # Batas per kolom (tidak dibulatkan), bisa di-fit di data training lalu dipakai ke batch baru
+    columns: list
+    skew: np.ndarray
+    distribution: list
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+@dataclass
+class OutlierResult:
+    bounds: OutlierBounds
+    table: pd.DataFrame
+    row_mask: pd.Series
+    column_mask: pd.DataFrame
 
-    # Deteksi kolom normal dan skewed berdasarkan skewness
-    normal_cols = []
-    skewed_cols = []
-    object_cols = []
 
-    for col in df_num.columns:
-        skew_val = df[col].skew()
-        if abs(skew_val) < nilai_skew:
-            normal_cols.append(col)
+def _batched_moments(values, has_nan):
+    # count, mean, std (ddof=1), dan skew (adjusted Fisher-Pearson seperti pandas) untuk semua kolom sekaligus
+    if has_nan:
+        valid = ~np.isnan(values)
+        nobs = valid.sum(axis=0).astype(np.float64)
+    else:
+        nobs = np.full(values.shape[1], float(values.shape[0]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if has_nan:
+            mean = np.where(valid, values, 0.0).sum(axis=0) / nobs
+            dev = np.where(valid, values - mean, 0.0)
         else:
-            skewed_cols.append(col)
-    
-    for col in df_obj.columns:
-        object_cols.append(col)
+            mean = values.mean(axis=0)
+            dev = values - mean
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0)
+        m3 = (dev2 * dev).sum(axis=0)
+        std = np.sqrt(m2 / (nobs - 1))
+        skew = (nobs * (nobs - 1) ** 0.5 / (nobs - 2)) * (m3 / m2 ** 1.5)
+    skew = np.where(m2 == 0, 0.0, skew)
+    skew = np.where(nobs < 3, np.nan, skew)
+    return nobs, mean, std, skew
 
-    print(f"Normal Distribution Columns   : {normal_cols if normal_cols else '-- Tidak ada kolom normal --'}")
-    print(f"Skewed Distribution Columns   : {skewed_cols if skewed_cols else '-- Tidak ada kolom skewed --'}")
-    print(f"Object Columns                : {object_cols if object_cols else '-- Tidak ada kolom object --'}")
-    print()
 
-    # Tentukan metode korelasi utama
-    if len(normal_cols) > 0:
-        method = 'pearson'
-        print(f"Using correlation method      : {method.upper()} ===> {normal_cols}")
-        corr_matrix_pearson = df_num.corr(method=method)
-        
-        # Visualisasi korelasi antar fitur numerik
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix_pearson, annot=True, cmap='coolwarm', fmt='.2f', cbar=True)
-        # plt.xticks(rotation=45)
-        plt.title(f"Correlation Matrix ({method.capitalize()})")
-        plt.tight_layout()
-        plt.show()
-        pval_pearson = pd.DataFrame(np.ones_like(corr_matrix_pearson), columns=df_num.columns, index=df_num.columns)
+def _batched_quartiles(values, has_nan):
+    # Q1 dan Q3 (interpolasi linear) semua kolom; tanpa NaN cukup satu np.partition per kolom
+    if has_nan:
+        return np.nanquantile(values, [0.25, 0.75], axis=0)
+    n = values.shape[0]
+    if n == 0:
+        return np.full((2, values.shape[1]), np.nan)
+    pos = np.array([0.25, 0.75]) * (n - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, n - 1)
+    part = np.partition(values, np.unique(np.r_[lo, hi]), axis=0)
+    return part[lo] + (pos - lo)[:, None] * (part[hi] - part[lo])
 
-        for i in normal_cols:
-            for j in normal_cols:
-                if i != j:
-                    _, pval = pearsonr(df[i], df[j])
-                    pval_pearson.loc[i, j] = pval
-                else:
-                    pval_pearson.loc[i, j] = 0.0  # diagonal
 
-        # Menyertakan p-value pada matrix signifikansi
-        signif_pearson = pval_pearson < 0.05
-        print(f"\nSignificance Matrix (p < 0.05) - Pearson:")
-        signif_pearson_with_pval = signif_pearson.astype(str) + ' (' + pval_pearson.round(4).astype(str) + ')'
-        display(signif_pearson_with_pval)
+def _bounds_from_stats(columns, skew, mean, std, q1, q3, nilai_skew, k):
+    skew = np.round(skew, 1)
+    normal = (skew >= -nilai_skew) & (skew <= nilai_skew)
+    iqr = q3 - q1
+    lower = np.where(normal, mean - k * std, q1 - k * iqr)
+    upper = np.where(normal, mean + k * std, q3 + k * iqr)
+    distribution = ['normal' if flag else 'skewed' for flag in normal]
+    return OutlierBounds(columns=list(columns), skew=skew, distribution=distribution, lower=lower, upper=upper)
 
 
-    if len(skewed_cols) > 0:
-        method = 'spearman'
-        print(f"Using correlation method      : {method.upper()} ===> {skewed_cols}")
-        corr_matrix_spearman = df_num.corr(method=method)
-
-        # Visualisasi korelasi antar fitur numerik
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix_spearman, annot=True, cmap='coolwarm', fmt='.2f', cbar=True)
-        # plt.xticks(rotation=45)
-        plt.title(f"Correlation Matrix ({method.capitalize()})")
-        plt.tight_layout()
-        plt.show()
+def fit_outlier_bounds(X, nilai_skew=0.5, k=3):
+    """
+    Menghitung batas outlier semua kolom numerik sekaligus (aturan sama dengan check_outlier).
 
-        pval_spearman = pd.DataFrame(np.ones_like(corr_matrix_spearman), columns=df_num.columns, index=df_num.columns)
+    Kolom dengan |skew| <= nilai_skew memakai mean +- k*std, kolom lain Q1 - k*IQR dan Q3 + k*IQR.
 
-        for i in skewed_cols:
-            for j in skewed_cols:
-                if i != j:
-                    _, pval = spearmanr(df[i], df[j])
-                    pval_spearman.loc[i, j] = pval
-                else:
-                    pval_spearman.loc[i, j] = 0.0
+    Parameters:
+    X: DataFrame or StreamingStats
+        Data training. StreamingStats memakai momen dan QuantileSketch dari akumulator
+        (kuantil approximate setelah sketch terkompresi).
+    nilai_skew: float, optional, default=0.5
+        Batas skewness untuk distribusi 'normal'.
+    k: float, optional, default=3
+        Pengali std / IQR.
 
-        # Menyertakan p-value pada matrix signifikansi
-        signif_spearman = pval_spearman < 0.05
-        print(f"\nSignificance Matrix (p < 0.05) - Spearman:")
-        signif_spearman_with_pval = signif_spearman.astype(str) + ' (' + pval_spearman.round(4).astype(str) + ')'
-        display(signif_spearman_with_pval)
+    Returns:
+    OutlierBounds
+    """
+    if isinstance(X, StreamingStats):
+        table = X.describe()
+        return _bounds_from_stats(table.index, table['skew'].to_numpy(), table['mean'].to_numpy(),
+                                  table['std'].to_numpy(), table['q1'].to_numpy(), table['q3'].to_numpy(),
+                                  nilai_skew, k)
 
-    if object_cols:   
-        # Encoding
-        encoder = OrdinalEncoder()
-        df_obj_encoded = df_obj.copy()
-        df_obj_encoded[:] = encoder.fit_transform(df_obj)
-
-        method = 'kendall'
-        print(f"Using correlation method      : {method.upper()}")
-        # Hitung korelasi Kendall's tau manual karena pandas .corr() tidak mendukung kendall untuk DataFrame
-        corr_matrix_kendalltau = df_obj_encoded.corr(method=method)
- 
-        # Visualisasi
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix_kendalltau.astype(float), annot=True, cmap='coolwarm', fmt='.2f', cbar=True)
-        # plt.xticks(rotation=45)
-        plt.title("Correlation Matrix (KENDALL) due to object columns")
-        plt.tight_layout()
-        plt.show()
+    X = X.select_dtypes(include='number')
+    # Satu array 2D (kolom kontigu) untuk semua kolom numerik
+    values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+    has_nan = bool(np.isnan(values).any())
+    _, mean, std, skew = _batched_moments(values, has_nan)
+    q1, q3 = _batched_quartiles(values, has_nan)
+    return _bounds_from_stats(X.columns, skew, mean, std, q1, q3, nilai_skew, k)
 
-        pval_kendall = pd.DataFrame(np.ones_like(corr_matrix_kendalltau), columns=df_obj.columns, index=df_obj.columns)
 
-        for i in object_cols:
-            for j in object_cols:
-                if i != j:
-                    _, pval = kendalltau(df_obj_encoded[i], df_obj_encoded[j])
-                    pval_kendall.loc[i, j] = pval
-                else:
-                    pval_kendall.loc[i, j] = 0.0
+def apply_outlier_bounds(X, bounds):
+    """
+    Menerapkan batas outlier ke data (mis. batch baru) dengan satu perbandingan broadcast.
 
-        # Menyertakan p-value pada matrix signifikansi
-        signif_kendall = pval_kendall < 0.05
-        print(f"\nSignificance Matrix (p < 0.05) - Kendall:")
-        signif_kendall_with_pval = signif_kendall.astype(str) + ' (' + pval_kendall.round(4).astype(str) + ')'
-        display(signif_kendall_with_pval)
+    Parameters:
+    X: DataFrame
+        Data yang berisi semua kolom pada bounds.columns.
+    bounds: OutlierBounds
+        Hasil fit_outlier_bounds.
 
-# 6. Point-Bisserial Correlation
-# Fungsi untuk menghitung Cramer's V
-def cramer_v(contingency_table):
-    chi2, p_val, dof, ex = chi2_contingency(contingency_table)
-    n = contingency_table.sum().sum()
-    return np.sqrt(chi2 / (n * (min(contingency_table.shape) - 1)))
+    Returns:
+    OutlierResult dengan table (format check_outlier), row_mask (True jika ada kolom yang outlier),
+    dan column_mask (mask outlier per kolom).
+    """
+    values = X[bounds.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    mask = (values < bounds.lower) | (values > bounds.upper)
+    n_rows = len(X)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = mask.sum(axis=0) / n_rows * 100
 
-def correlation_analysis_binary(df, target_col, alpha=0.05, h0=None, h1=None, show=True):
-    # Periksa apakah kolom target ada dalam DataFrame
-    if target_col not in df.columns:
-        print(f"Kolom target '{target_col}' tidak ditemukan.")
-        return
-    
-    target = df[target_col]
+    table = pd.DataFrame({
+        'column': bounds.columns,
+        'Skewness Value': bounds.skew,
+        'Distribusi': bounds.distribution,
+        'lower_boundary': np.round(bounds.lower, 2),
+        'upper_boundary': np.round(bounds.upper, 2),
+        'percentage_total_outlier (%)': percent
+    })
+    return OutlierResult(
+        bounds=bounds,
+        table=table,
+        row_mask=pd.Series(mask.any(axis=1), index=X.index, name='outlier'),
+        column_mask=pd.DataFrame(mask, index=X.index, columns=bounds.columns),
+    )
+
+
+def detect_outliers(X, bounds=None, nilai_skew=0.5, k=3):
+    """
+    Fit (jika bounds None) lalu terapkan batas outlier pada X.
+
+    Contoh: hasil = detect_outliers(X_train_num); X_bersih = X_train_num[~hasil.row_mask]
+    Untuk data baru: detect_outliers(X_batch, bounds=hasil.bounds).
+    """
+    if bounds is None:
+        bounds = fit_outlier_bounds(X, nilai_skew=nilai_skew, k=k)
+    return apply_outlier_bounds(X, bounds)
+
+
+def stream_outlier_bounds(source, chunksize=500_000, compression=2000, nilai_skew=0.5, k=3):
+    """
+    Estimasi batas outlier dari stream (path CSV atau iterable chunk) dengan QuantileSketch.
+
+    Batas yang dihasilkan bisa dipakai ke setiap chunk lewat apply_outlier_bounds.
+    """
+    acc = source if isinstance(source, StreamingStats) else stream_statistics(source, chunksize, compression)
+    return fit_outlier_bounds(acc, nilai_skew=nilai_skew, k=k)
+
+# 5a. Vectorized correlation p-values
+def _pairwise_counts(df):
+    """
+    Jumlah baris non-null untuk setiap pasangan kolom (sama seperti pairwise deletion pada df.corr()).
+    """
+    mask = df.notna().to_numpy(dtype=np.float64)
+    return mask.T @ mask
+
+
+def correlation_pvalues(corr_matrix, n):
+    """
+    Menghitung p-value dua sisi untuk seluruh matrix korelasi sekaligus menggunakan distribusi t.
+
+    Berlaku untuk Pearson (r) maupun Spearman (rho pada data ranking), identik dengan
+    p-value dari scipy.stats.pearsonr / spearmanr.
+
+    Parameters:
+    corr_matrix: DataFrame or ndarray
+        Matrix korelasi persegi (hasil df.corr()), atau array koefisien berbentuk apa pun.
+    n: int or ndarray
+        Ukuran sampel, skalar atau array jumlah pasangan non-null berukuran sama.
+
+    Returns:
+    DataFrame p-value dengan index dan kolom yang sama dengan corr_matrix (ndarray jika input ndarray).
+    """
+    is_frame = isinstance(corr_matrix, pd.DataFrame)
+    r = corr_matrix.to_numpy(dtype=np.float64) if is_frame else np.asarray(corr_matrix, dtype=np.float64)
+    r = np.clip(r, -1.0, 1.0)
+    n = np.broadcast_to(np.asarray(n, dtype=np.float64), r.shape)
+    dof = n - 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        pval = 2 * stats.t.sf(np.abs(t_stat), dof)
+    pval = np.where(np.abs(r) == 1.0, 0.0, pval)
+    pval = np.where(dof > 0, pval, np.nan)
+
+    if not is_frame:
+        return pval
+    return pd.DataFrame(pval, index=corr_matrix.index, columns=corr_matrix.columns)
+
+
+# 5b. Kendall tau-b engine
+# Jalur tabel kontingensi dipakai selama jumlah sel (level x * level y) tidak melebihi batas ini
+KENDALL_TABLE_CELLS = 1_000_000
+
+
+def _count_tie_statistics(counts):
+    """
+    Statistik ties satu kolom untuk varians Kendall tau-b dari jumlah baris per level:
+    (pasangan ties, v0, v1).
+    """
+    cnt = np.asarray(counts, dtype=np.float64)
+    cnt = cnt[cnt > 1]
+    return ((cnt * (cnt - 1) / 2).sum(),
+            (cnt * (cnt - 1) * (cnt - 2)).sum(),
+            (cnt * (cnt - 1) * (2 * cnt + 5)).sum())
+
+
+def _kendall_statistic(size, con_minus_dis, x_ties, y_ties):
+    """
+    tau-b dan p-value dua sisi (aproksimasi normal dengan koreksi ties) dari selisih pasangan
+    concordant - discordant dan statistik ties (_count_tie_statistics) kedua kolom.
+    """
+    xtie, x0, x1 = x_ties
+    ytie, y0, y1 = y_ties
+    tot = size * (size - 1) / 2
+    if size < 2 or xtie == tot or ytie == tot:
+        # Salah satu kolom konstan
+        return np.nan, np.nan
+    tau = min(1.0, max(-1.0, con_minus_dis / np.sqrt(tot - xtie) / np.sqrt(tot - ytie)))
+    m = size * (size - 1.0)
+    var = ((m * (2 * size + 5) - x1 - y1) / 18 +
+           (2 * xtie * ytie) / m + x0 * y0 / (9 * m * (size - 2)))
+    return tau, 2 * stats.norm.sf(abs(con_minus_dis) / np.sqrt(var))
+
+
+def _kendall_table(table):
+    """
+    concordant - discordant dari tabel frekuensi gabungan (level x baris, level y kolom) dalam
+    O(level x * level y): untuk setiap sel, jumlah sel di kanan-bawah dikurangi kiri-bawah.
+    """
+    table = np.asarray(table, dtype=np.int64)
+    # below[i, j]: jumlah baris dengan x > level i dan y = level j
+    below = np.zeros_like(table)
+    below[:-1] = np.cumsum(table[::-1], axis=0)[::-1][1:]
+    right = np.cumsum(below[:, ::-1], axis=1)[:, ::-1]   # y >= j
+    left = np.cumsum(below, axis=1)                      # y <= j
+    concordant = right - below                            # y > j
+    discordant = left - below                             # y < j
+    return float((table * (concordant - discordant)).sum())
+
+
+def _count_inversions(values):
+    """
+    Jumlah pasangan i < j dengan values[i] > values[j] (ties tidak dihitung), dengan merge sort
+    bottom-up: setiap level menggabungkan semua pasangan blok sekaligus. Penggabungan per level
+    memakai argsort (O(n log n)), bukan merge linear, sehingga totalnya O(n log^2 n).
+
+    Saat digabung, elemen blok kanan bergeser ke kiri sebanyak elemen blok kiri yang lebih besar,
+    sehingga inversi satu level = total pergeseran elemen blok kanan.
+    values harus integer non-negatif (mis. kode hasil factorize).
+    """
+    values = np.asarray(values, dtype=np.int64)
+    n = len(values)
+    if n < 2:
+        return 0
+    n_levels = int(values.max()) + 1
+    positions = np.arange(n)
+    inversions = 0
+    width = 1
+    while width < n:
+        # Blok [k*2w, (k+1)*2w): setengah kiri dan kanan masing-masing sudah terurut
+        block = positions // (2 * width)
+        is_right = (positions // width) % 2 == 1
+        order = np.argsort(block * n_levels + values, kind='stable')
+        inversions += int(positions[is_right].sum() - np.flatnonzero(is_right[order]).sum())
+        values = values[order]
+        width *= 2
+    return inversions
+
+
+def _kendall_codes(x, y, method='auto'):
+    """
+    Kendall tau-b dan p-value untuk dua array kode integer padat (0..level-1) tanpa missing value.
+
+    method 'table' memakai tabel kontingensi (O(n + level x * level y)), 'mergesort' mengurutkan
+    pasangan lalu menghitung inversi (O(n log^2 n)); 'auto' memilih 'table' selama jumlah sel
+    tidak melebihi KENDALL_TABLE_CELLS.
+    """
+    size = len(x)
+    nx = int(x.max()) + 1 if size else 0
+    ny = int(y.max()) + 1 if size else 0
+    x_counts, y_counts = np.bincount(x, minlength=nx), np.bincount(y, minlength=ny)
+    x_ties, y_ties = _count_tie_statistics(x_counts), _count_tie_statistics(y_counts)
+    if size <= 33 and x_ties[0] == 0 and y_ties[0] == 0:
+        # Sampel kecil tanpa ties: p-value exact seperti kendalltau method='auto'
+        res = stats.kendalltau(x, y)
+        return float(res[0]), float(res[1])
+
+    if method == 'auto':
+        method = 'table' if nx * ny <= KENDALL_TABLE_CELLS else 'mergesort'
+    if method == 'table':
+        table = np.bincount(x.astype(np.int64) * ny + y, minlength=nx * ny).reshape(nx, ny)
+        con_minus_dis = _kendall_table(table)
+    elif method == 'mergesort':
+        # Urut per (x, y): discordant = inversi pada y; pasangan ties x sudah urut naik pada y
+        order = np.lexsort((y, x))
+        xs, ys = x[order], y[order]
+        joint = np.flatnonzero((np.diff(xs) != 0) | (np.diff(ys) != 0)) + 1
+        joint_counts = np.diff(np.concatenate(([0], joint, [size])))
+        both_ties = _count_tie_statistics(joint_counts)[0]
+        tot = size * (size - 1) / 2
+        con_minus_dis = tot - x_ties[0] - y_ties[0] + both_ties - 2.0 * _count_inversions(ys)
+    else:
+        raise ValueError(f"method '{method}' tidak dikenal. Gunakan 'auto', 'table' atau 'mergesort'.")
+    return _kendall_statistic(size, con_minus_dis, x_ties, y_ties)
+
+
+def kendall_tau(x, y, method='auto'):
+    """
+    Kendall tau-b beserta p-value dua sisi dalam satu pass, pengganti scipy.stats.kendalltau untuk
+    data besar. Kolom dengan sedikit level (mis. kategorikal hasil encoding) dihitung dari tabel
+    kontingensi; kolom lain dengan merge sort O(n log^2 n). Pasangan dengan missing value dilewati.
+
+    Parameters:
+    x, y: array-like
+        Dua kolom berukuran sama (numerik, kode, atau kategori terurut).
+    method: str, optional, default='auto'
+        'auto', 'table' atau 'mergesort'.
+
+    Returns:
+    (tau, p_value); NaN jika salah satu kolom konstan.
+    """
+    x_codes = pd.factorize(pd.Series(x).to_numpy(), sort=True)[0]
+    y_codes = pd.factorize(pd.Series(y).to_numpy(), sort=True)[0]
+    if len(x_codes) != len(y_codes):
+        raise ValueError("x dan y harus berukuran sama.")
+    valid = (x_codes >= 0) & (y_codes >= 0)
+    if not valid.all():
+        x_codes = np.unique(x_codes[valid], return_inverse=True)[1]
+        y_codes = np.unique(y_codes[valid], return_inverse=True)[1]
+    return _kendall_codes(x_codes.astype(np.int64), y_codes.astype(np.int64), method)
+
+
+def kendall_correlation(df_encoded, method='auto'):
+    """
+    Matrix Kendall tau-b dan p-value untuk semua pasangan kolom (pairwise deletion seperti df.corr()).
+
+    Setiap kolom difaktorisasi sekali; setiap pasangan dihitung dengan kendall_tau (jalur tabel
+    kontingensi untuk kolom kategorikal yang di-encode).
+
+    Parameters:
+    df_encoded: DataFrame
+        Kolom-kolom bernilai diskrit (mis. hasil OrdinalEncoder).
+    method: str, optional, default='auto'
+        Diteruskan ke kendall_tau.
+
+    Returns:
+    (tau, p_values): dua DataFrame persegi; diagonal tau 1.0 dan p-value 0.0.
+    """
+    cols = list(df_encoded.columns)
+    k = len(cols)
+    codes = [pd.factorize(df_encoded[col].to_numpy(), sort=True)[0].astype(np.int64) for col in cols]
+    tau = np.eye(k)
+    pval = np.zeros((k, k))
+    for i, j in zip(*np.triu_indices(k, 1)):
+        x, y = codes[i], codes[j]
+        valid = (x >= 0) & (y >= 0)
+        if not valid.all():
+            x = np.unique(x[valid], return_inverse=True)[1]
+            y = np.unique(y[valid], return_inverse=True)[1]
+        tau[i, j], pval[i, j] = _kendall_codes(x, y, method)
+        tau[j, i], pval[j, i] = tau[i, j], pval[i, j]
+    return pd.DataFrame(tau, index=cols, columns=cols), pd.DataFrame(pval, index=cols, columns=cols)
+
+
+def _subset_pvalues(pval_full, cols, all_cols):
+    """
+    Matrix p-value berukuran all_cols x all_cols: nilai asli untuk cols, 1.0 untuk kolom lain, 0.0 di diagonal cols.
+    """
+    pval = pd.DataFrame(np.ones((len(all_cols), len(all_cols))), columns=all_cols, index=all_cols)
+    pval.loc[cols, cols] = pval_full.loc[cols, cols].to_numpy()
+    for col in cols:
+        pval.loc[col, col] = 0.0
+    return pval
+
+# 5. Correlation Analysis
+@_traced
+def correlation_analysis(df, nilai_skew=0.5, headless=None, approx=None):
+    """
+    Menghitung dan memvisualisasikan korelasi antar fitur numerik.
+    
+    - Pearson: jika semua kolom numerik berskew rendah (< nilai_skew)
+    - Spearman: jika ada kolom dengan skew tinggi
+    - Point-Biserial: jika disediakan target_col biner
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataset input
+    target_col : str or None
+        Nama kolom target biner (default None)
+    nilai_skew : float
+        Batas ambang skewness (default 0.5)
+    alpha : float
+        Level signifikansi untuk Point-Biserial correlation (default 0.05)
+    headless : bool or None
+        True untuk melewati heatmap/print/display dan mengembalikan CorrelationResult
+        (default None, mengikuti HEADLESS global)
+    approx : bool, int or StratifiedSample
+        Mode approximate: korelasi dihitung pada sampel bertingkat proporsional fuelType/model (True
+        untuk ukuran default dengan margin 0.01, int untuk ukuran sampel). Hasil menyertakan sample_size,
+        population_size dan bounds {metode: (lower, upper)} (default None, seluruh data)
+    """
+    headless = _is_headless(headless)
+
+    sample = None
+    if approx:
+        # Korelasi dihitung tanpa bobot, jadi sampel harus proporsional (self-weighting):
+        # minimum per strata akan membuat model langka terlalu terwakili
+        with span('sample'):
+            sample = _resolve_sample(df, approx, min_per_stratum=0)
+        df = sample.data
+
+    result = _cached_call('correlation_analysis', _correlation_compute, df, nilai_skew)
+    if sample is not None:
+        result = _approximate_correlation(result, sample)
+    if headless:
+        return result
+
+    normal_cols, skewed_cols, object_cols = result.normal_cols, result.skewed_cols, result.object_cols
+    print(f"Normal Distribution Columns   : {normal_cols if normal_cols else '-- Tidak ada kolom normal --'}")
+    print(f"Skewed Distribution Columns   : {skewed_cols if skewed_cols else '-- Tidak ada kolom skewed --'}")
+    print(f"Object Columns                : {object_cols if object_cols else '-- Tidak ada kolom object --'}")
+    if sample is not None:
+        print(f"Approximate mode              : {sample.describe()}, "
+              f"CI {sample.confidence:.0%} per koefisien")
+    print()
+
+    panels = [
+        ('pearson', result.pearson, result.pearson_pvalues, normal_cols),
+        ('spearman', result.spearman, result.spearman_pvalues, skewed_cols),
+        ('kendall', result.kendall, result.kendall_pvalues, None),
+    ]
+    for method, corr_matrix, pval, cols in panels:
+        if corr_matrix is None:
+            continue
+
+        if cols is None:
+            print(f"Using correlation method      : {method.upper()}")
+        else:
+            print(f"Using correlation method      : {method.upper()} ===> {cols}")
+
+        # Visualisasi korelasi antar fitur
+        with span('heatmap', method=method):
+            plt.figure(figsize=(10, 8))
+            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt='.2f', cbar=True)
+            # plt.xticks(rotation=45)
+            if method == 'kendall':
+                plt.title("Correlation Matrix (KENDALL) due to object columns")
+            else:
+                plt.title(f"Correlation Matrix ({method.capitalize()})")
+            plt.tight_layout()
+            plt.show()
+
+        # Menyertakan p-value pada matrix signifikansi
+        with span('display', method=method):
+            signif = pval < 0.05
+            print(f"\nSignificance Matrix (p < 0.05) - {method.capitalize()}:")
+            signif_with_pval = signif.astype(str) + ' (' + pval.round(4).astype(str) + ')'
+            display(signif_with_pval)
+            if sample is not None:
+                lower, upper = result.bounds[method]
+                print(f"\nConfidence Bounds ({sample.confidence:.0%}, n={sample.sample_size:,}) - {method.capitalize()}:")
+                display(corr_matrix.round(3).astype(str) + ' [' + lower.round(3).astype(str)
+                        + ', ' + upper.round(3).astype(str) + ']')
+
+
+def _approximate_correlation(result, sample):
+    # Salinan hasil (bisa berasal dari cache) yang diberi ukuran sampel dan batas CI per metode
+    result = copy.copy(result)
+    counts = _pairwise_counts(sample.data.select_dtypes(include='number'))
+    result.sample_size, result.population_size = sample.sample_size, sample.n_rows
+    result.bounds = {}
+    for method in ('pearson', 'spearman', 'kendall'):
+        corr_matrix = getattr(result, method)
+        if corr_matrix is not None:
+            n = sample.sample_size if method == 'kendall' else counts
+            result.bounds[method] = correlation_bounds(corr_matrix, n, method, sample.confidence)
+    return result
+
+
+def _ordinal_codes(series):
+    """
+    Kode ordinal float (label diurutkan, NaN untuk missing) seperti OrdinalEncoder().fit_transform, tanpa
+    array object per baris: kolom category dipetakan lewat urutan kategorinya saja.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.cat.remove_unused_categories()
+        codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        rank = np.empty(len(categories))
+        rank[np.argsort(categories.to_numpy(dtype=object))] = np.arange(len(categories))
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        rank = np.arange(len(uniques), dtype=np.float64)
+    # Bin terakhir untuk missing value (kode -1)
+    return np.append(rank, np.nan)[np.where(codes >= 0, codes, len(rank))]
+
+
+def _correlation_compute(df, nilai_skew):
+    # Bagian correlation_analysis yang mahal (skew, matriks korelasi, p-value), hasilnya bisa di-cache
+    # Pilih kolom object (termasuk kolom category dari frame ringkas)
+    df_obj = df.select_dtypes(include=['object', 'category', 'string'])    
+    # Pilih kolom numerik saja
+    df_num = df.select_dtypes(include='number')
+
+    # Deteksi kolom normal dan skewed berdasarkan skewness
+    normal_cols = []
+    skewed_cols = []
+    object_cols = []
+
+    with span('skew'):
+        for col in df_num.columns:
+            skew_val = df[col].skew()
+            if abs(skew_val) < nilai_skew:
+                normal_cols.append(col)
+            else:
+                skewed_cols.append(col)
+    
+    for col in df_obj.columns:
+        object_cols.append(col)
+
+    result = CorrelationResult(normal_cols=normal_cols, skewed_cols=skewed_cols, object_cols=object_cols)
+
+    # Tentukan metode korelasi utama
+    if len(normal_cols) > 0:
+        with span('pearson'):
+            corr_matrix_pearson = df_num.corr(method='pearson')
+            pval_pearson = _subset_pvalues(
+                correlation_pvalues(corr_matrix_pearson, _pairwise_counts(df_num)), normal_cols, df_num.columns)
+            result.pearson, result.pearson_pvalues = corr_matrix_pearson, pval_pearson
+
+    if len(skewed_cols) > 0:
+        with span('spearman'):
+            corr_matrix_spearman = df_num.corr(method='spearman')
+            pval_spearman = _subset_pvalues(
+                correlation_pvalues(corr_matrix_spearman, _pairwise_counts(df_num)), skewed_cols, df_num.columns)
+            result.spearman, result.spearman_pvalues = corr_matrix_spearman, pval_spearman
+
+    if object_cols:   
+        # Encoding
+        with span('encode'):
+            df_obj_encoded = pd.DataFrame({col: _ordinal_codes(df_obj[col]) for col in df_obj.columns},
+                                          index=df_obj.index)
+
+        # Kendall tau-b dan p-value sekaligus; kolom hasil encoding memakai jalur tabel kontingensi
+        with span('kendall'):
+            result.kendall, result.kendall_pvalues = kendall_correlation(df_obj_encoded)
+
+    return result
+
+# 6. Point-Bisserial Correlation
+def _observed(series):
+    # Kategori yang tidak muncul di data membuat baris/kolom nol pada crosstab (expected = 0)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.remove_unused_categories()
+    return series
+
+# Fungsi untuk menghitung Cramer's V
+def cramer_v(contingency_table):
+    chi2, p_val, dof, ex = stats.chi2_contingency(contingency_table)
+    n = contingency_table.sum().sum()
+    return np.sqrt(chi2 / (n * (min(contingency_table.shape) - 1)))
+
+@_traced
+def correlation_analysis_binary(df, target_col, alpha=0.05, h0=None, h1=None, show=True, headless=None):
+    headless = _is_headless(headless)
+
+    # Periksa apakah kolom target ada dalam DataFrame
+    if target_col not in df.columns:
+        if not headless:
+            print(f"Kolom target '{target_col}' tidak ditemukan.")
+        return
+    
+    target = df[target_col]
+    result = BinaryCorrelationResult(target_col=target_col)
     
     # Ubah kolom target menjadi tipe kategori jika belum
     df[target_col] = df[target_col].astype('category')
     
-    print(f"\nAnalisis Korelasi terhadap target ===> '{target_col}'")
+    if not headless:
+        print(f"\nAnalisis Korelasi terhadap target ===> '{target_col}'")
     
     # === 1. Analisis Point-Biserial ===
     df_num = df.select_dtypes(include='number')  # Memilih kolom numerik
     if df_num.empty:
-        print("\nTidak ada kolom numerik untuk analisis Point-Biserial.")
+        if not headless:
+            print("\nTidak ada kolom numerik untuk analisis Point-Biserial.")
     else:
-        pb_results = []
-        for col in df_num.columns:
-            if col != target_col:
-                series = df[col].dropna()  # Menghapus missing values
-                aligned_target = target.loc[series.index]
+        with span('point_biserial'):
+            pb_results = []
+            for col in df_num.columns:
+                if col != target_col:
+                    series = df[col].dropna()  # Menghapus missing values
+                    aligned_target = target.loc[series.index]
                 
-                # Pastikan target adalah biner (0 dan 1)
-                if aligned_target.nunique() == 2:
-                    r_pb, p_val = pointbiserialr(series, aligned_target)
-                    signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
-
-                    pb_results.append({
-                        "Feature": col,
-                        "r_pb": round(r_pb, 3),
-                        "p_value": round(p_val, 10),
-                        "Significance": signif
-                    })
-                else:
-                    print(f"Kolom {col} tidak memenuhi kriteria target biner untuk Point-Biserial.")
+                    # Pastikan target adalah biner (0 dan 1)
+                    if aligned_target.nunique() == 2:
+                        r_pb, p_val = stats.pointbiserialr(series, aligned_target)
+                        signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
+
+                        pb_results.append({
+                            "Feature": col,
+                            "r_pb": round(r_pb, 3),
+                            "p_value": round(p_val, 10),
+                            "Significance": signif
+                        })
+                    elif not headless:
+                        print(f"Kolom {col} tidak memenuhi kriteria target biner untuk Point-Biserial.")
 
         pb_df = pd.DataFrame(pb_results).sort_values(by='r_pb', ascending=False)
+        result.point_biserial = pb_df
         
-        # Tampilkan hasil Point-Biserial
-        print("\n=== Hasil Point-Biserial Correlation ===")
-        print(pb_df)
-
-        if show:
-            if h0 is None or h1 is None:
-                for col in df_num.columns:
-                    if col != target_col:
-                        print(f"\nH0: Tidak ada hubungan antara {target_col} dan {col}.")
-                        print(f"H1: Ada hubungan antara {target_col} dan {col}.")
-            else:
-                print("\n=== Hipotesis yang Diberikan ===")
-                print(f"H0: {h0}")
-                print(f"H1: {h1}")
+        if not headless:
+            # Tampilkan hasil Point-Biserial
+            print("\n=== Hasil Point-Biserial Correlation ===")
+            print(pb_df)
 
-            for index, row in pb_df.iterrows():
-                if row['p_value'] < alpha:
-                    print(f"\nKesimpulan: Ada hubungan antara {target_col} dan {row['Feature']}")
+            if show:
+                if h0 is None or h1 is None:
+                    for col in df_num.columns:
+                        if col != target_col:
+                            print(f"\nH0: Tidak ada hubungan antara {target_col} dan {col}.")
+                            print(f"H1: Ada hubungan antara {target_col} dan {col}.")
                 else:
-                    print(f"\nKesimpulan: Tidak ada hubungan antara {target_col} dan {row['Feature']}")
-
-        # Heatmap untuk Point-Biserial Correlation
-        heatmap_df = pb_df.set_index('Feature')[['r_pb']]
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(heatmap_df, annot=True, cmap='coolwarm', center=0, linewidths=0.5, fmt=".3f", cbar_kws={'label': 'Point-Biserial Correlation (r_pb)'})
-        plt.title(f'Point-Biserial Correlation terhadap "{target_col}"', fontsize=12)
-        plt.ylabel("Fitur")
-        plt.tight_layout()
-        plt.show()
+                    print("\n=== Hipotesis yang Diberikan ===")
+                    print(f"H0: {h0}")
+                    print(f"H1: {h1}")
+
+                for index, row in pb_df.iterrows():
+                    if row['p_value'] < alpha:
+                        print(f"\nKesimpulan: Ada hubungan antara {target_col} dan {row['Feature']}")
+                    else:
+                        print(f"\nKesimpulan: Tidak ada hubungan antara {target_col} dan {row['Feature']}")
+
+            with span('heatmap', method='point_biserial'):
+                # Heatmap untuk Point-Biserial Correlation
+                heatmap_df = pb_df.set_index('Feature')[['r_pb']]
+                plt.figure(figsize=(8, 6))
+                sns.heatmap(heatmap_df, annot=True, cmap='coolwarm', center=0, linewidths=0.5, fmt=".3f", cbar_kws={'label': 'Point-Biserial Correlation (r_pb)'})
+                plt.title(f'Point-Biserial Correlation terhadap "{target_col}"', fontsize=12)
+                plt.ylabel("Fitur")
+                plt.tight_layout()
+                plt.show()
     
     # === 2. Analisis Chi-Square ===
-    df_cat = df.select_dtypes(include='object')  # Memilih kolom kategorikal
+    df_cat = df.select_dtypes(include=['object', 'category', 'string']).drop(columns=target_col, errors='ignore')  # Memilih kolom kategorikal
     if df_cat.empty:
-        print("\nTidak ada kolom kategorikal untuk analisis Chi-Square.")
+        if not headless:
+            print("\nTidak ada kolom kategorikal untuk analisis Chi-Square.")
     else:
-        chi_results = []
-        for col in df_cat.columns:
-            df[col] = df[col].astype('category')
-            
-            contingency_table = pd.crosstab(df[col], target)
-            if contingency_table.shape[0] < 2 or contingency_table.shape[1] < 2:
-                continue  # Skip kolom yang kontingensinya kurang dari 2x2
-            chi2, p_val, dof, ex = chi2_contingency(contingency_table)
-            signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
-
-            # Menghitung Cramer's V
-            cramer_v_value = cramer_v(contingency_table)
-
-            # Menambahkan interpretasi Cramer's V
-            if cramer_v_value > 0.25:
-                cramer_interpretation = 'Very Strong'
-            elif cramer_v_value > 0.15:
-                cramer_interpretation = 'Strong'
-            elif cramer_v_value > 0.10:
-                cramer_interpretation = 'Moderate'
-            elif cramer_v_value > 0.05:
-                cramer_interpretation = 'Weak'
-            else:
-                cramer_interpretation = 'No or Very Weak'
-
-            chi_results.append({
-                "Feature": col,
-                "Chi2": round(chi2, 3),
-                "p_value": round(p_val, 10),
-                "Significance": signif,
-                "Cramer's V": round(cramer_v_value, 3),
-                "Interpretation": cramer_interpretation
-            })
+        with span('chi_square'):
+            chi_results = []
+            for col in df_cat.columns:
+                df[col] = df[col].astype('category')
+
+            # Semua tabel kontingensi dan statistiknya dihitung sekali oleh contingency_tests
+            tests = contingency_tests(df, target_col, features=list(df_cat.columns))
+            for row in tests.table.itertuples():
+                col = row.Feature
+                contingency_table = tests.observed[col]
+                if contingency_table.shape[0] < 2 or contingency_table.shape[1] < 2:
+                    continue  # Skip kolom yang kontingensinya kurang dari 2x2
+                chi2, p_val = row.Chi2, row.p_value
+                signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
+
+                # Cramer's V dari chi-square yang sama (tanpa chi2_contingency kedua)
+                cramer_v_value = tests.table.at[row.Index, "Cramer's V"]
+
+                # Menambahkan interpretasi Cramer's V
+                if cramer_v_value > 0.25:
+                    cramer_interpretation = 'Very Strong'
+                elif cramer_v_value > 0.15:
+                    cramer_interpretation = 'Strong'
+                elif cramer_v_value > 0.10:
+                    cramer_interpretation = 'Moderate'
+                elif cramer_v_value > 0.05:
+                    cramer_interpretation = 'Weak'
+                else:
+                    cramer_interpretation = 'No or Very Weak'
+
+                chi_results.append({
+                    "Feature": col,
+                    "Chi2": round(chi2, 3),
+                    "p_value": round(p_val, 10),
+                    "Significance": signif,
+                    "Cramer's V": round(cramer_v_value, 3),
+                    "Interpretation": cramer_interpretation
+                })
 
         chi_df = pd.DataFrame(chi_results).sort_values(by='Chi2', ascending=False)
+        result.chi_square = chi_df
         
-        # Tampilkan hasil Chi-Square
-        print("\n=== Hasil Chi-Square Analysis ===")
-        print(chi_df)
-
-        if show:
-            if h0 is None or h1 is None:
-                for col in df_cat.columns:
-                    if col != target_col:
-                        print(f"\nH0: Tidak ada hubungan antara {target_col} dan {col}.")
-                        print(f"H1: Ada hubungan antara {target_col} dan {col}.")
-            else:
-                print("\n=== Hipotesis yang Diberikan ===")
-                print(f"H0: {h0}")
-                print(f"H1: {h1}")
+        if not headless:
+            # Tampilkan hasil Chi-Square
+            print("\n=== Hasil Chi-Square Analysis ===")
+            print(chi_df)
 
-            for index, row in chi_df.iterrows():
-                if row['p_value'] < alpha:
-                    print(f"\nKesimpulan: Ada hubungan antara {target_col} dan {row['Feature']}")
+            if show:
+                if h0 is None or h1 is None:
+                    for col in df_cat.columns:
+                        if col != target_col:
+                            print(f"\nH0: Tidak ada hubungan antara {target_col} dan {col}.")
+                            print(f"H1: Ada hubungan antara {target_col} dan {col}.")
                 else:
-                    print(f"\nKesimpulan: Tidak ada hubungan antara {target_col} dan {row['Feature']}")
-
-        # Heatmap untuk Chi-Square Analysis
-        heatmap_df = chi_df.set_index('Feature')[['Chi2']]
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(heatmap_df, annot=True, cmap='YlGnBu', fmt=".3f", linewidths=0.5, cbar_kws={'label': 'Chi-Square Statistic'})
-        plt.title(f'Chi-Square Analysis terhadap "{target_col}"', fontsize=12)
-        plt.ylabel("Fitur")
-        plt.tight_layout()
-        plt.show()
+                    print("\n=== Hipotesis yang Diberikan ===")
+                    print(f"H0: {h0}")
+                    print(f"H1: {h1}")
+
+                for index, row in chi_df.iterrows():
+                    if row['p_value'] < alpha:
+                        print(f"\nKesimpulan: Ada hubungan antara {target_col} dan {row['Feature']}")
+                    else:
+                        print(f"\nKesimpulan: Tidak ada hubungan antara {target_col} dan {row['Feature']}")
+
+            with span('heatmap', method='chi_square'):
+                # Heatmap untuk Chi-Square Analysis
+                heatmap_df = chi_df.set_index('Feature')[['Chi2']]
+                plt.figure(figsize=(8, 6))
+                sns.heatmap(heatmap_df, annot=True, cmap='YlGnBu', fmt=".3f", linewidths=0.5, cbar_kws={'label': 'Chi-Square Statistic'})
+                plt.title(f'Chi-Square Analysis terhadap "{target_col}"', fontsize=12)
+                plt.ylabel("Fitur")
+                plt.tight_layout()
+                plt.show()
+
+    if headless:
+        return result
+
+# 6a. Batched contingency engine
+@dataclass
+class ContingencyResult:
+    target_col: str
+    table: pd.DataFrame
+    observed: dict = field(default_factory=dict)
+
+
+def _category_codes(series):
+    """
+    Kode integer (-1 untuk NaN) dan label kategori, urutan label sama seperti pd.crosstab.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+    codes, labels = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), labels
+
+
+def _joint_counts(feature_codes, feature_levels, target_codes, n_target, chunk_size):
+    """
+    Tabel frekuensi fitur x target untuk banyak fitur dengan satu np.bincount per blok fitur.
+
+    Setiap fitur mendapat rentang bin sendiri (offset + kode_fitur * n_target + kode_target),
+    baris dengan NaN di fitur atau target masuk ke satu bin buangan di akhir.
+    """
+    n_rows = len(target_codes)
+    sizes = np.array([n_levels * n_target for n_levels in feature_levels], dtype=np.int64)
+    tables = []
+    per_block = max(1, chunk_size // max(n_rows, 1))
+    for begin in range(0, len(feature_codes), per_block):
+        block = range(begin, min(begin + per_block, len(feature_codes)))
+        offsets = np.concatenate(([0], np.cumsum(sizes[block.start:block.stop])))
+        trash = offsets[-1]
+        idx = np.empty((len(block), n_rows), dtype=np.int64)
+        for j, k in enumerate(block):
+            codes = feature_codes[k]
+            np.multiply(codes, n_target, out=idx[j])
+            idx[j] += target_codes + offsets[j]
+            idx[j][(codes < 0) | (target_codes < 0)] = trash
+        counts = np.bincount(idx.ravel(), minlength=trash + 1)
+        for j, k in enumerate(block):
+            tables.append(counts[offsets[j]:offsets[j + 1]].reshape(feature_levels[k], n_target))
+    return tables
+
+
+def _chi2_from_table(observed):
+    """
+    Statistik chi-square dan dof dari satu tabel frekuensi, definisi sama dengan chi2_contingency
+    (koreksi Yates untuk dof = 1). Baris/kolom nol sudah dibuang sebelumnya.
+    """
+    n = observed.sum()
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+    if dof == 0:
+        return 0.0, 0
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    observed = observed.astype(np.float64)
+    if dof == 1:
+        diff = expected - observed
+        observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    return float(((observed - expected) ** 2 / expected).sum()), dof
+
+
+@_traced
+def contingency_tests(df, target_col, features=None, chunk_size=20_000_000):
+    """
+    Chi-square, p-value, Cramer's V dan eta squared untuk banyak fitur kategorikal terhadap satu target.
+
+    Semua tabel kontingensi fitur x target dibangun dari kode kategori dengan np.bincount
+    (tanpa pd.crosstab per fitur), lalu setiap statistik dihitung satu kali dari tabel tersebut.
+
+    Parameters:
+    df: DataFrame
+        Data input.
+    target_col: str
+        Kolom target kategorikal.
+    features: list, optional, default=None
+        Kolom fitur. Default semua kolom object/category selain target.
+    chunk_size: int, optional, default=20_000_000
+        Batas jumlah indeks bin per blok fitur (membatasi memori).
+
+    Returns:
+    ContingencyResult dengan table (satu baris per fitur: Feature, Chi2, p_value, dof, n,
+    Cramer's V, Eta squared) dan observed ({fitur: DataFrame tabel frekuensi}).
+    """
+    if features is None:
+        features = [col for col in df.select_dtypes(include=['object', 'category', 'string']).columns if col != target_col]
+    target_codes, target_labels = _category_codes(df[target_col])
+
+    feature_codes, feature_labels = [], []
+    for col in features:
+        codes, labels = _category_codes(df[col])
+        feature_codes.append(codes)
+        feature_labels.append(labels)
+
+    tables = _joint_counts(feature_codes, [len(labels) for labels in feature_labels],
+                           target_codes, len(target_labels), chunk_size)
+
+    rows = []
+    observed = {}
+    for col, labels, table in zip(features, feature_labels, tables):
+        # Kategori yang tidak muncul (atau hanya muncul bersama NaN) dibuang, seperti crosstab + _observed
+        keep_rows = table.sum(axis=1) > 0
+        keep_cols = table.sum(axis=0) > 0
+        table = table[keep_rows][:, keep_cols]
+        observed[col] = pd.DataFrame(table, index=labels[keep_rows], columns=target_labels[keep_cols])
+
+        n = int(table.sum())
+        chi2, dof = _chi2_from_table(table) if n else (np.nan, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cramers_v = np.sqrt(chi2 / (n * (min(table.shape) - 1))) if min(table.shape) > 1 else np.nan
+            eta_sq = chi2 / (n + chi2)
+        rows.append({'Feature': col, 'Chi2': chi2, 'dof': dof, 'n': n,
+                     "Cramer's V": cramers_v, 'Eta squared': eta_sq})
+
+    table = pd.DataFrame(rows, columns=['Feature', 'Chi2', 'dof', 'n', "Cramer's V", 'Eta squared'])
+    # p-value semua fitur dengan satu panggilan vektor; dof 0 memberi p = 1 seperti chi2_contingency
+    dof = table['dof'].to_numpy(dtype=np.float64)
+    p_value = np.where(dof > 0, stats.chi2.sf(table['Chi2'].to_numpy(dtype=np.float64), np.maximum(dof, 1)), 1.0)
+    table.insert(2, 'p_value', np.where(table['n'] > 0, p_value, np.nan))
+    return ContingencyResult(target_col=target_col, table=table, observed=observed)
 
 # 7. Cek persentase missing value pada fitur tertentu
 def persentase_missing_value(df_train, df_test, fitur_list):
@@ -515,16 +1688,23 @@ def persentase_missing_value(df_train, df_test, fitur_list):
     return hasil
 
 # 8. Cek persentase dan value tiap kolom
-def calculate_value_percentage(df, column, plot=None):
-    # Memeriksa apakah kolom ada dalam DataFrame
-    if column not in df.columns:
-        raise ValueError(f"Kolom '{column}' tidak ditemukan dalam DataFrame.")
-    
-    # Menghitung jumlah nilai unik untuk kolom yang dipilih
-    val_counts = df[column].value_counts()
+@_traced
+def calculate_value_percentage(df, column, plot=None, headless=None):
+    # StreamingStats: frekuensi diambil dari akumulator
+    if isinstance(df, StreamingStats):
+        val_counts = df.value_counts(column)
+        n_rows = df.n_rows
+    else:
+        # Memeriksa apakah kolom ada dalam DataFrame
+        if column not in df.columns:
+            raise ValueError(f"Kolom '{column}' tidak ditemukan dalam DataFrame.")
+        
+        # Menghitung jumlah nilai unik untuk kolom yang dipilih
+        val_counts = _observed(df[column]).value_counts()
+        n_rows = len(df)
     
     # Menghitung persentase untuk nilai unik
-    per = (val_counts / len(df)) * 100
+    per = (val_counts / n_rows) * 100
     
     # Menyimpan hasil perhitungan dalam list
     per_val_col = []
@@ -538,6 +1718,9 @@ def calculate_value_percentage(df, column, plot=None):
     # Membuat DataFrame dari list hasil perhitungan
     pervalcolsum = pd.DataFrame(per_val_col)
 
+    if _is_headless(headless):
+        return pervalcolsum
+
     display(pervalcolsum)
     # Visualisasi bar chart jika diinginkan
     if plot:
@@ -555,7 +1738,9 @@ def calculate_value_percentage(df, column, plot=None):
 
 
 # 9. Uji Hipotesis t-test (unknown sample)
-def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None, h1=None):
+@_traced
+def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None, h1=None, headless=None,
+                               permutations=None):
     """
     Fungsi ini melakukan analisis t-test untuk membandingkan rata-rata antara dua kelompok (biner) pada fitur numerik dan target biner,
     dengan inputan manual untuk hipotesis H0 dan H1.
@@ -567,11 +1752,16 @@ def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     - alpha: Tingkat signifikansi untuk pengujian hipotesis (default 0.05)
     - h0: Hipotesis Nol (H0), jika tidak diinput, akan menggunakan default
     - h1: Hipotesis Alternatif (H1), jika tidak diinput, akan menggunakan default
+    - headless: True untuk tidak mencetak apa pun dan mengembalikan HypothesisTestResult (default None, mengikuti HEADLESS global)
+    - permutations: None (p-value asimtotik), True (PERMUTATIONS permutasi) atau jumlah permutasi.
+      Untuk sampel kecil; beralih ke enumerasi exact jika jumlah susunan tidak lebih dari itu
     """
+    headless = _is_headless(headless)
     
     # Periksa apakah kolom target dan fitur ada dalam DataFrame
     if target_col not in df.columns or feature_col not in df.columns:
-        print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
+        if not headless:
+            print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
         return
     
     target = df[target_col]
@@ -579,17 +1769,27 @@ def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     
     # Pastikan target adalah biner
     if target.nunique() != 2:
-        print(f"Kolom target '{target_col}' bukan biner. Tidak bisa hitung t-test.")
+        if not headless:
+            print(f"Kolom target '{target_col}' bukan biner. Tidak bisa hitung t-test.")
         return
 
-    print(f"\nAnalisis t-test untuk '{feature_col}' terhadap target '{target_col}'")
-
     # Memisahkan data berdasarkan nilai target (0 atau 1)
     group1 = feature[target == target.unique()[0]]
     group2 = feature[target == target.unique()[1]]
 
     # Uji t-test antara dua kelompok
     t_stat, p_val = stats.ttest_ind(group1, group2, equal_var=False)  # Menggunakan asumsi varian yang tidak sama
+    details = {'n_group1': len(group1), 'n_group2': len(group2)}
+    if permutations:
+        p_val = _permutation_pvalue('t-test', [group1, group2], permutations, details)
+
+    if headless:
+        return HypothesisTestResult(
+            test='t-test', target_col=target_col, feature_col=feature_col,
+            statistic=t_stat, p_value=p_val, alpha=alpha, significant=bool(p_val < alpha),
+            details=details)
+
+    print(f"\nAnalisis t-test untuk '{feature_col}' terhadap target '{target_col}'")
 
     # Menentukan signifikansi
     signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
@@ -597,7 +1797,7 @@ def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     # Menampilkan hasil uji t-test
     print("\n=== Hasil t-test ===")
     print(f"T-statistic: {t_stat:.3f}")
-    print(f"p-value: {p_val:.10f}")
+    print(f"p-value: {p_val:.10f}{_permutation_note(details)}")
     print(f"Signifikansi: {signif}")
 
     # Hipotesis: Gunakan input manual jika ada, jika tidak akan menggunakan default
@@ -617,7 +1817,9 @@ def t_test_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     
 
 # 10. plot_line_relationship
-def plot_relationship(dataset, x_col, target_cols, kind='line', figsize=(10, 7), custom_colors=None):
+@_traced
+def plot_relationship(dataset, x_col, target_cols, kind='line', figsize=(10, 7), custom_colors=None, headless=None,
+                      approx=None, aggregate=None):
     """
     Fungsi fleksibel untuk memvisualisasi hubungan antara satu kolom X dengan satu atau lebih kolom target Y,
     dalam berbagai jenis plot seaborn: 'line', 'scatter', 'bar', 'hist', 'box', 'violin', 'kde'.
@@ -629,7 +1831,34 @@ def plot_relationship(dataset, x_col, target_cols, kind='line', figsize=(10, 7),
     - kind: jenis plot: 'line', 'scatter', 'bar', 'hist', 'box', 'violin', 'kde'
     - figsize: ukuran grafik (default (17, 15))
     - custom_colors: dictionary untuk mengubah warna manual, format {nilai_target: warna}
+    - headless: True untuk tidak membuat figure sama sekali (default None, mengikuti HEADLESS global)
+    - approx: True / int / StratifiedSample untuk menggambar dari sampel bertingkat fuelType/model;
+      ukuran sampel ditampilkan di judul (default None, seluruh data)
+    - aggregate: True untuk menggambar dari agregat (mean + CI per x, histogram, kuartil) yang dihitung
+      sekali lewat groupby, tanpa filter per nilai target dan tanpa bootstrap seaborn; None otomatis
+      aktif mulai AGGREGATE_ROWS baris
     """
+    if _is_headless(headless):
+        return
+
+    sample_note = ''
+    if approx:
+        with span('sample'):
+            sample = _resolve_sample(dataset, approx)
+        dataset = sample.data
+        sample_note = f' (sample n={sample.sample_size:,} of {sample.n_rows:,})'
+
+    if _use_aggregate(aggregate, len(dataset)):
+        with span('aggregate'):
+            aggregates = relationship_aggregates(dataset, x_col, target_cols, kind, custom_colors=custom_colors)
+        fig, axs = plt.subplots(len(target_cols), 1, figsize=figsize, squeeze=False)
+        for ax, agg in zip(axs[:, 0], aggregates):
+            agg.title += sample_note
+            draw_aggregate(agg, ax)
+        plt.tight_layout()
+        plt.show()
+        return
+
     # Jika custom_colors diberikan, gunakan warna tersebut, jika tidak, gunakan Set1
     fig, axs = plt.subplots(len(target_cols), 1, figsize=figsize)
 
@@ -677,7 +1906,7 @@ def plot_relationship(dataset, x_col, target_cols, kind='line', figsize=(10, 7),
             raise ValueError("Jenis plot tidak dikenali. Gunakan 'line', 'scatter', 'bar', 'hist', 'box', 'violin', atau 'kde'.")
 
         title = f'{target_col}' if kind in ['hist', 'kde'] else f'{x_col} vs {target_col}'
-        ax.set_title(f'{kind.title()} Plot: {title}')
+        ax.set_title(f'{kind.title()} Plot: {title}{sample_note}')
         ax.set_xlabel(x_col if x_col else '')
         ax.set_ylabel(target_col)
 
@@ -689,7 +1918,9 @@ def plot_relationship(dataset, x_col, target_cols, kind='line', figsize=(10, 7),
 
 
 # 11. Annova
-def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None, h1=None):
+@_traced
+def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None, h1=None, headless=None,
+                              permutations=None):
     """
     Fungsi ini melakukan analisis ANOVA untuk membandingkan rata-rata antara lebih dari dua kelompok pada fitur numerik dan target kategorikal,
     dengan inputan manual untuk hipotesis H0 dan H1.
@@ -701,11 +1932,16 @@ def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     - alpha: Tingkat signifikansi untuk pengujian hipotesis (default 0.05)
     - h0: Hipotesis Nol (H0), jika tidak diinput, akan menggunakan default
     - h1: Hipotesis Alternatif (H1), jika tidak diinput, akan menggunakan default
+    - headless: True untuk tidak mencetak apa pun dan mengembalikan HypothesisTestResult (default None, mengikuti HEADLESS global)
+    - permutations: None (p-value asimtotik), True (PERMUTATIONS permutasi) atau jumlah permutasi.
+      Untuk sampel kecil; beralih ke enumerasi exact jika jumlah susunan tidak lebih dari itu
     """
+    headless = _is_headless(headless)
     
     # Periksa apakah kolom target dan fitur ada dalam DataFrame
     if target_col not in df.columns or feature_col not in df.columns:
-        print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
+        if not headless:
+            print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
         return
     
     target = df[target_col]
@@ -713,16 +1949,26 @@ def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     
     # Pastikan target memiliki lebih dari dua kategori
     if target.nunique() <= 2:
-        print(f"Kolom target '{target_col}' harus memiliki lebih dari dua kategori. Tidak bisa hitung ANOVA.")
+        if not headless:
+            print(f"Kolom target '{target_col}' harus memiliki lebih dari dua kategori. Tidak bisa hitung ANOVA.")
         return
 
-    print(f"\nAnalisis ANOVA untuk '{feature_col}' terhadap target '{target_col}'")
-
     # Memisahkan data berdasarkan kategori pada kolom target
     groups = [feature[target == category] for category in target.unique()]
 
     # Uji ANOVA antara kelompok-kelompok berdasarkan target
     f_stat, p_val = stats.f_oneway(*groups)
+    details = {'n_groups': len(groups), 'n': int(sum(len(g) for g in groups))}
+    if permutations:
+        p_val = _permutation_pvalue('anova', groups, permutations, details)
+
+    if headless:
+        return HypothesisTestResult(
+            test='anova', target_col=target_col, feature_col=feature_col,
+            statistic=f_stat, p_value=p_val, alpha=alpha, significant=bool(p_val < alpha),
+            details=details)
+
+    print(f"\nAnalisis ANOVA untuk '{feature_col}' terhadap target '{target_col}'")
 
     # Menentukan signifikansi
     signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
@@ -730,7 +1976,7 @@ def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
     # Menampilkan hasil uji ANOVA
     print("\n=== Hasil ANOVA ===")
     print(f"F-statistic: {f_stat:.3f}")
-    print(f"p-value: {p_val:.10f}")
+    print(f"p-value: {p_val:.10f}{_permutation_note(details)}")
     print(f"Signifikansi: {signif}")
 
     # Hipotesis: Gunakan input manual jika ada, jika tidak akan menggunakan default
@@ -749,7 +1995,8 @@ def anova_analysis_with_input(df, target_col, feature_col, alpha=0.05, h0=None,
         print("\nKesimpulan: Tidak ada hubungan antara", target_col, "dan", feature_col)
 
 # 12. Chi-Square Test
-def chi_square_analysis(df, target_col, feature_col, alpha=0.05, h0=None, h1=None):
+@_traced
+def chi_square_analysis(df, target_col, feature_col, alpha=0.05, h0=None, h1=None, headless=None):
     """
     Fungsi ini melakukan uji Chi-Square untuk menguji apakah ada hubungan antara dua variabel kategorikal
     (misalnya, 'Attrition' dan 'Job Satisfaction').
@@ -761,22 +2008,41 @@ def chi_square_analysis(df, target_col, feature_col, alpha=0.05, h0=None, h1=Non
     - alpha: Tingkat signifikansi untuk pengujian hipotesis (default 0.05)
     - h0: Hipotesis Nol (H0), jika tidak diinput, akan menggunakan default
     - h1: Hipotesis Alternatif (H1), jika tidak diinput, akan menggunakan default
+    - headless: True untuk tidak mencetak apa pun dan mengembalikan HypothesisTestResult (default None, mengikuti HEADLESS global)
     """
+    headless = _is_headless(headless)
     
     # Periksa apakah kolom target dan fitur ada dalam DataFrame
     if target_col not in df.columns or feature_col not in df.columns:
-        print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
+        if not headless:
+            print(f"Kolom '{target_col}' atau '{feature_col}' tidak ditemukan.")
         return
     
     target = df[target_col]
     feature = df[feature_col]
     
-    # Membuat tabel kontingensi
-    contingency_table = pd.crosstab(target, feature)
+    # Membuat tabel kontingensi dari kode kategori (pd.crosstab mengiterasi setiap nilai sebagai objek
+    # Python); kategori yang tidak muncul dibuang seperti crosstab + _observed
+    target_codes, target_labels = _category_codes(target)
+    feature_codes, feature_labels = _category_codes(feature)
+    table = _joint_counts([target_codes], [len(target_labels)], feature_codes, len(feature_labels),
+                          chunk_size=len(target_codes))[0]
+    keep_rows, keep_cols = table.sum(axis=1) > 0, table.sum(axis=0) > 0
+    contingency_table = pd.DataFrame(table[keep_rows][:, keep_cols],
+                                     index=pd.Index(target_labels[keep_rows], name=target_col),
+                                     columns=pd.Index(feature_labels[keep_cols], name=feature_col))
 
     # Uji Chi-Square
     chi2_stat, p_val, dof, expected = stats.chi2_contingency(contingency_table)
 
+    if headless:
+        return HypothesisTestResult(
+            test='chi-square', target_col=target_col, feature_col=feature_col,
+            statistic=chi2_stat, p_value=p_val, alpha=alpha, significant=bool(p_val < alpha),
+            details={'dof': dof, 'observed': contingency_table,
+                     'expected': pd.DataFrame(expected, index=contingency_table.index,
+                                              columns=contingency_table.columns)})
+
     # Menentukan signifikansi
     signif = "Signifikan" if p_val < alpha else "Tidak signifikan"
 
@@ -823,7 +2089,7 @@ def chi_square_analysis(df, target_col, feature_col, alpha=0.05, h0=None, h1=Non
     plt.tight_layout()
     plt.show()
 
-def evaluate_model_class_report(model, X_train, y_train, X_test, y_test):
+def evaluate_model_class_report(model, X_train, y_train, X_test, y_test, headless=None):
     """
     Parameters:
     - model: model yang sudah dilatih (KNN, SVC, Decision Tree, Random Forest, Gradient Boost)
@@ -831,14 +2097,24 @@ def evaluate_model_class_report(model, X_train, y_train, X_test, y_test):
     - y_train: Data label untuk training
     - X_test: Data fitur untuk testing
     - y_test: Data label untuk testing
+    - headless: True untuk tidak mencetak/plot dan mengembalikan ModelReportResult (default None, mengikuti HEADLESS global)
     
     Returns:
-    - None: Mencetak hasil evaluasi
+    - None: Mencetak hasil evaluasi (ModelReportResult pada headless mode)
     """
+    from sklearn.metrics import confusion_matrix, classification_report  # type: ignore
+
     # Prediksi hasil model pada data uji dan data latih
     y_pred_tuning_train = model.predict(X_train)
     y_pred_tuning_test = model.predict(X_test)
 
+    if _is_headless(headless):
+        return ModelReportResult(
+            report_train=classification_report(y_train, y_pred_tuning_train, output_dict=True),
+            report_test=classification_report(y_test, y_pred_tuning_test, output_dict=True),
+            confusion_train=confusion_matrix(y_train, y_pred_tuning_train),
+            confusion_test=confusion_matrix(y_test, y_pred_tuning_test))
+
     # 3. Classification report
     print("=============== Classification Report ===============\n")
     print("Train Data:")
@@ -869,6 +2145,7 @@ def evaluate_model_class_report(model, X_train, y_train, X_test, y_test):
 
 
 
+@_traced
 def analyze_feature_correlations(df, target='Status', alpha=0.05,
                                  numeric_features=[], ordinal_features=[], 
                                  nominal_features=[], binary_features=[]):
@@ -899,14 +2176,6 @@ def analyze_feature_correlations(df, target='Status', alpha=0.05,
     # Inisialisasi list untuk hasil
     results = []
     
-    # Fungsi untuk menghitung eta squared (untuk nominal dan binary)
-    def calculate_eta_squared(feature, target_series):
-        contingency_table = pd.crosstab(feature, target_series)
-        chi2, p_value, dof, expected = stats.chi2_contingency(contingency_table)
-        n = len(feature)
-        eta_sq = chi2 / (n + chi2)
-        return eta_sq, p_value
-    
     # Analisis fitur numerik menggunakan korelasi Spearman
     for feature in numeric_features:
         if feature in df.columns:
@@ -922,8 +2191,8 @@ def analyze_feature_correlations(df, target='Status', alpha=0.05,
     # Analisis fitur ordinal menggunakan korelasi Kendall Tau
     for feature in ordinal_features:
         if feature in df.columns:
-            correlation, p_value = stats.kendalltau(pd.Categorical(df[feature]).codes, 
-                                                   pd.Categorical(df[target]).codes)
+            correlation, p_value = kendall_tau(pd.Categorical(df[feature]).codes, 
+                                               pd.Categorical(df[target]).codes)
             results.append({
                 'name_feature': feature,
                 'method_corr': 'Kendall',
@@ -933,16 +2202,21 @@ def analyze_feature_correlations(df, target='Status', alpha=0.05,
             })
     
     # Analisis fitur nominal dan binary menggunakan Chi-square dan Eta squared
-    for feature in nominal_features + binary_features:
-        if feature in df.columns:
-            eta_sq, p_value = calculate_eta_squared(df[feature], df[target])
-            results.append({
-                'name_feature': feature,
-                'method_corr': 'Chi-square (Eta-squared)',
-                'p_value': p_value,
-                'significant_or_not': 'Significant' if p_value < alpha else 'Not Significant',
-                'corr_value': eta_sq
-            })
+    # (semua tabel kontingensi dibangun sekali oleh contingency_tests)
+    chi_features = [feature for feature in nominal_features + binary_features if feature in df.columns]
+    if chi_features:
+        chi_table = contingency_tests(df, target, features=chi_features).table.set_index('Feature')
+    for feature in chi_features:
+        chi2, p_value = chi_table.loc[feature, 'Chi2'], chi_table.loc[feature, 'p_value']
+        # n = jumlah baris df (termasuk baris NaN), sama seperti definisi eta squared sebelumnya
+        eta_sq = chi2 / (len(df) + chi2)
+        results.append({
+            'name_feature': feature,
+            'method_corr': 'Chi-square (Eta-squared)',
+            'p_value': p_value,
+            'significant_or_not': 'Significant' if p_value < alpha else 'Not Significant',
+            'corr_value': eta_sq
+        })
     
     # Membuat DataFrame dan mengurutkan berdasarkan nilai korelasi
     results_df = pd.DataFrame(results)
@@ -953,3 +2227,2512 @@ def analyze_feature_correlations(df, target='Status', alpha=0.05,
     results_df['corr_value'] = results_df['corr_value'].round(4)
     
     return results_df
+
+
+# 13. Streaming / chunked ingestion
+LISTING_COLUMNS = ['model', 'year', 'price', 'transmission', 'mileage', 'fuelType', 'tax', 'mpg', 'engineSize']
+
+# Tipe data ringkas untuk skema listing BMW (dipakai saat membaca CSV per chunk)
+LISTING_DTYPES = {
+    'model': 'category',
+    'year': 'int16',
+    'price': 'int32',
+    'transmission': 'category',
+    'mileage': 'int32',
+    'fuelType': 'category',
+    'tax': 'int16',
+    'mpg': 'float32',
+    'engineSize': 'float32',
+}
+
+
+def _listing_read_dtypes(columns):
+    # Kolom integer dibaca sebagai float64 agar baris dengan nilai kosong tidak membuat read_csv gagal
+    return {col: ('float64' if LISTING_DTYPES[col].startswith('int') else LISTING_DTYPES[col])
+            for col in columns if col in LISTING_DTYPES}
+
+
+def _downcast_listing_integers(df):
+    # Kolom integer LISTING_DTYPES di-downcast hanya jika tidak ada missing value; selain itu tetap float64
+    for col, dtype in LISTING_DTYPES.items():
+        if col in df.columns and dtype.startswith('int') and str(df[col].dtype) != dtype \
+                and not df[col].isna().any():
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def read_listing_chunks(path, chunksize=500_000, columns=None):
+    """
+    Membaca CSV listing per chunk dengan dtype ringkas, tanpa memuat seluruh file ke memori.
+
+    Parameters:
+    path: str
+        Lokasi file CSV (skema bmw.csv).
+    chunksize: int, optional, default=500_000
+        Jumlah baris per chunk.
+    columns: list, optional, default=None
+        Subset kolom yang dibaca. Default seluruh LISTING_COLUMNS.
+
+    Yields:
+    DataFrame per chunk dengan nama kolom dan nilai string yang sudah di-strip. Kolom integer yang
+    punya missing value di chunk tersebut tetap float64.
+    """
+    columns = LISTING_COLUMNS if columns is None else list(columns)
+    reader = pd.read_csv(path, usecols=columns, dtype=_listing_read_dtypes(columns), skipinitialspace=True,
+                         chunksize=chunksize)
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip()
+        yield _downcast_listing_integers(chunk)
+
+
+class QuantileSketch:
+    """
+    Sketch kuantil yang bisa di-merge (centroid berbobot, mirip t-digest).
+
+    Selama jumlah nilai unik <= compression, sketch menyimpan nilai unik beserta frekuensinya
+    sehingga kuantil, modus, dan hitungan di luar batas identik dengan hasil exact.
+    Setelah itu centroid digabung dengan skala arcsin agar ekor distribusi tetap presisi.
+    """
+
+    def __init__(self, compression=2000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.exact = True
+
+    @property
+    def count(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        uniq, freq = np.unique(values, return_counts=True)
+        self._absorb(uniq, freq.astype(np.float64))
+        return self
+
+    def merge(self, other):
+        self._absorb(other.means, other.weights)
+        self.exact = self.exact and other.exact
+        return self
+
+    def retract(self, values):
+        """
+        Mengurangi nilai yang sebelumnya dimasukkan (mis. listing yang dihapus).
+
+        Exact selama sketch belum dikompresi; setelah itu bobot dikurangi dari centroid terdekat.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values) or not len(self.means):
+            return self
+        uniq, freq = np.unique(values, return_counts=True)
+        pos = np.searchsorted(self.means, uniq)
+        if self.exact:
+            found = (pos < len(self.means)) & (self.means[np.minimum(pos, len(self.means) - 1)] == uniq)
+            idx, freq = pos[found], freq[found]
+        else:
+            right = np.minimum(pos, len(self.means) - 1)
+            left = np.maximum(pos - 1, 0)
+            idx = np.where(np.abs(self.means[left] - uniq) <= np.abs(self.means[right] - uniq), left, right)
+        weights = self.weights.copy()
+        np.subtract.at(weights, idx, freq.astype(np.float64))
+        keep = weights > 0
+        self.means, self.weights = self.means[keep], weights[keep]
+        return self
+
+    def _absorb(self, means, weights):
+        means = np.concatenate((self.means, means))
+        weights = np.concatenate((self.weights, weights))
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # Gabungkan nilai yang sama persis (exact untuk kolom diskrit seperti year/tax)
+        if self.exact and len(means):
+            uniq, inverse = np.unique(means, return_inverse=True)
+            weights = np.bincount(inverse, weights=weights)
+            means = uniq
+
+        if len(means) > self.compression:
+            total = weights.sum()
+            q_left = (np.cumsum(weights) - weights) / total
+            scale = self.compression / 2 * (np.arcsin(2 * q_left - 1) / np.pi + 0.5)
+            bins = np.floor(scale).astype(np.int64)
+            _, bins = np.unique(bins, return_inverse=True)
+            w = np.bincount(bins, weights=weights)
+            means = np.bincount(bins, weights=means * weights) / w
+            weights = w
+            self.exact = False
+
+        self.means, self.weights = means, weights
+
+    def quantile(self, q):
+        """
+        Kuantil dengan interpolasi linear (sama seperti pandas) atas posisi q * (n - 1).
+        """
+        if not len(self.means):
+            return np.nan
+        n = self.count
+        pos = np.asarray(q, dtype=np.float64) * (n - 1)
+        cum = np.cumsum(self.weights)
+        lo = np.floor(pos)
+        lo_val = self.means[np.minimum(np.searchsorted(cum, lo, side='right'), len(cum) - 1)]
+        hi_val = self.means[np.minimum(np.searchsorted(cum, np.ceil(pos), side='right'), len(cum) - 1)]
+        return lo_val + (pos - lo) * (hi_val - lo_val)
+
+    def mode(self):
+        # Hanya bermakna selama sketch masih exact
+        if not self.exact or not len(self.means):
+            return np.nan
+        return self.means[np.argmax(self.weights)]
+
+    def count_outside(self, lower, upper):
+        """
+        Jumlah (perkiraan) nilai < lower ditambah nilai > upper.
+        """
+        return self.weights[self.means < lower].sum() + self.weights[self.means > upper].sum()
+
+
+class StreamingStats:
+    """
+    Akumulator statistik yang bisa di-merge untuk data yang dibaca per chunk.
+
+    Menyimpan count, mean, momen sentral ke-2..4 (untuk std, skew, kurtosis), min/max,
+    QuantileSketch per kolom numerik, dan frekuensi nilai per kolom kategorikal.
+    Memori sebanding dengan jumlah kolom (dan compression sketch), bukan jumlah baris.
+
+    Objek ini bisa langsung diberikan ke descriptive_statistics, check_outlier,
+    dan calculate_value_percentage sebagai pengganti DataFrame.
+    """
+
+    def __init__(self, compression=2000):
+        self.compression = compression
+        self.n_rows = 0
+        self.numeric_cols = []
+        self.n = self.mean = self.m2 = self.m3 = self.m4 = self.min = self.max = None
+        self.sketches = {}
+        self.category_counts = {}
+
+    def _init_numeric(self, cols):
+        k = len(cols)
+        self.numeric_cols = list(cols)
+        self.n = np.zeros(k)
+        self.mean, self.m2, self.m3, self.m4 = (np.zeros(k) for _ in range(4))
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        self.sketches = {col: QuantileSketch(self.compression) for col in cols}
+
+    def update(self, chunk):
+        """
+        Menambahkan satu chunk DataFrame ke akumulator.
+        """
+        if self.n is None:
+            self._init_numeric(chunk.select_dtypes(include='number').columns)
+
+        other = StreamingStats(self.compression)
+        other._init_numeric(self.numeric_cols)
+        other.n_rows = len(chunk)
+        for i, col in enumerate(self.numeric_cols):
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if not len(values):
+                continue
+            dev = values - values.mean()
+            dev2 = dev * dev
+            other.n[i] = len(values)
+            other.mean[i] = values.mean()
+            other.m2[i], other.m3[i], other.m4[i] = dev2.sum(), (dev2 * dev).sum(), (dev2 * dev2).sum()
+            other.min[i], other.max[i] = values.min(), values.max()
+            other.sketches[col].update(values)
+
+        for col in chunk.columns:
+            if col not in self.numeric_cols:
+                counts = chunk[col].value_counts(sort=False)
+                counts.index = counts.index.astype(object)
+                other.category_counts[col] = counts
+
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        Menggabungkan akumulator lain (mis. dari worker lain) ke akumulator ini.
+        """
+        if self.n is None:
+            self._init_numeric(other.numeric_cols)
+
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = other.mean - self.mean
+            nab = na * nb
+            mean = np.where(n > 0, self.mean + delta * nb / n, 0.0)
+            m2 = self.m2 + other.m2 + np.where(n > 0, delta ** 2 * nab / n, 0.0)
+            m3 = (self.m3 + other.m3 +
+                  np.where(n > 0, delta ** 3 * nab * (na - nb) / n ** 2
+                           + 3 * delta * (na * other.m2 - nb * self.m2) / n, 0.0))
+            m4 = (self.m4 + other.m4 +
+                  np.where(n > 0, delta ** 4 * nab * (na ** 2 - nab + nb ** 2) / n ** 3
+                           + 6 * delta ** 2 * (na ** 2 * other.m2 + nb ** 2 * self.m2) / n ** 2
+                           + 4 * delta * (na * other.m3 - nb * self.m3) / n, 0.0))
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.n_rows += other.n_rows
+
+        for col, sketch in other.sketches.items():
+            self.sketches[col].merge(sketch)
+        for col, counts in other.category_counts.items():
+            if col in self.category_counts:
+                self.category_counts[col] = self.category_counts[col].add(counts, fill_value=0).astype(np.int64)
+            else:
+                self.category_counts[col] = counts.astype(np.int64)
+        return self
+
+    def describe(self):
+        """
+        Tabel statistik deskriptif (format sama dengan descriptive_table).
+        Kuantil dan modus berasal dari QuantileSketch (exact selama sketch belum dikompresi).
+        """
+        nobs = self.n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(self.m2 / (nobs - 1))
+            skew = (nobs * (nobs - 1) ** 0.5 / (nobs - 2)) * (self.m3 / self.m2 ** 1.5)
+            kurt = (nobs * (nobs + 1) * (nobs - 1) * self.m4 / ((nobs - 2) * (nobs - 3) * self.m2 ** 2)
+                    - 3 * (nobs - 1) ** 2 / ((nobs - 2) * (nobs - 3)))
+        skew = np.where(self.m2 == 0, 0.0, skew)
+        kurt = np.where(self.m2 == 0, 0.0, kurt)
+        skew = np.where(nobs < 3, np.nan, skew)
+        kurt = np.where(nobs < 4, np.nan, kurt)
+
+        quartiles = np.array([self.sketches[col].quantile([0.25, 0.5, 0.75]) for col in self.numeric_cols])
+        table = pd.DataFrame({
+            'count': nobs.astype(np.int64),
+            'mean': self.mean,
+            'median': quartiles[:, 1],
+            'mode': [self.sketches[col].mode() for col in self.numeric_cols],
+            'std': std,
+            'range': self.max - self.min,
+            'skew': skew,
+            'kurtosis': kurt,
+            'min': self.min,
+            'q1': quartiles[:, 0],
+            'q2': quartiles[:, 1],
+            'q3': quartiles[:, 2],
+            'max': self.max,
+        }, index=self.numeric_cols)
+        return table[DESCRIPTIVE_STATS]
+
+    def value_counts(self, column):
+        if column not in self.category_counts:
+            raise ValueError(f"Kolom '{column}' tidak ditemukan dalam StreamingStats.")
+        counts = self.category_counts[column]
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+def stream_statistics(source, chunksize=500_000, compression=2000):
+    """
+    Membangun StreamingStats dari path CSV atau iterable of DataFrame chunks.
+
+    Parameters:
+    source: str or iterable
+        Path CSV (dibaca dengan read_listing_chunks) atau iterable DataFrame.
+    chunksize: int, optional, default=500_000
+        Ukuran chunk jika source berupa path.
+    compression: int, optional, default=2000
+        Jumlah centroid maksimum per QuantileSketch.
+    """
+    chunks = read_listing_chunks(source, chunksize=chunksize) if isinstance(source, str) else source
+    acc = StreamingStats(compression)
+    for chunk in chunks:
+        acc.update(chunk)
+    return acc
+
+
+def _check_outlier_stream(acc):
+    # Versi check_outlier untuk StreamingStats: batas dari momen/sketch, jumlah outlier dari sketch
+    bounds = fit_outlier_bounds(acc)
+    n_out = [acc.sketches[col].count_outside(lower, upper)
+             for col, lower, upper in zip(bounds.columns, bounds.lower, bounds.upper)]
+    return pd.DataFrame({
+        'column': bounds.columns,
+        'Skewness Value': bounds.skew,
+        'Distribusi': bounds.distribution,
+        'lower_boundary': np.round(bounds.lower, 2),
+        'upper_boundary': np.round(bounds.upper, 2),
+        'percentage_total_outlier (%)': np.asarray(n_out) / acc.n_rows * 100,
+    })
+
+
+# 14. Compact in-memory representation
+SEGMENT_KEYS = ['model', 'year', 'fuelType']
+
+
+def _strip_categorical(series):
+    categories = series.cat.categories.astype(str).str.strip()
+    if categories.is_unique:
+        return series.cat.rename_categories(categories)
+    # Beberapa kategori menjadi sama setelah strip, bangun ulang kategorinya
+    return series.astype(str).str.strip().astype('category')
+
+
+def compact_listing(df, headless=None):
+    """
+    Menormalkan dan meringkas DataFrame listing.
+
+    - Nama kolom dan nilai string di-strip (" 5 Series" -> "5 Series")
+    - Kolom string (model, transmission, fuelType, ...) menjadi category
+    - Kolom integer/float di-downcast ke tipe terkecil yang muat (mis. year int16, mpg float32)
+
+    Parameters:
+    df: DataFrame
+        DataFrame listing (hasil pd.read_csv).
+    headless: bool or None, optional, default=None
+        Jika tidak headless, mencetak ringkasan pemakaian memori sebelum dan sesudah.
+
+    Returns:
+    DataFrame ringkas (salinan baru).
+    """
+    before = df.memory_usage(deep=True).sum()
+
+    out = df.copy()
+    out.columns = out.columns.str.strip()
+    for col in out.columns:
+        series = out[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            out[col] = _strip_categorical(series)
+        elif pd.api.types.is_string_dtype(series.dtype) or pd.api.types.is_object_dtype(series.dtype):
+            # pandas 3 membaca kolom teks sebagai dtype 'str', bukan object
+            out[col] = series.str.strip().astype('category')
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            out[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype):
+            out[col] = pd.to_numeric(series, downcast='float')
+
+    if not _is_headless(headless):
+        after = out.memory_usage(deep=True).sum()
+        print(f"Memory usage before : {before / 1024 ** 2:,.2f} MB")
+        print(f"Memory usage after  : {after / 1024 ** 2:,.2f} MB ({before / after:.1f}x smaller)")
+
+    return out
+
+
+def load_listing(path, headless=None):
+    """
+    Membaca CSV listing langsung ke representasi ringkas (dtype LISTING_DTYPES, string di-strip).
+
+    Pengganti pd.read_csv(path, skipinitialspace=True) + df.columns.str.strip() di notebook.
+    Kolom di luar LISTING_DTYPES diringkas dengan aturan compact_listing. Kolom integer yang punya
+    missing value tetap float64.
+    """
+    df = pd.read_csv(path, dtype=_listing_read_dtypes(LISTING_DTYPES), skipinitialspace=True)
+    df.columns = df.columns.str.strip()
+    df = _downcast_listing_integers(df)
+    for col in df.columns:
+        if LISTING_DTYPES.get(col) == 'category':
+            df[col] = _strip_categorical(df[col])
+    extra = [col for col in df.columns if col not in LISTING_DTYPES]
+    if extra:
+        df[extra] = compact_listing(df[extra], headless=True)
+
+    if not _is_headless(headless):
+        print(f"Memory usage : {df.memory_usage(deep=True).sum() / 1024 ** 2:,.2f} MB")
+    return df
+
+
+def memory_report(df_before, df_after):
+    """
+    Tabel pemakaian memori per kolom (bytes, deep) sebelum dan sesudah compact_listing.
+    """
+    before = df_before.memory_usage(deep=True, index=False)
+    before.index = before.index.str.strip()
+    after = df_after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype_before': df_before.dtypes.set_axis(before.index),
+        'dtype_after': df_after.dtypes,
+        'bytes_before': before,
+        'bytes_after': after,
+    })
+    report.loc['TOTAL', ['bytes_before', 'bytes_after']] = [before.sum(), after.sum()]
+    report['ratio'] = report['bytes_before'] / report['bytes_after']
+    return report
+
+
+def segment_index(df, keys=None):
+    """
+    Kunci segmen model-tahun-fuel sebagai MultiIndex berbasis kode kategori,
+    pengganti kolom string hasil concat (model_tahun, model_tahun_fuel).
+
+    Parameters:
+    df: DataFrame
+        DataFrame listing (sebaiknya hasil compact_listing).
+    keys: list, optional, default=SEGMENT_KEYS
+        Kolom yang membentuk kunci segmen.
+
+    Returns:
+    MultiIndex sepanjang df, mis. df.set_index(segment_index(df)).groupby(level=SEGMENT_KEYS, observed=True).
+    """
+    keys = SEGMENT_KEYS if keys is None else list(keys)
+    return pd.MultiIndex.from_arrays(
+        [df[key] if isinstance(df[key].dtype, pd.CategoricalDtype) else pd.Categorical(df[key]) for key in keys],
+        names=keys)
+
+
+# 15. Grouped hypothesis testing per segment
+GROUPED_TESTS = ('spearman', 't-test', 'anova', 'chi-square')
+
+
+def adjust_pvalues(p_values, method='fdr_bh'):
+    """
+    Koreksi multiple testing untuk array p-value (NaN diabaikan dan tetap NaN).
+
+    Parameters:
+    p_values: array-like
+        P-value mentah.
+    method: str, optional, default='fdr_bh'
+        'fdr_bh' (Benjamini-Hochberg), 'holm', atau 'bonferroni'.
+    """
+    p = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full_like(p, np.nan)
+    valid = ~np.isnan(p)
+    pv = p[valid]
+    m = len(pv)
+    if m == 0:
+        return adjusted
+
+    if method == 'bonferroni':
+        adj = np.minimum(pv * m, 1.0)
+    elif method == 'holm':
+        order = np.argsort(pv)
+        stepped = np.maximum.accumulate(pv[order] * (m - np.arange(m)))
+        adj = np.empty(m)
+        adj[order] = np.minimum(stepped, 1.0)
+    elif method == 'fdr_bh':
+        order = np.argsort(pv)[::-1]
+        stepped = np.minimum.accumulate(pv[order] * m / np.arange(m, 0, -1))
+        adj = np.empty(m)
+        adj[order] = np.minimum(stepped, 1.0)
+    else:
+        raise ValueError("method harus 'fdr_bh', 'holm', atau 'bonferroni'")
+
+    adjusted[valid] = adj
+    return adjusted
+
+
+def _segment_test(test, a, b, permutations=None):
+    """
+    Menjalankan satu uji pada satu segmen (p-value permutasi jika permutations diisi).
+    a dan b adalah ndarray segmen:
+    - spearman   : a, b numerik
+    - t-test     : a numerik, b kode grup (harus tepat 2 grup)
+    - anova      : a numerik, b kode grup (minimal 2 grup)
+    - chi-square : a, b kode kategori
+    Mengembalikan (statistic, p_value); NaN jika segmen tidak memenuhi syarat.
+    """
+    n = len(a)
+    if test == 'spearman':
+        if n < 3:
+            return np.nan, np.nan
+        if permutations:
+            res = permutation_test(test, a, b, n_permutations=permutations)
+            return res.statistic, res.p_value
+        res = stats.spearmanr(a, b)
+        return res[0], res[1]
+
+    if test in ('t-test', 'anova'):
+        levels = np.unique(b)
+        if (test == 't-test' and len(levels) != 2) or len(levels) < 2:
+            return np.nan, np.nan
+        order = np.argsort(b, kind='stable')
+        splits = np.split(a[order], np.flatnonzero(np.diff(b[order])) + 1)
+        if test == 't-test':
+            if min(len(group) for group in splits) < 2:
+                return np.nan, np.nan
+            res = stats.ttest_ind(splits[0], splits[1], equal_var=False)
+        else:
+            if n <= len(splits):
+                return np.nan, np.nan
+            res = stats.f_oneway(*splits)
+        if permutations:
+            # Statistik tetap dari scipy (sama dengan permutation_test), hanya p-value yang diganti
+            return res[0], permutation_test(test, a, b, n_permutations=permutations).p_value
+        return res[0], res[1]
+
+    if test == 'chi-square':
+        a_levels, a_codes = np.unique(a, return_inverse=True)
+        b_levels, b_codes = np.unique(b, return_inverse=True)
+        n_a, n_b = len(a_levels), len(b_levels)
+        if n_a < 2 or n_b < 2:
+            return np.nan, np.nan
+        table = np.bincount(a_codes * n_b + b_codes, minlength=n_a * n_b).reshape(n_a, n_b)
+        chi2, p_val, _, _ = stats.chi2_contingency(table)
+        return chi2, p_val
+
+    raise ValueError(f"test harus salah satu dari {GROUPED_TESTS}")
+
+
+def _segment_batch(test, a, b, bounds, permutations=None):
+    # Worker: satu batch segmen (slice berurutan dari array yang sudah dipartisi)
+    return [_segment_test(test, a[start:stop], b[start:stop], permutations) for start, stop in bounds]
+
+
+def grouped_tests(df, by, test, x, y, alpha=0.05, correction='fdr_bh', min_n=3, n_jobs=None, batch_size=256,
+                  permutations=None):
+    """
+    Menjalankan uji hipotesis untuk setiap segmen (mis. fuelType atau model x year) sekaligus.
+
+    Data dipartisi satu kali lewat groupby indices (tanpa boolean masking berulang),
+    lalu uji dijalankan per segmen, opsional paralel di process pool.
+
+    Parameters:
+    df: DataFrame
+        Data listing.
+    by: str or list
+        Kolom segmen, mis. 'fuelType' atau ['model', 'year'].
+    test: str
+        'spearman' (x, y numerik), 't-test' / 'anova' (x numerik, y kolom grup),
+        atau 'chi-square' (x, y kategorikal).
+    x, y: str
+        Kolom yang diuji.
+    alpha: float, optional, default=0.05
+        Tingkat signifikansi setelah koreksi.
+    correction: str or None, optional, default='fdr_bh'
+        Metode koreksi multiple testing ('fdr_bh', 'holm', 'bonferroni', atau None).
+    min_n: int, optional, default=3
+        Segmen dengan jumlah baris lebih kecil dari ini tidak diuji (hasil NaN).
+    n_jobs: int or None, optional, default=None
+        Jumlah proses worker. None atau 1 berarti dijalankan di proses ini.
+    batch_size: int, optional, default=256
+        Jumlah segmen per task yang dikirim ke worker.
+    permutations: int, bool or None, optional, default=None
+        Jika diisi, p-value spearman / t-test / anova dihitung dengan permutation_test (True berarti
+        PERMUTATIONS permutasi; segmen sangat kecil dienumerasi exact). Tidak berlaku untuk chi-square.
+
+    Returns:
+    DataFrame satu baris per segmen: kolom segmen, test, statistic, p_value, n, p_adjusted, significant.
+    """
+    if test not in GROUPED_TESTS:
+        raise ValueError(f"test harus salah satu dari {GROUPED_TESTS}")
+    if permutations and test not in PERMUTATION_TESTS:
+        raise ValueError(f"permutations hanya untuk test {PERMUTATION_TESTS}")
+    permutations = PERMUTATIONS if permutations is True else permutations
+    by_cols = [by] if isinstance(by, str) else list(by)
+
+    # Kolom kategorikal diubah ke kode integer sekali untuk seluruh frame
+    def as_array(col, categorical):
+        if categorical:
+            return pd.factorize(df[col])[0]
+        return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    a = as_array(x, categorical=(test == 'chi-square'))
+    b = as_array(y, categorical=(test != 'spearman'))
+
+    # Partisi sekali: urutkan baris per segmen, setiap segmen menjadi slice [start, stop)
+    grouped = df.groupby(by_cols, sort=True, observed=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    keys = grouped.size()
+    # Buang baris dengan missing value (NaN untuk numerik, kode -1 untuk kategorikal)
+    keep = codes >= 0
+    keep &= (a >= 0) if test == 'chi-square' else ~np.isnan(a)
+    keep &= ~np.isnan(b) if test == 'spearman' else (b >= 0)
+
+    order = np.argsort(codes[keep], kind='stable')
+    a, b = a[keep][order], b[keep][order]
+    counts = np.bincount(codes[keep], minlength=len(keys))
+    stops = np.cumsum(counts)
+    bounds = list(zip(stops - counts, stops))
+
+    tested = [i for i, n in enumerate(counts) if n >= min_n]
+    tasks = [[bounds[i] for i in tested[j:j + batch_size]] for j in range(0, len(tested), batch_size)]
+
+    if n_jobs is None or n_jobs == 1:
+        batches = [_segment_batch(test, a, b, task, permutations) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(_segment_batch, test,
+                                   a[task[0][0]:task[-1][1]], b[task[0][0]:task[-1][1]],
+                                   [(start - task[0][0], stop - task[0][0]) for start, stop in task],
+                                   permutations)
+                       for task in tasks]
+            batches = [future.result() for future in futures]
+
+    statistic = np.full(len(keys), np.nan)
+    p_value = np.full(len(keys), np.nan)
+    flat = [res for batch in batches for res in batch]
+    if flat:
+        statistic[tested] = [res[0] for res in flat]
+        p_value[tested] = [res[1] for res in flat]
+
+    results = keys.index.to_frame(index=False)
+    results['test'] = test
+    results['statistic'] = statistic
+    results['p_value'] = p_value
+    results['n'] = counts
+    results['p_adjusted'] = adjust_pvalues(p_value, correction) if correction else p_value
+    results['significant'] = results['p_adjusted'] < alpha
+    return results
+
+
+# 16. Confidence interval engine for residual-value ranking
+# Aturan notebook: mobil listrik sangat sedikit sehingga semua grup dipakai, fuel lain minimal 3 unit
+MIN_COUNT_BY_FUEL = {'Electric': 1}
+
+
+def _bootstrap_means(values, starts, counts, n_boot, rng, chunk_size):
+    """
+    Bootstrap mean untuk banyak grup sekaligus.
+
+    values diurutkan per grup; grup ke-g adalah values[starts[g]:starts[g] + counts[g]].
+    Setiap replikasi menarik counts[g] indeks acak di dalam grup g untuk semua grup sekaligus,
+    lalu dijumlahkan per grup dengan np.add.reduceat. Replikasi diproses per chunk agar memori terbatas.
+
+    Returns:
+    ndarray (n_boot, n_groups) berisi mean hasil resampling.
+    """
+    n_total = counts.sum()
+    group_of = np.repeat(np.arange(len(counts)), counts)
+    base = starts[group_of]
+    size = counts[group_of]
+    out = np.empty((n_boot, len(counts)))
+
+    rows_per_chunk = max(1, chunk_size // max(n_total, 1))
+    for begin in range(0, n_boot, rows_per_chunk):
+        stop = min(begin + rows_per_chunk, n_boot)
+        idx = base + (rng.random((stop - begin, n_total)) * size).astype(np.int64)
+        out[begin:stop] = np.add.reduceat(values[idx], starts, axis=1) / counts
+    return out
+
+
+def segment_confidence_intervals(df, value='price', keys=('model', 'year'), fuel_col='fuelType',
+                                 confidence=0.95, n_boot=10_000, seed=42, min_count=3,
+                                 min_count_by_fuel=None, top_n=5, chunk_size=20_000_000):
+    """
+    Menghitung CI berbasis t dan bootstrap untuk semua grup (model, year) per fuelType sekaligus,
+    lalu mengambil top-N grup dengan mean harga tertinggi per fuelType.
+
+    Parameters:
+    df: DataFrame
+        Data listing.
+    value: str, optional, default='price'
+        Kolom numerik yang dihitung CI-nya.
+    keys: tuple, optional, default=('model', 'year')
+        Kolom pembentuk grup di dalam setiap fuelType.
+    fuel_col: str, optional, default='fuelType'
+        Kolom jenis bahan bakar untuk aturan min_count dan ranking.
+    confidence: float, optional, default=0.95
+        Tingkat kepercayaan.
+    n_boot: int, optional, default=10_000
+        Jumlah replikasi bootstrap (0 untuk hanya CI berbasis t).
+    seed: int, optional, default=42
+        Seed generator acak agar hasil bootstrap dapat direproduksi.
+    min_count: int, optional, default=3
+        Jumlah unit minimal per grup.
+    min_count_by_fuel: dict, optional, default=None
+        Pengecualian per fuelType, default MIN_COUNT_BY_FUEL ({'Electric': 1}).
+    top_n: int or None, optional, default=5
+        Jumlah grup teratas per fuelType (None untuk semua grup).
+    chunk_size: int, optional, default=20_000_000
+        Batas jumlah sampel acak per chunk bootstrap (membatasi memori).
+
+    Returns:
+    DataFrame: fuel_col, keys..., count, mean, std, t_lower, t_upper, boot_lower, boot_upper, rank.
+    """
+    min_count_by_fuel = MIN_COUNT_BY_FUEL if min_count_by_fuel is None else min_count_by_fuel
+    group_cols = [fuel_col] + list(keys)
+
+    data = df[group_cols + [value]].dropna()
+    grouped = data.groupby(group_cols, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    summary = grouped[value].agg(['count', 'mean', 'std']).reset_index()
+
+    # Aturan jumlah minimal per fuelType
+    required = summary[fuel_col].map(lambda fuel: min_count_by_fuel.get(fuel, min_count)).astype(np.int64)
+    eligible = (summary['count'] >= required).to_numpy()
+
+    # CI berbasis distribusi t
+    n = summary['count'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        half = stats.t.ppf(0.5 + confidence / 2, n - 1) * summary['std'].to_numpy() / np.sqrt(n)
+    summary['t_lower'] = summary['mean'] - half
+    summary['t_upper'] = summary['mean'] + half
+
+    # Bootstrap percentile CI, semua grup eligible dalam satu proses vektor
+    summary['boot_lower'] = np.nan
+    summary['boot_upper'] = np.nan
+    if n_boot and eligible.any():
+        keep = eligible[codes]
+        new_code = np.cumsum(eligible) - 1
+        sub_codes = new_code[codes[keep]]
+        order = np.argsort(sub_codes, kind='stable')
+        values = data[value].to_numpy(dtype=np.float64)[keep][order]
+        counts = np.bincount(sub_codes, minlength=eligible.sum())
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        rng = np.random.default_rng(seed)
+        boot = _bootstrap_means(values, starts, counts, n_boot, rng, chunk_size)
+        alpha = 1 - confidence
+        lower, upper = np.quantile(boot, [alpha / 2, 1 - alpha / 2], axis=0)
+        summary.loc[eligible, 'boot_lower'] = lower
+        summary.loc[eligible, 'boot_upper'] = upper
+
+    # Ranking per fuelType berdasarkan mean harga tertinggi
+    ranked = summary[eligible].sort_values([fuel_col, 'mean'], ascending=[True, False])
+    ranked['rank'] = ranked.groupby(fuel_col, observed=True).cumcount() + 1
+    if top_n is not None:
+        ranked = ranked[ranked['rank'] <= top_n]
+    return ranked.reset_index(drop=True)
+
+
+# 17. Memoized analysis cache
+# data_explore, correlation_analysis dan check_outlier menyimpan hasil perhitungannya di cache
+# dengan key fingerprint isi DataFrame + argumen. Cache tidak aktif sampai enable_cache() dipanggil.
+_ANALYSIS_CACHE = None
+
+
+def frame_fingerprint(df):
+    """
+    Fingerprint isi DataFrame: shape, nama dan dtype kolom, serta hash nilai per baris (termasuk index).
+
+    Satu kali hash vektor (pd.util.hash_pandas_object), jauh lebih murah dari analisis yang di-cache.
+    Perubahan in-place pada df menghasilkan fingerprint yang berbeda.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((df.shape, [str(col) for col in df.columns], [str(dtype) for dtype in df.dtypes])).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Cache hasil analisis: LRU in-memory dengan batas jumlah entry, plus cache pickle opsional di disk.
+
+    Parameters:
+    maxsize: int, optional, default=32
+        Jumlah entry maksimum di memori; entry yang paling lama tidak dipakai dibuang lebih dulu.
+    cache_dir: str or None, optional, default=None
+        Folder cache di disk. Entry di disk bertahan antar sesi notebook sampai di-invalidate.
+    """
+
+    def __init__(self, maxsize=32, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(name, fingerprint, args):
+        arg_hash = hashlib.blake2b(repr((name, args)).encode(), digest_size=8).hexdigest()
+        return f"{fingerprint}-{name}-{arg_hash}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pkl')
+
+    def get(self, key):
+        """
+        Mengembalikan (found, value). Nilai yang dikembalikan adalah salinan agar entry di cache aman.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.deepcopy(self._entries[key])
+        if self.cache_dir is not None and os.path.exists(self._path(key)):
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+            self.disk_hits += 1
+            self._store(key, value)
+            return True, copy.deepcopy(value)
+        self.misses += 1
+        return False, None
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, key, value):
+        value = copy.deepcopy(value)
+        self._store(key, value)
+        if self.cache_dir is not None:
+            # Tulis ke file sementara lalu rename agar file cache tidak pernah setengah jadi
+            tmp = self._path(key) + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def invalidate(self, df=None):
+        """
+        Menghapus entry milik df (berdasarkan fingerprint), atau semua entry jika df None.
+        Entry di memori dan di disk sama-sama dihapus. Mengembalikan jumlah entry yang dihapus.
+        """
+        prefix = None if df is None else frame_fingerprint(df) + '-'
+        removed = 0
+        for key in list(self._entries):
+            if prefix is None or key.startswith(prefix):
+                del self._entries[key]
+                removed += 1
+        if self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl') and (prefix is None or name.startswith(prefix)):
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+        return removed
+
+    def stats(self):
+        """
+        Statistik hit/miss cache.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+def enable_cache(maxsize=32, cache_dir=None):
+    """
+    Mengaktifkan cache hasil analisis untuk seluruh modul dan mengembalikan AnalysisCache-nya.
+
+    Parameters:
+    maxsize: int, optional, default=32
+        Jumlah entry maksimum di memori.
+    cache_dir: str or None, optional, default=None
+        Folder untuk cache di disk (None hanya in-memory).
+    """
+    global _ANALYSIS_CACHE
+    _ANALYSIS_CACHE = AnalysisCache(maxsize=maxsize, cache_dir=cache_dir)
+    return _ANALYSIS_CACHE
+
+
+def disable_cache():
+    """
+    Menonaktifkan cache (entry di disk tidak dihapus).
+    """
+    global _ANALYSIS_CACHE
+    _ANALYSIS_CACHE = None
+
+
+def invalidate_cache(df=None):
+    """
+    Menghapus entry cache untuk df, atau seluruh cache jika df None.
+    """
+    if _ANALYSIS_CACHE is None:
+        return 0
+    return _ANALYSIS_CACHE.invalidate(df)
+
+
+def cache_stats():
+    """
+    Statistik hit/miss cache aktif (None jika cache tidak aktif).
+    """
+    return None if _ANALYSIS_CACHE is None else _ANALYSIS_CACHE.stats()
+
+
+def _cached_call(name, func, df, *args):
+    # Tanpa cache aktif, langsung hitung
+    if _ANALYSIS_CACHE is None:
+        with span('compute'):
+            return func(df, *args)
+    with span('cache_lookup'):
+        key = AnalysisCache.make_key(name, frame_fingerprint(df), args)
+        found, value = _ANALYSIS_CACHE.get(key)
+    if found:
+        return value
+    with span('compute'):
+        value = func(df, *args)
+    with span('cache_store'):
+        _ANALYSIS_CACHE.put(key, value)
+    return value
+
+
+# 18. Columnar storage for listing data and derived tables
+# CSV listing dikonversi sekali ke dataset Parquet (partisi fuelType/year, dtype LISTING_DTYPES);
+# load berikutnya memakai memory map dan hanya membaca kolom/partisi yang diminta.
+# Membutuhkan pyarrow (pip install pyarrow); Excel (openpyxl) hanya untuk jalur export lambat.
+LISTING_PARTITIONS = ['fuelType', 'year']
+
+EXPORT_FORMATS = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.csv': 'csv', '.xlsx': 'xlsx'}
+
+
+def _normalize_listing_chunk(chunk):
+    # Skema tetap per chunk (tanpa downcast per chunk) agar semua file di dataset konsisten
+    chunk = chunk.copy()
+    for col, dtype in LISTING_DTYPES.items():
+        if col not in chunk.columns:
+            continue
+        if dtype == 'category':
+            chunk[col] = _strip_categorical(chunk[col].astype('category'))
+        elif dtype.startswith('int'):
+            # Nullable Int ditulis sebagai int arrow yang sama, dengan atau tanpa missing value
+            chunk[col] = chunk[col].astype(dtype.capitalize())
+        else:
+            chunk[col] = chunk[col].astype(dtype)
+    return chunk
+
+
+def _restore_listing_dtypes(df):
+    # Kolom partisi dibaca kembali sebagai dictionary/category string; kembalikan ke LISTING_DTYPES
+    # dan ke urutan kolom LISTING_COLUMNS (kolom partisi ditaruh pyarrow di akhir)
+    order = [col for col in LISTING_COLUMNS if col in df.columns]
+    df = df[order + [col for col in df.columns if col not in order]]
+    for col in df.columns:
+        dtype = LISTING_DTYPES.get(col)
+        if dtype is None:
+            continue
+        if dtype == 'category':
+            # Kamus per file digabung pyarrow tanpa urutan; urutkan seperti hasil load_listing
+            series = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+            df[col] = series.cat.reorder_categories(sorted(series.cat.categories))
+        elif str(df[col].dtype) == dtype:
+            continue
+        elif isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Konversi hanya pada kategori (beberapa puluh nilai), lalu ambil lewat kode (-1 = missing)
+            categories = pd.to_numeric(df[col].cat.categories.astype(str)).to_numpy(dtype=np.float64)
+            codes = df[col].cat.codes.to_numpy()
+            df[col] = pd.Series(np.where(codes >= 0, categories[codes], np.nan), index=df.index)
+        elif dtype.startswith('int'):
+            # Nullable Int dari metadata pandas di file: missing value menjadi NaN lalu downcast di bawah
+            df[col] = pd.Series(df[col].to_numpy(dtype=np.float64, na_value=np.nan), index=df.index)
+        else:
+            df[col] = df[col].astype(dtype)
+    # Kolom integer dengan missing value tetap float64, seperti load_listing
+    return _downcast_listing_integers(df)
+
+
+def convert_listing(csv_path, dataset_path, chunksize=500_000, partition_cols=None):
+    """
+    Mengonversi CSV listing ke dataset Parquet terpartisi (sekali saja per file CSV).
+
+    CSV dibaca per chunk (read_listing_chunks) sehingga memori tidak bergantung ukuran file.
+
+    Parameters:
+    csv_path: str
+        Lokasi CSV listing (skema bmw.csv).
+    dataset_path: str
+        Folder tujuan dataset Parquet. Isi lama dengan nama file yang sama akan tertimpa.
+    chunksize: int, optional, default=500_000
+        Jumlah baris per chunk CSV.
+    partition_cols: list, optional, default=None
+        Kolom partisi folder. Default LISTING_PARTITIONS (fuelType, year).
+
+    Returns:
+    int: jumlah baris yang ditulis.
+    """
+    partition_cols = LISTING_PARTITIONS if partition_cols is None else list(partition_cols)
+    n_rows = 0
+    for i, chunk in enumerate(read_listing_chunks(csv_path, chunksize=chunksize)):
+        chunk = _normalize_listing_chunk(chunk)
+        chunk.to_parquet(dataset_path, engine='pyarrow', index=False, partition_cols=partition_cols,
+                         basename_template=f'part-{i:05d}-{{i}}.parquet')
+        n_rows += len(chunk)
+    return n_rows
+
+
+def load_listing_columnar(dataset_path, columns=None, filters=None):
+    """
+    Membaca dataset listing Parquet dengan memory map, column pruning, dan partition pruning.
+
+    Parameters:
+    dataset_path: str
+        Folder hasil convert_listing (atau satu file Parquet).
+    columns: list, optional, default=None
+        Kolom yang dibaca (default semua). Kolom lain tidak pernah dibaca dari disk.
+    filters: list, optional, default=None
+        Filter pyarrow, mis. [('fuelType', 'in', ['Hybrid', 'Electric']), ('year', '>=', 2017)].
+        Filter pada kolom partisi melewati folder yang tidak cocok.
+
+    Returns:
+    DataFrame dengan dtype LISTING_DTYPES (sama seperti load_listing). Tanpa partisi urutan baris
+    sama dengan CSV; dengan partisi baris dikelompokkan per folder partisi.
+    """
+    table = pq.read_table(dataset_path, columns=columns, filters=filters, memory_map=True)
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        # Partisi dengan nilai kosong memberi kamus ber-null yang belum bisa digabung pyarrow: decode dulu
+        if hasattr(field.type, 'value_type') and any(chunk.dictionary.null_count for chunk in column.chunks):
+            table = table.set_column(i, field.name, column.cast(field.type.value_type))
+    # Metadata pandas (Int16/Int32 nullable dari convert_listing) diabaikan; dtype akhir dari
+    # _restore_listing_dtypes
+    return _restore_listing_dtypes(table.to_pandas(ignore_metadata=True))
+
+
+def export_table(df, path, index=False):
+    """
+    Export tabel turunan (ringkasan, hasil CI, dsb.) untuk Tableau atau sesi berikutnya.
+
+    Format ditentukan dari ekstensi path: .parquet dan .feather/.arrow (kolumnar, cepat),
+    .csv, atau .xlsx (jalur lambat, membutuhkan openpyxl).
+
+    Parameters:
+    df: DataFrame
+        Tabel yang di-export.
+    path: str
+        Lokasi file tujuan.
+    index: bool, optional, default=False
+        Ikut menulis index (sama seperti argumen index pada df.to_excel).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Format '{ext}' tidak didukung. Pilih salah satu: {sorted(EXPORT_FORMATS)}")
+    fmt = EXPORT_FORMATS[ext]
+
+    if fmt == 'parquet':
+        df.to_parquet(path, engine='pyarrow', index=index)
+    elif fmt == 'feather':
+        # Feather tidak menyimpan index non-default
+        (df.reset_index() if index else df.reset_index(drop=True)).to_feather(path)
+    elif fmt == 'csv':
+        df.to_csv(path, index=index)
+    else:
+        df.to_excel(path, index=index)
+    return path
+
+
+# 19. Incremental statistics for append-only listing feeds
+# Listing baru masuk setiap hari; state di bawah ini di-update per batch dalam O(batch)
+# dan disimpan antar run, sehingga refresh tidak perlu menghitung ulang seluruh histori.
+def _group_moments(values, codes, n_groups):
+    # count, mean, M2..M4 (momen sentral berupa jumlah), min, max per grup untuk satu kolom
+    valid = ~np.isnan(values)
+    v, c = values[valid], codes[valid]
+    n = np.bincount(c, minlength=n_groups).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(n > 0, np.bincount(c, weights=v, minlength=n_groups) / n, 0.0)
+    dev = v - mean[c]
+    dev2 = dev * dev
+    vmin = np.full(n_groups, np.inf)
+    vmax = np.full(n_groups, -np.inf)
+    np.minimum.at(vmin, c, v)
+    np.maximum.at(vmax, c, v)
+    return (n, mean,
+            np.bincount(c, weights=dev2, minlength=n_groups),
+            np.bincount(c, weights=dev2 * dev, minlength=n_groups),
+            np.bincount(c, weights=dev2 * dev2, minlength=n_groups),
+            vmin, vmax)
+
+
+def _combine_moments(n, mean, m2, m3, m4, codes, n_out):
+    """
+    Menggabungkan momen beberapa baris state ke n_out grup (baris i masuk ke grup codes[i]).
+
+    Memakai pergeseran titik pusat: M2 = sum(M2_g + n_g d^2), M3 = sum(M3_g + 3 d M2_g + n_g d^3),
+    M4 = sum(M4_g + 4 d M3_g + 6 d^2 M2_g + n_g d^4) dengan d = mean_g - mean gabungan.
+    Semua array berbentuk (baris, kolom).
+    """
+    shape = (n_out,) + n.shape[1:]
+    total = np.zeros(shape)
+    np.add.at(total, codes, n)
+    weighted = np.zeros(shape)
+    np.add.at(weighted, codes, n * mean)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_mean = np.where(total > 0, weighted / total, 0.0)
+    d = np.where(n > 0, mean - new_mean[codes], 0.0)
+    out = [np.zeros(shape) for _ in range(3)]
+    np.add.at(out[0], codes, m2 + n * d ** 2)
+    np.add.at(out[1], codes, m3 + 3 * d * m2 + n * d ** 3)
+    np.add.at(out[2], codes, m4 + 4 * d * m3 + 6 * d ** 2 * m2 + n * d ** 4)
+    return total, new_mean, out[0], out[1], out[2]
+
+
+def _retract_moments(total, part):
+    """
+    Kebalikan merge momen: state total dikurangi bagian part (keduanya tuple (n, mean, M2, M3, M4)).
+    """
+    n, mean, m2, m3, m4 = total
+    nb, mb, m2b, m3b, m4b = part
+    na = n - nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ma = np.where(na > 0, (n * mean - nb * mb) / na, 0.0)
+        delta = mb - ma
+        nab = na * nb
+        m2a = m2 - m2b - np.where(n > 0, delta ** 2 * nab / n, 0.0)
+        m3a = (m3 - m3b - np.where(n > 0, delta ** 3 * nab * (na - nb) / n ** 2
+                                  + 3 * delta * (na * m2b - nb * m2a) / n, 0.0))
+        m4a = (m4 - m4b - np.where(n > 0, delta ** 4 * nab * (na ** 2 - nab + nb ** 2) / n ** 3
+                                  + 6 * delta ** 2 * (na ** 2 * m2b + nb ** 2 * m2a) / n ** 2
+                                  + 4 * delta * (na * m3b - nb * m3a) / n, 0.0))
+    empty = na <= 0
+    return (np.where(empty, 0.0, na), ma,
+            np.where(empty, 0.0, np.maximum(m2a, 0.0)),
+            np.where(empty, 0.0, m3a), np.where(empty, 0.0, np.maximum(m4a, 0.0)))
+
+
+def _group_comoments(x, y, codes, n_groups):
+    # n, mean_x, mean_y, Cxx, Cyy, Cxy per grup (hanya baris dengan x dan y valid)
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x, y, c = x[valid], y[valid], codes[valid]
+    n = np.bincount(c, minlength=n_groups).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mx = np.where(n > 0, np.bincount(c, weights=x, minlength=n_groups) / n, 0.0)
+        my = np.where(n > 0, np.bincount(c, weights=y, minlength=n_groups) / n, 0.0)
+    dx, dy = x - mx[c], y - my[c]
+    return (n, mx, my,
+            np.bincount(c, weights=dx * dx, minlength=n_groups),
+            np.bincount(c, weights=dy * dy, minlength=n_groups),
+            np.bincount(c, weights=dx * dy, minlength=n_groups))
+
+
+def _combine_comoments(n, mx, my, cxx, cyy, cxy, codes, n_out):
+    # Sama seperti _combine_moments: C = sum(C_g + n_g dx dy) terhadap mean gabungan
+    shape = (n_out,) + n.shape[1:]
+    total, sx, sy = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    np.add.at(total, codes, n)
+    np.add.at(sx, codes, n * mx)
+    np.add.at(sy, codes, n * my)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_mx = np.where(total > 0, sx / total, 0.0)
+        new_my = np.where(total > 0, sy / total, 0.0)
+    dx = np.where(n > 0, mx - new_mx[codes], 0.0)
+    dy = np.where(n > 0, my - new_my[codes], 0.0)
+    out = [np.zeros(shape) for _ in range(3)]
+    np.add.at(out[0], codes, cxx + n * dx * dx)
+    np.add.at(out[1], codes, cyy + n * dy * dy)
+    np.add.at(out[2], codes, cxy + n * dx * dy)
+    return total, new_mx, new_my, out[0], out[1], out[2]
+
+
+def _retract_comoments(total, part):
+    n, mx, my, cxx, cyy, cxy = total
+    nb, mxb, myb, cxxb, cyyb, cxyb = part
+    na = n - nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mxa = np.where(na > 0, (n * mx - nb * mxb) / na, 0.0)
+        mya = np.where(na > 0, (n * my - nb * myb) / na, 0.0)
+        shift = np.where(n > 0, na * nb / n, 0.0)
+    dx, dy = mxb - mxa, myb - mya
+    empty = na <= 0
+    return (np.where(empty, 0.0, na), mxa, mya,
+            np.where(empty, 0.0, np.maximum(cxx - cxxb - dx * dx * shift, 0.0)),
+            np.where(empty, 0.0, np.maximum(cyy - cyyb - dy * dy * shift, 0.0)),
+            np.where(empty, 0.0, cxy - cxyb - dx * dy * shift))
+
+
+def _rank_edges(values, bins):
+    # Batas bin rank sketch: titik tengah nilai unik jika sedikit (rank exact), selain itu kuantil
+    values = values[~np.isnan(values)]
+    distinct = np.unique(values)
+    if len(distinct) <= bins:
+        return (distinct[1:] + distinct[:-1]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+
+
+def _binned_spearman(counts):
+    """
+    Spearman rho dari tabel frekuensi bin (..., bx, by): setiap bin diberi midrank,
+    lalu korelasi Pearson berbobot frekuensi dari rank tersebut.
+    """
+    rx = counts.sum(axis=-1).astype(np.float64)
+    ry = counts.sum(axis=-2).astype(np.float64)
+    n = rx.sum(axis=-1)
+    center = ((n + 1) / 2)[..., None]
+    dx = np.cumsum(rx, axis=-1) - rx + (rx + 1) / 2 - center
+    dy = np.cumsum(ry, axis=-1) - ry + (ry + 1) / 2 - center
+    cov = np.einsum('...ij,...i,...j->...', counts.astype(np.float64), dx, dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cov / np.sqrt((rx * dx * dx).sum(axis=-1) * (ry * dy * dy).sum(axis=-1)), n
+
+
+class IncrementalStats:
+    """
+    State statistik per grup yang di-update per batch listing dan disimpan antar run.
+
+    Per grup (mis. fuelType x model x year) menyimpan:
+    - momen berjalan (count, mean, M2..M4, min, max) untuk setiap kolom numerik
+    - QuantileSketch per kolom untuk median dan kuartil
+    - co-moment per pasangan kolom untuk Pearson
+    - tabel frekuensi bin (rank sketch) per pasangan kolom untuk Spearman approximate
+
+    update() dan retract() bekerja dalam O(batch). Momen, co-moment dan rank sketch di-retract
+    secara exact; QuantileSketch exact selama belum terkompresi; min/max tidak bisa di-retract
+    (menjadi batas luar, lihat minmax_exact). rollup() menggabungkan grup ke level yang lebih kasar,
+    mis. dari (fuelType, model, year) ke fuelType, tanpa membaca ulang data.
+
+    Parameters:
+    by: str or list, optional, default=None
+        Kolom grup. None untuk satu grup global.
+    columns: list, optional, default=None
+        Kolom numerik yang dilacak. Default semua kolom numerik batch pertama selain kolom `by`.
+    pairs: list, optional, default=None
+        Pasangan kolom (x, y) untuk Pearson/Spearman, mis. [('price', 'mileage')].
+    compression: int, optional, default=1000
+        Jumlah centroid maksimum QuantileSketch per grup per kolom.
+    rank_bins: int, optional, default=64
+        Jumlah bin per sumbu rank sketch. Kolom dengan nilai unik <= rank_bins memberi rank exact.
+    """
+
+    def __init__(self, by=None, columns=None, pairs=None, compression=1000, rank_bins=64):
+        self.by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        self.columns = None if columns is None else list(columns)
+        self.pairs = [] if pairs is None else [tuple(pair) for pair in pairs]
+        self.compression = compression
+        self.rank_bins = rank_bins
+        self.keys = []
+        self._rows = {}
+        self.moments = None
+        self.vmin = self.vmax = None
+        self.comoments = None
+        self.rank_edges = None
+        self.rank_counts = None
+        self.sketches = []
+        self.minmax_exact = True
+        self.n_batches = 0
+
+    # -- state layout -------------------------------------------------------------------------
+    def _init_state(self, batch):
+        if self.columns is None:
+            self.columns = [col for col in batch.select_dtypes(include='number').columns if col not in self.by]
+        k, p = len(self.columns), len(self.pairs)
+        self.moments = tuple(np.zeros((0, k)) for _ in range(5))
+        self.vmin, self.vmax = np.zeros((0, k)), np.zeros((0, k))
+        self.comoments = tuple(np.zeros((0, p)) for _ in range(6))
+        self.rank_edges = [(_rank_edges(batch[x].to_numpy(dtype=np.float64, na_value=np.nan), self.rank_bins),
+                            _rank_edges(batch[y].to_numpy(dtype=np.float64, na_value=np.nan), self.rank_bins))
+                           for x, y in self.pairs]
+        self.rank_counts = [np.zeros((0, len(ex) + 1, len(ey) + 1), dtype=np.int64) for ex, ey in self.rank_edges]
+
+    def _grow(self, n_groups):
+        extra = n_groups - len(self.sketches)
+        if extra <= 0:
+            return
+        pad = lambda arr, fill=0.0: np.concatenate((arr, np.full((extra,) + arr.shape[1:], fill, dtype=arr.dtype)))
+        self.moments = tuple(pad(arr) for arr in self.moments)
+        self.vmin, self.vmax = pad(self.vmin, np.inf), pad(self.vmax, -np.inf)
+        self.comoments = tuple(pad(arr) for arr in self.comoments)
+        self.rank_counts = [pad(arr, 0) for arr in self.rank_counts]
+        self.sketches += [[QuantileSketch(self.compression) for _ in self.columns] for _ in range(extra)]
+
+    def _batch_codes(self, batch, create):
+        # Nomor grup state untuk setiap baris batch (-1 untuk baris dengan kunci NaN)
+        if not self.by:
+            local, keys = np.zeros(len(batch), dtype=np.int64), [()]
+        else:
+            grouped = batch.groupby(self.by, sort=False, observed=True)
+            local = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+            keys = [key if isinstance(key, tuple) else (key,) for key in grouped.size().index]
+        rows = []
+        for key in keys:
+            if key not in self._rows:
+                if not create:
+                    raise ValueError(f"Grup {key} tidak ada di state, tidak bisa di-retract.")
+                self._rows[key] = len(self.keys)
+                self.keys.append(key)
+            rows.append(self._rows[key])
+        rows = np.asarray(rows, dtype=np.int64)
+        return np.where(local >= 0, rows[np.maximum(local, 0)] if len(rows) else -1, -1)
+
+    def _batch_state(self, batch, codes):
+        # Semua ringkasan satu batch, sejajar dengan baris state
+        keep = codes >= 0
+        codes = codes[keep]
+        n_groups = len(self.keys)
+        arrays = {col: batch[col].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+                  for col in set(self.columns) | {col for pair in self.pairs for col in pair}}
+
+        per_col = [_group_moments(arrays[col], codes, n_groups) for col in self.columns]
+        moments = tuple(np.column_stack([res[i] for res in per_col]) if per_col else np.zeros((n_groups, 0))
+                        for i in range(7))
+        per_pair = [_group_comoments(arrays[x], arrays[y], codes, n_groups) for x, y in self.pairs]
+        comoments = tuple(np.column_stack([res[i] for res in per_pair]) if per_pair else np.zeros((n_groups, 0))
+                          for i in range(6))
+
+        rank_counts = []
+        for (x, y), (ex, ey) in zip(self.pairs, self.rank_edges):
+            xv, yv = arrays[x], arrays[y]
+            valid = ~np.isnan(xv) & ~np.isnan(yv)
+            bx, by_ = len(ex) + 1, len(ey) + 1
+            flat = (codes[valid] * bx + np.searchsorted(ex, xv[valid], side='right')) * by_ \
+                + np.searchsorted(ey, yv[valid], side='right')
+            rank_counts.append(np.bincount(flat, minlength=n_groups * bx * by_).reshape(n_groups, bx, by_))
+
+        # Nilai per grup untuk QuantileSketch: satu sort berdasarkan grup lalu slice
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes, minlength=n_groups)
+        stops = np.cumsum(counts)
+        slices = {g: order[stops[g] - counts[g]:stops[g]] for g in np.flatnonzero(counts)}
+        return moments, comoments, rank_counts, arrays, slices
+
+    # -- update / retract / merge -------------------------------------------------------------
+    def update(self, batch):
+        """
+        Menambahkan satu batch listing baru ke state (O(batch)).
+        """
+        if self.moments is None:
+            self._init_state(batch)
+        codes = self._batch_codes(batch, create=True)
+        self._grow(len(self.keys))
+        moments, comoments, rank_counts, arrays, slices = self._batch_state(batch, codes)
+
+        rows = np.arange(len(self.keys))
+        stacked_codes = np.concatenate((rows, rows))
+        self.moments = _combine_moments(*(np.concatenate((a, b)) for a, b in zip(self.moments, moments[:5])),
+                                        stacked_codes, len(rows))
+        self.vmin = np.minimum(self.vmin, moments[5])
+        self.vmax = np.maximum(self.vmax, moments[6])
+        self.comoments = _combine_comoments(*(np.concatenate((a, b)) for a, b in zip(self.comoments, comoments)),
+                                            stacked_codes, len(rows))
+        self.rank_counts = [a + b for a, b in zip(self.rank_counts, rank_counts)]
+        for g, idx in slices.items():
+            for j, col in enumerate(self.columns):
+                self.sketches[g][j].update(arrays[col][idx])
+        self.n_batches += 1
+        return self
+
+    def retract(self, batch):
+        """
+        Mengurangi listing yang dihapus (baris yang sebelumnya sudah di-update) dari state.
+
+        Momen, co-moment dan rank sketch exact; min/max setelah retract adalah batas luar.
+        """
+        if self.moments is None:
+            raise ValueError("State masih kosong, tidak ada yang bisa di-retract.")
+        codes = self._batch_codes(batch, create=False)
+        moments, comoments, rank_counts, arrays, slices = self._batch_state(batch, codes)
+        if (moments[0] > self.moments[0]).any():
+            raise ValueError("Batch retract berisi lebih banyak baris daripada state grupnya.")
+
+        self.moments = _retract_moments(self.moments, moments[:5])
+        self.comoments = _retract_comoments(self.comoments, comoments)
+        self.rank_counts = [a - b for a, b in zip(self.rank_counts, rank_counts)]
+        for g, idx in slices.items():
+            for j, col in enumerate(self.columns):
+                self.sketches[g][j].retract(arrays[col][idx])
+        self.minmax_exact = False
+        return self
+
+    def merge(self, other):
+        """
+        Menggabungkan state lain (mis. dari worker atau partisi lain) dengan konfigurasi yang sama.
+        Rank sketch hanya bisa digabung jika batas bin-nya sama.
+        """
+        if other.moments is None:
+            return self
+        if self.moments is None:
+            self.columns = list(other.columns)
+            self.rank_edges = [(ex.copy(), ey.copy()) for ex, ey in other.rank_edges]
+            k, p = len(self.columns), len(self.pairs)
+            self.moments = tuple(np.zeros((0, k)) for _ in range(5))
+            self.vmin, self.vmax = np.zeros((0, k)), np.zeros((0, k))
+            self.comoments = tuple(np.zeros((0, p)) for _ in range(6))
+            self.rank_counts = [np.zeros((0, len(ex) + 1, len(ey) + 1), dtype=np.int64) for ex, ey in self.rank_edges]
+        if other.columns != self.columns or other.pairs != self.pairs or other.by != self.by:
+            raise ValueError("by, columns dan pairs kedua state harus sama.")
+        for (ex, ey), (ox, oy) in zip(self.rank_edges, other.rank_edges):
+            if not (np.array_equal(ex, ox) and np.array_equal(ey, oy)):
+                raise ValueError("Batas bin rank sketch berbeda; buat state lain dengan rank_edges yang sama.")
+
+        for key in other.keys:
+            if key not in self._rows:
+                self._rows[key] = len(self.keys)
+                self.keys.append(key)
+        self._grow(len(self.keys))
+        target = np.array([self._rows[key] for key in other.keys], dtype=np.int64)
+        stacked_codes = np.concatenate((np.arange(len(self.keys)), target))
+        self.moments = _combine_moments(*(np.concatenate((a, b)) for a, b in zip(self.moments, other.moments)),
+                                        stacked_codes, len(self.keys))
+        self.comoments = _combine_comoments(*(np.concatenate((a, b)) for a, b in zip(self.comoments, other.comoments)),
+                                            stacked_codes, len(self.keys))
+        np.minimum.at(self.vmin, target, other.vmin)
+        np.maximum.at(self.vmax, target, other.vmax)
+        for mine, theirs in zip(self.rank_counts, other.rank_counts):
+            np.add.at(mine, target, theirs)
+        for g, sketches in zip(target, other.sketches):
+            for mine, theirs in zip(self.sketches[g], sketches):
+                mine.merge(copy.deepcopy(theirs))
+        self.minmax_exact = self.minmax_exact and other.minmax_exact
+        self.n_batches += other.n_batches
+        return self
+
+    def rollup(self, by=None):
+        """
+        State baru pada level grup yang lebih kasar (subset kolom `by`), mis. rollup('fuelType').
+        """
+        by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        missing = [col for col in by if col not in self.by]
+        if missing:
+            raise ValueError(f"Kolom {missing} tidak ada di by={self.by}.")
+        positions = [self.by.index(col) for col in by]
+        out = IncrementalStats(by=by, columns=self.columns, pairs=self.pairs,
+                               compression=self.compression, rank_bins=self.rank_bins)
+        if self.moments is None:
+            return out
+        out.rank_edges = self.rank_edges
+        # Grup kasar diisi dengan state kosong lalu di-merge dengan state asli yang kuncinya diproyeksikan
+        projected = copy.copy(self)
+        projected.by = by
+        projected.keys = [tuple(key[i] for i in positions) for key in self.keys]
+        projected._rows = None
+        out.moments = tuple(np.zeros((0,) + arr.shape[1:]) for arr in self.moments)
+        out.vmin, out.vmax = np.zeros((0, len(self.columns))), np.zeros((0, len(self.columns)))
+        out.comoments = tuple(np.zeros((0,) + arr.shape[1:]) for arr in self.comoments)
+        out.rank_counts = [np.zeros((0,) + arr.shape[1:], dtype=np.int64) for arr in self.rank_counts]
+        return out.merge(projected)
+
+    # -- hasil -------------------------------------------------------------------------------
+    def _index(self):
+        if not self.by:
+            return None
+        return pd.MultiIndex.from_tuples(self.keys, names=self.by)
+
+    def describe(self):
+        """
+        Tabel statistik deskriptif per grup (format sama dengan descriptive_table(df, by=...)).
+        Median dan kuartil dari QuantileSketch; mode NaN setelah sketch terkompresi.
+        """
+        n, mean, m2, m3, m4 = self.moments
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(m2 / (n - 1))
+            skew = (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+            kurt = (n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                    - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+        skew = np.where(m2 == 0, 0.0, skew)
+        kurt = np.where(m2 == 0, 0.0, kurt)
+        skew = np.where(n < 3, np.nan, skew)
+        kurt = np.where(n < 4, np.nan, kurt)
+        empty = n == 0
+        quartiles = np.array([[sketch.quantile([0.25, 0.5, 0.75]) if sketch.count else [np.nan] * 3
+                               for sketch in row] for row in self.sketches]).reshape(len(self.keys), len(self.columns), 3)
+        mode = np.array([[sketch.mode() for sketch in row] for row in self.sketches]).reshape(n.shape)
+        vmin = np.where(empty, np.nan, self.vmin)
+        vmax = np.where(empty, np.nan, self.vmax)
+
+        table = {
+            'count': n.astype(np.int64),
+            'mean': np.where(empty, np.nan, mean),
+            'median': quartiles[..., 1],
+            'mode': mode,
+            'std': std,
+            'range': vmax - vmin,
+            'skew': skew,
+            'kurtosis': kurt,
+            'min': vmin,
+            'q1': quartiles[..., 0],
+            'q2': quartiles[..., 1],
+            'q3': quartiles[..., 2],
+            'max': vmax,
+        }
+        if not self.by:
+            return pd.DataFrame({stat: values[0] for stat, values in table.items()}, index=self.columns)
+        frame = pd.DataFrame({stat: values.ravel() for stat, values in table.items()})
+        keys = self._index().to_frame(index=False).loc[np.repeat(np.arange(len(self.keys)), len(self.columns))]
+        keys['column'] = np.tile(self.columns, len(self.keys))
+        frame.index = pd.MultiIndex.from_frame(keys.reset_index(drop=True))
+        return frame[frame['count'] > 0].sort_index(level=list(range(len(self.by))), sort_remaining=False)
+
+    def means(self):
+        """
+        Mean per grup (baris) untuk setiap kolom (kolom), mis. rata-rata price/mileage/mpg per fuelType.
+        """
+        n, mean = self.moments[0], self.moments[1]
+        frame = pd.DataFrame(np.where(n > 0, mean, np.nan), columns=self.columns, index=self._index())
+        return frame.sort_index() if self.by else frame
+
+    def correlations(self, method='spearman'):
+        """
+        Korelasi per grup untuk setiap pasangan di `pairs`.
+
+        method='pearson' exact dari co-moment; method='spearman' approximate dari rank sketch
+        (exact jika kedua kolom memiliki nilai unik <= rank_bins). p-value memakai distribusi t.
+
+        Returns:
+        DataFrame: kolom grup, x, y, n, r, p_value.
+        """
+        if method == 'pearson':
+            n, _, _, cxx, cyy, cxy = self.comoments
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r = cxy / np.sqrt(cxx * cyy)
+        elif method == 'spearman':
+            results = [_binned_spearman(counts) for counts in self.rank_counts]
+            r = np.column_stack([res[0] for res in results]) if results else np.zeros((len(self.keys), 0))
+            n = np.column_stack([res[1] for res in results]) if results else np.zeros((len(self.keys), 0))
+        else:
+            raise ValueError("method harus 'pearson' atau 'spearman'")
+
+        rows = []
+        for g, key in enumerate(self.keys):
+            for j, (x, y) in enumerate(self.pairs):
+                if n[g, j] > 0:
+                    rows.append(dict(zip(self.by, key), x=x, y=y, n=int(n[g, j]), r=r[g, j]))
+        result = pd.DataFrame(rows, columns=self.by + ['x', 'y', 'n', 'r'])
+        result['p_value'] = correlation_pvalues(result['r'].to_numpy(dtype=np.float64),
+                                                result['n'].to_numpy(dtype=np.float64))
+        return result.sort_values(self.by + ['x', 'y']).reset_index(drop=True) if self.by else result
+
+    def confidence_intervals(self, column='price', confidence=0.95, min_count=1):
+        """
+        CI berbasis distribusi t untuk mean `column` per grup (seperti t_lower/t_upper pada
+        segment_confidence_intervals). Bootstrap tidak tersedia secara incremental.
+        """
+        j = self.columns.index(column)
+        n, mean, m2 = self.moments[0][:, j], self.moments[1][:, j], self.moments[2][:, j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(m2 / (n - 1))
+            half = stats.t.ppf(0.5 + confidence / 2, n - 1) * std / np.sqrt(n)
+        result = pd.DataFrame({'count': n.astype(np.int64), 'mean': mean, 'std': std,
+                               't_lower': mean - half, 't_upper': mean + half}, index=self._index())
+        result = result[result['count'] >= max(min_count, 1)]
+        return (result.sort_index().reset_index() if self.by else result.reset_index(drop=True))
+
+    # -- persistensi --------------------------------------------------------------------------
+    def save(self, path):
+        """
+        Menyimpan state ke file pickle (ditulis ke file sementara lalu di-rename).
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Membaca state yang disimpan dengan save().
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, cls):
+            raise ValueError(f"File '{path}' tidak berisi {cls.__name__}.")
+        return state
+
+
+# 20. Sampling-based approximate mode
+# Pada frame multi-juta baris, correlation_analysis / plot_distributions / plot_relationship bisa
+# dijalankan pada sampel bertingkat (stratified) per fuelType/model. Setiap korelasi dan mean yang
+# dilaporkan disertai ukuran sampel dan batas kepercayaan.
+APPROX_STRATA = ['fuelType', 'model']
+
+
+@dataclass
+class StratifiedSample:
+    data: pd.DataFrame
+    strata: list
+    weights: np.ndarray
+    population: pd.Series
+    sampled: pd.Series
+    n_rows: int
+    confidence: float
+
+    @property
+    def sample_size(self):
+        return len(self.data)
+
+    def describe(self):
+        # Label singkat untuk judul plot dan output teks
+        if self.sample_size >= self.n_rows:
+            return f"all {self.n_rows:,} rows"
+        strata = ', '.join(self.strata) if self.strata else 'none'
+        return f"stratified sample n={self.sample_size:,} of {self.n_rows:,} rows (strata: {strata})"
+
+
+def correlation_sample_size(margin=0.01, confidence=0.95):
+    """
+    Ukuran sampel agar CI korelasi (Fisher z, kasus terburuk r = 0) punya setengah lebar <= margin.
+    """
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    return int(np.ceil((z / margin) ** 2)) + 3
+
+
+def stratified_sample(df, sample_size=None, strata=None, margin=0.01, confidence=0.95,
+                      min_per_stratum=30, seed=42):
+    """
+    Sampel bertingkat tanpa pengembalian, alokasi proporsional dengan minimum per strata.
+
+    Strata kecil (mis. Electric, Hybrid) diambil minimal min_per_stratum baris (atau seluruhnya
+    jika lebih sedikit), sehingga mean per segmen tetap punya batas kepercayaan. Baris dengan kunci
+    strata kosong (NaN) membentuk strata sendiri, sehingga population tetap berjumlah len(df).
+
+    Parameters:
+    df: DataFrame
+        Data lengkap.
+    sample_size: int, optional, default=None
+        Target jumlah baris sampel. Default correlation_sample_size(margin, confidence).
+    strata: list, optional, default=None
+        Kolom strata. Default APPROX_STRATA (fuelType, model) yang ada di df.
+    margin: float, optional, default=0.01
+        Setengah lebar CI korelasi yang diinginkan (dipakai jika sample_size None).
+    confidence: float, optional, default=0.95
+        Tingkat kepercayaan untuk batas error.
+    min_per_stratum: int, optional, default=30
+        Jumlah minimal baris per strata.
+    seed: int, optional, default=42
+        Seed generator acak.
+
+    Returns:
+    StratifiedSample dengan data (urutan baris asli), bobot N_h / n_h per baris, serta ukuran
+    populasi dan sampel per strata.
+    """
+    strata = [col for col in (APPROX_STRATA if strata is None else strata) if col in df.columns]
+    if sample_size is None:
+        sample_size = correlation_sample_size(margin, confidence)
+    n_rows = len(df)
+
+    if strata:
+        grouped = df.groupby(strata, sort=True, observed=True, dropna=False)
+        codes = grouped.ngroup().to_numpy(dtype=np.int64)
+        population = grouped.size()
+    else:
+        codes = np.zeros(n_rows, dtype=np.int64)
+        population = pd.Series([n_rows], name='size')
+    pop = population.to_numpy()
+
+    if sample_size >= n_rows:
+        alloc = pop.copy()
+    else:
+        alloc = np.minimum(pop, np.maximum(np.round(sample_size * pop / n_rows).astype(np.int64),
+                                           min(min_per_stratum, sample_size)))
+
+    # Pilih n_h baris acak per strata: urutkan (strata, kunci acak), ambil n_h pertama tiap strata
+    rng = np.random.default_rng(seed)
+    valid = codes >= 0
+    rows = np.flatnonzero(valid)
+    order = rows[np.lexsort((rng.random(len(rows)), codes[valid]))]
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.cumsum(np.bincount(sorted_codes, minlength=len(pop)))[:-1]))
+    rank = np.arange(len(order)) - starts[sorted_codes]
+    chosen = np.sort(order[rank < alloc[sorted_codes]])
+
+    weights = (pop / np.maximum(alloc, 1))[codes[chosen]]
+    return StratifiedSample(
+        data=df.iloc[chosen],
+        strata=strata,
+        weights=weights,
+        population=population.rename('population'),
+        sampled=pd.Series(alloc, index=population.index, name='sampled'),
+        n_rows=n_rows,
+        confidence=confidence,
+    )
+
+
+def _resolve_sample(df, approx, min_per_stratum=30):
+    # approx: True (ukuran default), int (ukuran sampel), atau StratifiedSample yang sudah dibuat
+    if isinstance(approx, StratifiedSample):
+        return approx
+    return stratified_sample(df, sample_size=None if approx is True else int(approx),
+                             min_per_stratum=min_per_stratum)
+
+
+def correlation_bounds(corr_matrix, n, method='pearson', confidence=0.95):
+    """
+    Batas bawah dan atas CI korelasi lewat transformasi Fisher z.
+
+    Varians z: 1/(n-3) untuk Pearson, (1 + r^2/2)/(n-3) untuk Spearman (Bonett & Wright 2000),
+    0.437/(n-4) untuk Kendall (Fieller, Hartley & Pearson 1957). Koefisien +-1 punya batas dirinya sendiri.
+
+    Returns:
+    (lower, upper) DataFrame dengan index dan kolom yang sama dengan corr_matrix.
+    """
+    r = corr_matrix.to_numpy(dtype=np.float64)
+    n = np.broadcast_to(np.asarray(n, dtype=np.float64), r.shape)
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    offset = 4 if method == 'kendall' else 3
+    factor = {'pearson': 1.0, 'spearman': 1 + r ** 2 / 2, 'kendall': 0.437}[method]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se = np.sqrt(factor / (n - offset))
+        # arctanh(+-1) = +-inf, tanh(+-inf) = +-1: koefisien sempurna tetap di batasnya
+        lower, upper = np.tanh(np.arctanh(r) - z * se), np.tanh(np.arctanh(r) + z * se)
+    lower = np.where(n > offset, lower, np.nan)
+    upper = np.where(n > offset, upper, np.nan)
+    frame = lambda values: pd.DataFrame(values, index=corr_matrix.index, columns=corr_matrix.columns)
+    return frame(lower), frame(upper)
+
+
+def sample_means(sample, columns=None, by=None):
+    """
+    Estimasi mean bertingkat per grup dengan standard error dan CI dari StratifiedSample.
+
+    mean_g = sum(N_h * mean_h) / N_g dan var = sum((N_h / N_g)^2 * (1 - n_h / N_h) * s_h^2 / n_h)
+    atas strata h di dalam grup g. `by` harus subset dari kolom strata (None untuk seluruh data).
+    Strata dengan kunci NaN ikut dihitung dan muncul sebagai grup NaN tersendiri.
+
+    Returns:
+    DataFrame: kolom by, column, mean, std_error, lower, upper, n_sample, n_population.
+    """
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    missing = [col for col in by if col not in sample.strata]
+    if missing:
+        raise ValueError(f"Kolom {missing} bukan kolom strata {sample.strata}.")
+    data = sample.data
+    if columns is None:
+        columns = [col for col in data.select_dtypes(include='number').columns if col not in sample.strata]
+    z = stats.norm.ppf(0.5 + sample.confidence / 2)
+
+    keys = sample.population.index.to_frame(index=False) if sample.strata else pd.DataFrame(index=[0])
+    group_cols = by if by else None
+    frames = []
+    for col in columns:
+        per_stratum = (data.groupby(sample.strata, sort=True, observed=True, dropna=False)[col]
+                       .agg(['mean', 'var', 'count'])
+                       if sample.strata else data[col].agg(['mean', 'var', 'count']).to_frame().T)
+        per_stratum = per_stratum.reindex(sample.population.index) if sample.strata else per_stratum
+        stratum = keys.copy()
+        N = sample.population.to_numpy(dtype=np.float64)
+        n = per_stratum['count'].to_numpy(dtype=np.float64)
+        fpc = np.where(N > 0, 1 - n / N, 0.0)
+        # Strata yang diambil seluruhnya tidak menyumbang varians (fpc = 0), walau hanya satu baris
+        var = np.where(fpc > 0, per_stratum['var'].to_numpy(dtype=np.float64), 0.0)
+        stratum['N'] = N
+        stratum['n'] = n
+        stratum['wsum'] = N * per_stratum['mean'].to_numpy(dtype=np.float64)
+        stratum['wvar'] = N ** 2 * fpc * var / np.maximum(n, 1)
+        agg = stratum.groupby(group_cols, sort=True, observed=True, dropna=False)[['N', 'n', 'wsum', 'wvar']].sum() \
+            if group_cols else stratum[['N', 'n', 'wsum', 'wvar']].sum().to_frame().T
+        mean = agg['wsum'] / agg['N']
+        se = np.sqrt(agg['wvar']) / agg['N']
+        frames.append(pd.DataFrame({
+            'column': col, 'mean': mean, 'std_error': se,
+            'lower': mean - z * se, 'upper': mean + z * se,
+            'n_sample': agg['n'].astype(np.int64), 'n_population': agg['N'].astype(np.int64),
+        }))
+    result = pd.concat(frames)
+    return result.reset_index() if group_cols else result.reset_index(drop=True)
+
+
+# 21. Pre-aggregated rendering
+# plot_relationship / plot_distributions memfilter seluruh data per nilai target lalu menyerahkan baris
+# mentah ke seaborn (yang mem-bootstrap CI atas setiap baris). Jalur ini menghitung count, histogram,
+# mean per x dan CI sekali lewat groupby / np.histogram, lalu menggambar dari agregat kecil tersebut.
+# Agregat bisa di-pickle, sehingga banyak figure bisa dirender ke file secara paralel.
+AGGREGATE_ROWS = 200_000  # aggregate=None: jalur pre-aggregated dipakai mulai jumlah baris ini
+
+RELATIONSHIP_KINDS = ('line', 'scatter', 'bar', 'hist', 'box', 'violin', 'kde', 'count')
+LEGEND_MAX_ENTRIES = 30  # target numerik bisa punya ribuan nilai unik; legend dilewati di atas batas ini
+
+
+@dataclass
+class PlotAggregate:
+    kind: str
+    table: pd.DataFrame
+    n_rows: int
+    title: str
+    xlabel: str = ''
+    ylabel: str = ''
+    # Warna per grup, {nilai_target: warna}; None memakai palet Set1 sesuai urutan kemunculan
+    colors: dict = None
+    legend: bool = True
+    # Kurva (x, y) tambahan di atas histogram, mis. KDE yang diskalakan ke count
+    curve: tuple = None
+
+
+def _use_aggregate(aggregate, n_rows):
+    # aggregate: True / False, atau None untuk otomatis berdasarkan AGGREGATE_ROWS
+    return n_rows >= AGGREGATE_ROWS if aggregate is None else bool(aggregate)
+
+
+def _binned_density(values, weights=None, gridsize=512, cut=3):
+    """
+    KDE gaussian terbinning: histogram halus dikonvolusi dengan kernel gaussian (bandwidth Scott).
+
+    Returns:
+    (grid, density) atau None jika data kurang dari 2 nilai berbeda.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    values = values[finite]
+    weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=np.float64)[finite]
+    total = weights.sum()
+    if len(values) < 2 or total <= 0:
+        return None
+    mean = np.average(values, weights=weights)
+    std = np.sqrt(np.average((values - mean) ** 2, weights=weights))
+    if std == 0:
+        return None
+    n_eff = total ** 2 / np.sum(weights ** 2)
+    bw = std * n_eff ** -0.2
+    lo, hi = values.min() - cut * bw, values.max() + cut * bw
+    counts, edges = np.histogram(values, bins=gridsize, range=(lo, hi), weights=weights)
+    dx = edges[1] - edges[0]
+    half = min(int(np.ceil(4 * bw / dx)), gridsize - 1)
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    density = np.convolve(counts, kernel / kernel.sum(), mode='same') / (total * dx)
+    return (edges[:-1] + edges[1:]) / 2, density
+
+
+def _box_table(values, levels):
+    # Statistik boxplot per level (kuartil, whisker 1.5 IQR, flier unik) dari satu groupby
+    frame = pd.DataFrame({'level': levels, 'y': values}).dropna()
+    grouped = frame.groupby('level', sort=True, observed=True)['y']
+    table = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    table.columns = ['q1', 'med', 'q3']
+    iqr = table['q3'] - table['q1']
+    low, high = table['q1'] - 1.5 * iqr, table['q3'] + 1.5 * iqr
+    level_low = frame['level'].map(low).to_numpy(dtype=np.float64)
+    level_high = frame['level'].map(high).to_numpy(dtype=np.float64)
+    y = frame['y'].to_numpy(dtype=np.float64)
+    inside = (y >= level_low) & (y <= level_high)
+    table['whislo'] = frame['y'][inside].groupby(frame['level'][inside], observed=True).min()
+    table['whishi'] = frame['y'][inside].groupby(frame['level'][inside], observed=True).max()
+    outside = frame[~inside].drop_duplicates()
+    fliers = {level: np.sort(part['y'].to_numpy()) for level, part in outside.groupby('level', observed=True)}
+    table['fliers'] = [fliers.get(level, np.empty(0)) for level in table.index]
+    table['count'] = grouped.size()
+    return table.rename_axis('level').reset_index()
+
+
+def _density_table(values, groups, weights=None):
+    # Kurva KDE terbinning per grup: kolom group, x, density
+    frame = pd.DataFrame({'group': groups, 'y': values})
+    if weights is not None:
+        frame['w'] = weights
+    parts = []
+    for group, part in frame.groupby('group', sort=False, observed=True):
+        curve = _binned_density(part['y'], None if weights is None else part['w'])
+        if curve is not None:
+            parts.append(pd.DataFrame({'group': group, 'x': curve[0], 'density': curve[1]}))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['group', 'x', 'density'])
+
+
+def _histogram_table(values, groups, bins='auto', weights=None):
+    # Histogram per grup (bin masing-masing, seperti histplot per subset): kolom group, left, right, count
+    frame = pd.DataFrame({'group': groups, 'y': values})
+    if weights is not None:
+        frame['w'] = weights
+    frame = frame[np.isfinite(frame['y'].to_numpy(dtype=np.float64))]
+    parts = []
+    for group, part in frame.groupby('group', sort=False, observed=True):
+        y = part['y'].to_numpy(dtype=np.float64)
+        edges = np.histogram_bin_edges(y, bins=bins)
+        counts, edges = np.histogram(y, bins=edges, weights=None if weights is None else part['w'].to_numpy())
+        parts.append(pd.DataFrame({'group': group, 'left': edges[:-1], 'right': edges[1:], 'count': counts}))
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['group', 'left', 'right', 'count'])
+
+
+def relationship_aggregates(dataset, x_col, target_cols, kind='line', confidence=0.95, custom_colors=None):
+    """
+    Agregat kecil untuk plot_relationship, satu PlotAggregate per kolom target.
+
+    - line / bar: mean, CI (t, normal approx) dan count per (nilai target, x)
+    - scatter: titik (x, y) unik per nilai target beserta count
+    - hist / kde: histogram atau KDE terbinning per nilai target
+    - box / violin: kuartil, whisker, flier unik, atau KDE terbinning per level x
+    - count: frekuensi tiap nilai target
+
+    Returns:
+    list of PlotAggregate.
+    """
+    if kind not in RELATIONSHIP_KINDS:
+        raise ValueError("Jenis plot tidak dikenali. Gunakan 'line', 'scatter', 'bar', 'hist', 'box', 'violin', atau 'kde'.")
+    n_rows = len(dataset)
+    z_level = 0.5 + confidence / 2
+    aggregates = []
+    for target_col in target_cols:
+        y = dataset[target_col]
+        if kind in ('line', 'bar'):
+            frame = pd.DataFrame({'group': y, 'x': dataset[x_col], 'y': y})
+            table = frame.groupby(['group', 'x'], sort=False, observed=True)['y'].agg(['mean', 'std', 'count'])
+            table = table.reset_index()
+            half = (stats.t.ppf(z_level, np.maximum(table['count'] - 1, 1))
+                    * table['std'].fillna(0) / np.sqrt(table['count']))
+            table['lower'], table['upper'] = table['mean'] - half, table['mean'] + half
+            table = table.sort_values('x', kind='stable', ignore_index=True)
+        elif kind == 'scatter':
+            frame = pd.DataFrame({'group': y, 'x': dataset[x_col], 'y': y})
+            table = frame.groupby(['group', 'x', 'y'], sort=False, observed=True).size().reset_index(name='count')
+        elif kind == 'hist':
+            table = _histogram_table(y, y)
+        elif kind == 'kde':
+            table = _density_table(y, y)
+        elif kind == 'box':
+            table = _box_table(y, dataset[x_col] if x_col else 0)
+        elif kind == 'violin':
+            levels = dataset[x_col] if x_col else pd.Series(0, index=dataset.index)
+            table = _density_table(y, levels)
+            quartiles = _box_table(y, levels).set_index('level')[['q1', 'med', 'q3']]
+            table = table.join(quartiles, on='group')
+        else:
+            table = y.value_counts(sort=False).rename_axis('group').reset_index(name='count')
+
+        title = f'{target_col}' if kind in ['hist', 'kde'] else f'{x_col} vs {target_col}'
+        aggregates.append(PlotAggregate(kind=kind, table=table, n_rows=n_rows,
+                                        title=f'{kind.title()} Plot: {title}',
+                                        xlabel=x_col if x_col else '', ylabel=target_col,
+                                        colors=custom_colors))
+    return aggregates
+
+
+def distribution_aggregates(df, columns, plot_type='categorical', kde=False, bins='auto', weights=None):
+    """
+    Agregat kecil untuk plot_distributions: value_counts (categorical) atau np.histogram (numeric),
+    plus KDE terbinning yang diskalakan ke count jika kde=True. weights (mis. bobot StratifiedSample)
+    dipakai untuk histogram numerik.
+
+    Returns:
+    list of PlotAggregate, satu per kolom.
+    """
+    aggregates = []
+    for var in columns:
+        if plot_type == 'categorical':
+            table = df[var].value_counts(sort=False).rename_axis('group').reset_index(name='count')
+            kind = 'count'
+        else:
+            values = df[var].to_numpy(dtype=np.float64, na_value=np.nan)
+            table = _histogram_table(values, np.zeros(len(values), dtype=np.int8), bins=bins, weights=weights)
+            kind = 'hist'
+        curve = None
+        if plot_type == 'numeric' and kde:
+            density = _binned_density(values, weights)
+            if density is not None:
+                width = (table['right'] - table['left']).mean()
+                curve = (density[0], density[1] * table['count'].sum() * width)
+        # Satu warna untuk semua bar, seperti countplot / histplot tanpa hue
+        colors = dict.fromkeys(table['group'], sns.color_palette()[0])
+        aggregates.append(PlotAggregate(kind=kind, table=table, n_rows=len(df), title=f'Distribution of {var}',
+                                        xlabel=var, ylabel='Count', colors=colors, legend=False, curve=curve))
+    return aggregates
+
+
+def _group_colors(aggregate, groups):
+    # Sama dengan plot_relationship: custom_colors, atau Set1 menurut urutan kemunculan nilai
+    if aggregate.colors:
+        return aggregate.colors
+    palette = sns.color_palette("Set1", len(groups))
+    return {group: palette[j] for j, group in enumerate(groups)}
+
+
+def draw_aggregate(aggregate, ax):
+    """
+    Menggambar PlotAggregate pada matplotlib Axes (hanya API Axes, tanpa state pyplot).
+    """
+    table, kind = aggregate.table, aggregate.kind
+    # Tabel dipartisi sekali per grup (urutan kemunculan), bukan difilter ulang untuk setiap grup
+    parts = dict(list(table.groupby('group', sort=False, observed=True))) if 'group' in table.columns else {}
+    groups = list(parts) if kind not in ('box', 'violin', 'count') else list(table.get('group', []))
+    colors = _group_colors(aggregate, groups)
+    labelled = False
+
+    if kind in ('line', 'bar'):
+        levels = np.sort(pd.unique(table['x'])) if kind == 'bar' else None
+        for group, part in parts.items():
+            color = colors.get(group, 'gray')
+            if kind == 'line':
+                ax.plot(part['x'], part['mean'], color=color, label=group)
+                ax.fill_between(part['x'], part['lower'], part['upper'], color=color, alpha=0.2, linewidth=0)
+            else:
+                positions = np.searchsorted(levels, part['x'].to_numpy())
+                ax.bar(positions, part['mean'], color=color, label=group, alpha=0.8,
+                       yerr=[part['mean'] - part['lower'], part['upper'] - part['mean']], ecolor='0.26')
+        if kind == 'bar':
+            ax.set_xticks(np.arange(len(levels)), [str(level) for level in levels])
+        labelled = True
+    elif kind == 'scatter':
+        for group, part in parts.items():
+            ax.scatter(part['x'], part['y'], color=colors.get(group, 'gray'), label=group, s=20)
+        labelled = True
+    elif kind == 'hist':
+        for group, part in parts.items():
+            edges = np.append(part['left'].to_numpy(), part['right'].to_numpy()[-1:])
+            ax.stairs(part['count'].to_numpy(), edges, fill=True, alpha=0.6, color=colors.get(group, 'gray'),
+                      label=group)
+        if aggregate.curve is not None:
+            ax.plot(*aggregate.curve, color=colors.get(groups[0], 'gray') if groups else 'gray')
+        labelled = True
+    elif kind == 'kde':
+        for group, part in parts.items():
+            color = colors.get(group, 'gray')
+            ax.fill_between(part['x'], part['density'], color=color, alpha=0.25, linewidth=0)
+            ax.plot(part['x'], part['density'], color=color, label=group)
+        labelled = True
+    elif kind == 'count':
+        ax.bar([str(group) for group in groups], table['count'], color=[colors.get(group, 'gray') for group in groups])
+    elif kind == 'box':
+        boxes = [dict(label=str(row.level), q1=row.q1, med=row.med, q3=row.q3, whislo=row.whislo,
+                      whishi=row.whishi, fliers=row.fliers) for row in table.itertuples()]
+        ax.bxp(boxes, positions=np.arange(len(boxes)), patch_artist=True,
+               boxprops=dict(facecolor=sns.color_palette()[0], alpha=0.8))
+        ax.set_xticks(np.arange(len(boxes)), [box['label'] for box in boxes])
+    elif kind == 'violin':
+        levels = list(parts)
+        for position, (level, part) in enumerate(parts.items()):
+            width = part['density'].to_numpy() / part['density'].max() * 0.4
+            ax.fill_betweenx(part['x'], position - width, position + width, color=sns.color_palette()[0], alpha=0.8)
+            first = part.iloc[0]
+            ax.vlines(position, first['q1'], first['q3'], color='0.2', linewidth=4)
+            ax.scatter([position], [first['med']], color='white', s=15, zorder=3)
+        ax.set_xticks(np.arange(len(levels)), [str(level) for level in levels])
+
+    ax.set_title(aggregate.title)
+    ax.set_xlabel(aggregate.xlabel)
+    ax.set_ylabel(aggregate.ylabel)
+    if labelled and groups and aggregate.legend and len(groups) <= LEGEND_MAX_ENTRIES:
+        ax.legend()
+
+
+def _render_file(path, aggregates, n_cols, panel_size, dpi):
+    # Worker: figure Agg tanpa pyplot, aman dijalankan paralel di process pool
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    n_rows = (len(aggregates) + n_cols - 1) // n_cols
+    fig = Figure(figsize=(panel_size[0] * n_cols, panel_size[1] * n_rows))
+    FigureCanvasAgg(fig)
+    for i, aggregate in enumerate(aggregates, 1):
+        draw_aggregate(aggregate, fig.add_subplot(n_rows, n_cols, i))
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def render_plot_files(figures, out_dir, fmt='png', n_jobs=None, n_cols=1, panel_size=(10, 4), dpi=100):
+    """
+    Merender banyak figure dari agregat ke file, opsional paralel di process pool.
+
+    Parameters:
+    figures: dict
+        {nama_file: list of PlotAggregate}; setiap aggregate menjadi satu panel.
+    out_dir: str
+        Folder output (dibuat jika belum ada).
+    fmt: str, optional, default='png'
+        Format file ('png', 'svg', 'pdf', ...).
+    n_jobs: int or None, optional, default=None
+        Jumlah proses worker. None atau 1 berarti dijalankan di proses ini.
+    n_cols: int, optional, default=1
+        Jumlah panel per baris.
+    panel_size: tuple, optional, default=(10, 4)
+        Ukuran satu panel dalam inci.
+    dpi: int, optional, default=100
+        Resolusi file raster.
+
+    Returns:
+    list path file yang ditulis, urut sesuai figures.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(os.path.join(out_dir, f'{name}.{fmt}'), list(aggregates)) for name, aggregates in figures.items()]
+    if n_jobs is None or n_jobs == 1:
+        return [_render_file(path, aggregates, n_cols, panel_size, dpi) for path, aggregates in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [pool.submit(_render_file, path, aggregates, n_cols, panel_size, dpi) for path, aggregates in jobs]
+        return [future.result() for future in futures]
+
+
+# 22. Precomputed segment cube
+# Notebook berulang kali menghitung groupby('fuelType') mean price/mileage/mpg, pd.cut kategori harga
+# dan groupby(['kategori_harga', 'model_tahun']).size(). SegmentCube menyimpan agregat per sel
+# fuelType x transmission x kategori_harga x model x year sekali; roll-up dan slice dihitung dari
+# tabel sel yang kecil (ribuan baris) tanpa membaca ulang listing.
+PRICE_BANDS = [0, 15000, 30000, 45000]
+PRICE_BAND_LABELS = ['Murah', 'Sedang', 'Mahal']
+CUBE_DIMENSIONS = ['fuelType', 'transmission', 'kategori_harga', 'model', 'year']
+CUBE_MEASURES = ['price', 'mileage', 'mpg']
+_CUBE_STATS = {'n': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def price_band(price, bands=None, labels=None):
+    """
+    Kategori harga seperti pd.cut(price, bins=bands, labels=labels, include_lowest=True) di notebook,
+    lewat np.searchsorted. Harga di luar rentang bands menjadi NaN.
+    """
+    bands = PRICE_BANDS if bands is None else bands
+    labels = PRICE_BAND_LABELS if labels is None else labels
+    values = np.asarray(price, dtype=np.float64)
+    codes = np.searchsorted(np.asarray(bands[1:], dtype=np.float64), values, side='left')
+    outside = (values < bands[0]) | (values > bands[-1]) | np.isnan(values)
+    codes = np.where(outside, -1, codes)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+class SegmentCube:
+    """
+    Agregat materialized per sel dimensi: count, dan untuk setiap measure n (non-null), sum, sumsq,
+    min dan max. Hanya sel yang terisi yang disimpan.
+
+    Sel dengan kategori_harga NaN (harga di luar bands) tetap disimpan, sehingga roll-up yang tidak
+    memakai kategori_harga tetap menghitung semua listing.
+
+    Parameters:
+    dimensions: list, optional, default=CUBE_DIMENSIONS
+        Kolom dimensi. 'kategori_harga' diturunkan dari kolom price lewat price_band.
+    measures: list, optional, default=CUBE_MEASURES
+        Kolom numerik yang diagregasi.
+    bands, band_labels: list, optional
+        Batas dan label kategori harga (default PRICE_BANDS / PRICE_BAND_LABELS).
+    """
+
+    def __init__(self, dimensions=None, measures=None, bands=None, band_labels=None):
+        self.dimensions = list(CUBE_DIMENSIONS if dimensions is None else dimensions)
+        self.measures = list(CUBE_MEASURES if measures is None else measures)
+        self.bands = list(PRICE_BANDS if bands is None else bands)
+        self.band_labels = list(PRICE_BAND_LABELS if band_labels is None else band_labels)
+        self.cells = None
+        self.n_partitions = 0
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        """
+        Membangun cube dari satu DataFrame listing.
+        """
+        return cls(**kwargs).update(df)
+
+    @property
+    def n_rows(self):
+        return 0 if self.cells is None else int(self.cells['count'].sum())
+
+    def _aggregate(self, df):
+        # Tabel sel untuk satu partisi: satu groupby atas semua dimensi
+        frame = df[[col for col in self.dimensions if col != 'kategori_harga']].copy()
+        if 'kategori_harga' in self.dimensions:
+            frame['kategori_harga'] = price_band(df['price'], self.bands, self.band_labels)
+        aggs = {}
+        for measure in self.measures:
+            values = df[measure].to_numpy(dtype=np.float64, na_value=np.nan)
+            frame[f'{measure}_n'] = ~np.isnan(values)
+            frame[f'{measure}_sum'] = values
+            frame[f'{measure}_sumsq'] = values * values
+            frame[f'{measure}_min'] = values
+            frame[f'{measure}_max'] = values
+            aggs.update({f'{measure}_{stat}': how for stat, how in _CUBE_STATS.items()})
+        frame['count'] = 1
+        aggs['count'] = 'sum'
+        cells = frame.groupby(self.dimensions, sort=False, observed=True, dropna=False).agg(aggs)
+        return cells[['count'] + [col for col in aggs if col != 'count']]
+
+    def _combine(self, cells):
+        # Gabungkan tabel sel (mis. partisi baru) ke tabel yang ada: sum untuk count/n/sum/sumsq,
+        # min/max untuk min/max
+        if self.cells is not None:
+            cells = pd.concat([self.cells, cells])
+        how = {col: ('min' if col.endswith('_min') else 'max' if col.endswith('_max') else 'sum')
+               for col in cells.columns}
+        self.cells = cells.groupby(level=list(range(cells.index.nlevels)), sort=True, observed=True,
+                                   dropna=False).agg(how)
+
+    def update(self, df):
+        """
+        Menambahkan satu partisi listing (mis. batch harian) ke cube.
+        """
+        with span('segment_cube_update', rows=len(df)):
+            self._combine(self._aggregate(df))
+        self.n_partitions += 1
+        return self
+
+    def merge(self, other):
+        """
+        Menggabungkan cube lain dengan dimensi, measure dan bands yang sama (mis. dari worker lain).
+        """
+        if (other.dimensions, other.measures, other.bands) != (self.dimensions, self.measures, self.bands):
+            raise ValueError("Cube hanya bisa digabung jika dimensions, measures dan bands sama.")
+        if other.cells is not None:
+            self._combine(other.cells)
+        self.n_partitions += other.n_partitions
+        return self
+
+    def _mask(self, where):
+        # Filter sel: {dimensi: nilai atau list nilai}
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in (where or {}).items():
+            if dim not in self.dimensions:
+                raise ValueError(f"'{dim}' bukan dimensi cube {self.dimensions}.")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.cells.index.get_level_values(dim).isin(values)
+        return mask
+
+    def slice(self, **where):
+        """
+        Cube baru yang hanya berisi sel yang cocok, mis. cube.slice(fuelType=['Hybrid', 'Electric']).
+        """
+        cube = SegmentCube(self.dimensions, self.measures, self.bands, self.band_labels)
+        cube.cells = self.cells[self._mask(where)]
+        cube.n_partitions = self.n_partitions
+        return cube
+
+    def rollup(self, by=None, measures=None, where=None, stats=('mean', 'std', 'min', 'max')):
+        """
+        Agregat pada level yang lebih kasar, dihitung dari tabel sel.
+
+        Parameters:
+        by: str or list, optional, default=None
+            Dimensi hasil, mis. 'fuelType' atau ['kategori_harga', 'model', 'year']. None untuk total.
+        measures: list, optional, default=None
+            Measure yang dilaporkan. Default semua measure cube.
+        where: dict, optional, default=None
+            Slice sebelum roll-up, {dimensi: nilai atau list nilai}.
+        stats: sequence, optional, default=('mean', 'std', 'min', 'max')
+            Statistik per measure: 'n', 'sum', 'mean', 'std', 'var', 'min', 'max'.
+
+        Returns:
+        DataFrame dengan kolom by, count, lalu <measure>_<stat>.
+        """
+        by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        measures = self.measures if measures is None else list(measures)
+        cells = self.cells[self._mask(where)] if where else self.cells
+        columns = ['count'] + [f'{m}_{stat}' for m in measures for stat in _CUBE_STATS]
+        how = {col: ('min' if col.endswith('_min') else 'max' if col.endswith('_max') else 'sum') for col in columns}
+        if by:
+            grouped = cells[columns].groupby(level=by, sort=True, observed=True, dropna=False).agg(how)
+        else:
+            grouped = cells[columns].agg(how).to_frame().T
+
+        result = grouped[['count']].copy()
+        for m in measures:
+            n, total, sumsq = grouped[f'{m}_n'], grouped[f'{m}_sum'], grouped[f'{m}_sumsq']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = total / n
+                var = np.maximum(sumsq - total * mean, 0) / (n - 1)
+            # sumsq - total * mean menyisakan galat pembulatan pada segmen bernilai konstan
+            var = var.where(grouped[f'{m}_min'] != grouped[f'{m}_max'], var * 0)
+            values = {'n': n, 'sum': total, 'mean': mean, 'var': var, 'std': np.sqrt(var),
+                      'min': grouped[f'{m}_min'], 'max': grouped[f'{m}_max']}
+            for stat in stats:
+                result[f'{m}_{stat}'] = values[stat]
+        result['count'] = result['count'].astype(np.int64)
+        return result.reset_index() if by else result.reset_index(drop=True)
+
+    def top_segments(self, group, segment, n=5, measure='price', stat='mean', ascending=True, where=None):
+        """
+        n segmen teratas per grup, mis. 5 model-tahun termurah per kategori harga:
+        cube.top_segments('kategori_harga', ['model', 'year']).
+        """
+        group = [group] if isinstance(group, str) else list(group)
+        segment = [segment] if isinstance(segment, str) else list(segment)
+        table = self.rollup(group + segment, measures=[measure], where=where, stats=(stat,))
+        table = table.dropna(subset=group).sort_values(group + [f'{measure}_{stat}'],
+                                                       ascending=[True] * len(group) + [ascending])
+        return table.groupby(group, sort=False, observed=True).head(n).reset_index(drop=True)
+
+    def save(self, path):
+        """
+        Menyimpan cube ke file pickle (ditulis ke file sementara lalu di-rename).
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Membaca cube yang disimpan dengan save().
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, cls):
+            raise ValueError(f"File '{path}' tidak berisi {cls.__name__}.")
+        return state
+
+
+# 23. Permutation / exact tests for small segments
+# Segmen kecil (mis. Hybrid dan Electric di bmw.csv) membuat p-value asimtotik t-test, ANOVA dan
+# Spearman tidak bisa dipercaya. Di sini p-value dihitung dari distribusi permutasi: semua permutasi
+# satu chunk dievaluasi sekaligus sebagai operasi matrix, dan untuk n sangat kecil seluruh susunan
+# dienumerasi (exact).
+PERMUTATIONS = 10_000
+PERMUTATION_TESTS = ('spearman', 't-test', 'anova')
+# Jumlah sel (permutasi x n) per chunk matrix permutasi
+PERMUTATION_CHUNK_CELLS = 2_000_000
+# Batas total memori matrix indeks permutasi yang di-cache (bytes)
+PERMUTATION_CACHE_BYTES = 64 * 1024 ** 2
+_PERMUTATION_CACHE = OrderedDict()
+
+
+@dataclass
+class PermutationTestResult:
+    test: str
+    statistic: float
+    p_value: float
+    n_permutations: int
+    exact: bool
+
+
+def _permutation_statistic(test, a, labels, n_groups):
+    """
+    Statistik uji untuk setiap baris matrix labels (satu susunan per baris), sekaligus.
+
+    - spearman : a ranking x yang dipusatkan, labels ranking y (dipusatkan) per susunan; hasil rho
+    - t-test   : a numerik dipusatkan, labels kode grup 0/1; hasil t Welch
+    - anova    : a numerik dipusatkan, labels kode grup 0..n_groups-1; hasil F
+    """
+    labels = np.atleast_2d(labels)
+    n = labels.shape[1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if test == 'spearman':
+            return (labels @ a) / np.sqrt((a ** 2).sum() * (labels[0] ** 2).sum())
+
+        if test == 't-test':
+            member = (labels == 0).astype(np.float64)
+            n1 = member[0].sum()
+            n2 = n - n1
+            s1, q1 = member @ a, member @ (a ** 2)
+            s2, q2 = a.sum() - s1, (a ** 2).sum() - q1
+            v1 = (q1 - s1 ** 2 / n1) / (n1 - 1)
+            v2 = (q2 - s2 ** 2 / n2) / (n2 - 1)
+            return (s1 / n1 - s2 / n2) / np.sqrt(v1 / n1 + v2 / n2)
+
+        # anova: SSB dari jumlah per grup, SSW = SST - SSB (SST sama untuk semua susunan)
+        total = a.sum()
+        sst = (a ** 2).sum() - total ** 2 / n
+        ssb = -total ** 2 / n
+        for group in range(n_groups):
+            member = (labels == group).astype(np.float64)
+            ssb = ssb + (member @ a) ** 2 / member[0].sum()
+        return (ssb / (n_groups - 1)) / ((sst - ssb) / (n - n_groups))
+
+
+def _arrangement_count(test, labels):
+    # Jumlah susunan berbeda dari labels (n! untuk Spearman, multinomial untuk kode grup)
+    if test == 'spearman':
+        return math.factorial(len(labels))
+    count = math.factorial(len(labels))
+    for size in np.bincount(labels):
+        count //= math.factorial(int(size))
+    return count
+
+
+def _arrangements(test, labels):
+    """
+    Generator semua susunan labels: semua permutasi (Spearman) atau semua susunan kode grup yang
+    berbeda (t-test / ANOVA, dengan memilih posisi setiap grup secara berurutan).
+    """
+    if test == 'spearman':
+        yield from itertools.permutations(labels)
+        return
+    sizes = np.bincount(labels)
+    n = len(labels)
+
+    def place(group, free, row):
+        if group == len(sizes) - 1:
+            row[list(free)] = group
+            yield tuple(row)
+            return
+        for chosen in itertools.combinations(free, int(sizes[group])):
+            row[list(chosen)] = group
+            taken = set(chosen)
+            rest = tuple(pos for pos in free if pos not in taken)
+            yield from place(group + 1, rest, row)
+
+    yield from place(0, tuple(range(n)), np.zeros(n, dtype=np.int64))
+
+
+def _permutation_indices(n, size, seed, offset):
+    """
+    Matrix indeks permutasi acak (size x n) untuk chunk mulai dari permutasi ke-offset.
+
+    Di-cache (LRU, total dibatasi PERMUTATION_CACHE_BYTES): segmen dengan ukuran yang sama memakai
+    matrix yang sama, sehingga ratusan segmen kecil tidak membangkitkan ulang permutasi (setiap uji
+    tetap valid secara terpisah). Matrix dibangkitkan ulang dari seed yang sama jika sudah dibuang.
+    """
+    key = (n, size, seed, offset)
+    indices = _PERMUTATION_CACHE.get(key)
+    if indices is not None:
+        _PERMUTATION_CACHE.move_to_end(key)
+        return indices
+
+    rng = np.random.default_rng([seed, n, offset])
+    dtype = np.int16 if n <= np.iinfo(np.int16).max else np.intp
+    indices = rng.permuted(np.broadcast_to(np.arange(n, dtype=dtype), (size, n)), axis=1)
+    indices.flags.writeable = False
+    if indices.nbytes <= PERMUTATION_CACHE_BYTES:
+        _PERMUTATION_CACHE[key] = indices
+        total = sum(value.nbytes for value in _PERMUTATION_CACHE.values())
+        while total > PERMUTATION_CACHE_BYTES:
+            _, dropped = _PERMUTATION_CACHE.popitem(last=False)
+            total -= dropped.nbytes
+    return indices
+
+
+def _permutation_pvalue(test, groups, permutations, details):
+    # p-value permutasi untuk daftar grup (t-test / ANOVA); details dilengkapi metode dan p asimtotik
+    values = [np.asarray(group, dtype=np.float64) for group in groups]
+    values = [group[~np.isnan(group)] for group in values]
+    n_permutations = PERMUTATIONS if permutations is True else int(permutations)
+    labels = np.repeat(np.arange(len(values)), [len(group) for group in values])
+    res = permutation_test(test, np.concatenate(values), labels, n_permutations=n_permutations)
+    details['method'] = 'exact' if res.exact else 'permutation'
+    details['n_permutations'] = res.n_permutations
+    return res.p_value
+
+
+def _permutation_note(details):
+    if 'method' not in details:
+        return ''
+    return f" ({details['method']}, {details['n_permutations']:,} susunan)"
+
+
+def permutation_test(test, a, b, n_permutations=PERMUTATIONS, exact='auto', seed=42,
+                     chunk_cells=PERMUTATION_CHUNK_CELLS):
+    """
+    P-value permutasi (atau exact) untuk Spearman, t-test Welch dan ANOVA satu arah.
+
+    Label b diacak terhadap a: matrix permutasi berukuran (chunk x n) dibuat sekaligus dan statistik
+    seluruh baris dihitung dengan satu perkalian matrix, per chunk untuk membatasi memori. Jika
+    jumlah susunan berbeda tidak lebih dari n_permutations (exact='auto'), semua susunan dienumerasi.
+
+    Parameters:
+    test: str
+        'spearman' (a, b numerik), 't-test' (a numerik, b kode 2 grup) atau 'anova' (a numerik,
+        b kode >= 2 grup), sama seperti _segment_test.
+    a, b: array-like
+        Data satu segmen, tanpa missing value.
+    n_permutations: int, optional, default=10_000
+        Jumlah permutasi acak.
+    exact: 'auto', bool, optional, default='auto'
+        True memaksa enumerasi semua susunan, False selalu memakai permutasi acak.
+    seed: int, optional, default=42
+        Seed generator permutasi.
+    chunk_cells: int, optional, default=PERMUTATION_CHUNK_CELLS
+        Batas sel matrix permutasi per chunk.
+
+    Returns:
+    PermutationTestResult. p-value dua sisi untuk Spearman dan t-test (|statistik|), satu sisi atas
+    untuk F. Permutasi acak memakai (1 + jumlah >= observasi) / (1 + n_permutations).
+    """
+    if test not in PERMUTATION_TESTS:
+        raise ValueError(f"test harus salah satu dari {PERMUTATION_TESTS}")
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b)
+    n = len(a)
+    if test == 'spearman':
+        x = stats.rankdata(a)
+        a = x - x.mean()
+        y = stats.rankdata(b)
+        labels = y - y.mean()
+        n_groups = 0
+    else:
+        labels = np.unique(b, return_inverse=True)[1].astype(np.int64)
+        n_groups = int(labels.max()) + 1 if n else 0
+        a = a - a.mean()
+
+    observed = float(_permutation_statistic(test, a, labels, n_groups)[0])
+    if np.isnan(observed):
+        return PermutationTestResult(test, np.nan, np.nan, 0, False)
+    # Dua sisi untuk rho dan t; toleransi relatif agar susunan setara dengan observasi ikut terhitung
+    observed_abs = observed if test == 'anova' else abs(observed)
+    threshold = observed_abs - 1e-9 * max(1.0, abs(observed_abs))
+
+    chunk = max(1, int(chunk_cells) // max(n, 1))
+    total = _arrangement_count(test, labels)
+    use_exact = exact is True or (exact == 'auto' and total <= n_permutations)
+
+    extreme = 0
+    if use_exact:
+        arrangements = _arrangements(test, labels)
+        done = 0
+        while True:
+            rows = list(itertools.islice(arrangements, chunk))
+            if not rows:
+                break
+            values = _permutation_statistic(test, a, np.array(rows, dtype=labels.dtype), n_groups)
+            values = values if test == 'anova' else np.abs(values)
+            extreme += int((values >= threshold).sum())
+            done += len(rows)
+        return PermutationTestResult(test, observed, extreme / done, done, True)
+
+    done = 0
+    while done < n_permutations:
+        size = min(chunk, n_permutations - done)
+        permuted = labels[_permutation_indices(n, size, seed, done)]
+        values = _permutation_statistic(test, a, permuted, n_groups)
+        values = values if test == 'anova' else np.abs(values)
+        extreme += int((values >= threshold).sum())
+        done += size
+    return PermutationTestResult(test, observed, (1 + extreme) / (1 + n_permutations), n_permutations, False)
@@ -0,0 +1,225 @@
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from scipy.optimize import milp, LinearConstraint, Bounds
+
+from eda_package import PRICE_BANDS, PRICE_BAND_LABELS
+
+
+# Spesifikasi default sesuai README: 5 mobil, budget £150.000, 3 NON-EV + 1 Hybrid + 1 Electric
+DEFAULT_QUOTAS = {
+    'NON-EV': (['Petrol', 'Diesel'], 3),
+    'Hybrid': (['Hybrid'], 1),
+    'Electric': (['Electric'], 1),
+}
+# Kategori harga yang sama dengan SegmentCube / price_band di eda_package
+DEFAULT_BANDS = PRICE_BANDS
+DEFAULT_BAND_LABELS = PRICE_BAND_LABELS
+
+
+@dataclass
+class FleetSpec:
+    """
+    Batasan pembelian armada.
+
+    Parameters:
+    budget: float
+        Total budget maksimum.
+    quotas: dict
+        {nama kuota: (list fuelType, jumlah unit)}; setiap kuota harus terpenuhi tepat.
+    bands: list or None
+        Batas kategori harga (sama seperti pd.cut di notebook). None untuk tanpa kategori.
+    band_labels: list or None
+        Label kategori harga.
+    band_limits: dict or None
+        {label kategori: jumlah unit maksimum}. None untuk tanpa batas.
+    exclude_outside_bands: bool
+        Jika True, listing di luar rentang bands tidak dipertimbangkan.
+    """
+    budget: float = 150_000
+    quotas: dict = field(default_factory=lambda: dict(DEFAULT_QUOTAS))
+    bands: list = field(default_factory=lambda: list(DEFAULT_BANDS))
+    band_labels: list = field(default_factory=lambda: list(DEFAULT_BAND_LABELS))
+    band_limits: dict = None
+    exclude_outside_bands: bool = True
+
+
+@dataclass
+class FleetSolution:
+    best: pd.DataFrame
+    runners_up: list
+    summary: pd.DataFrame
+    n_listings: int
+    n_candidates: int
+
+
+def expected_residual_value(df, keys=('model', 'year', 'fuelType'), value='price'):
+    """
+    Nilai residu yang diharapkan per listing: rata-rata harga pasar segmen (model, year, fuelType).
+
+    Ini adalah metrik yang dipakai notebook untuk meranking model-tahun; objective lain
+    (mis. prediksi model depresiasi) bisa diberikan ke optimize_fleet lewat argumen objective.
+    """
+    return df.groupby(list(keys), observed=True)[value].transform('mean')
+
+
+def _frontier_layers(price, value, depth):
+    """
+    Menandai listing yang berada di `depth` lapisan Pareto pertama (harga rendah, nilai tinggi).
+
+    Listing di luar lapisan tersebut didominasi (harga <= dan nilai >=) oleh minimal `depth`
+    listing lain pada sel yang sama sehingga tidak mungkin masuk ke `depth` basket terbaik.
+    """
+    keep = np.zeros(len(price), dtype=bool)
+    remaining = np.lexsort((-value, price))
+    for _ in range(depth):
+        if not len(remaining):
+            break
+        v = value[remaining]
+        prev_max = np.maximum.accumulate(np.r_[-np.inf, v[:-1]])
+        on_front = v > prev_max
+        keep[remaining[on_front]] = True
+        remaining = remaining[~on_front]
+    return keep
+
+
+def _prune_candidates(cands, quotas, band_limited, n_baskets, price_col):
+    # Pruning per sel (kuota, kategori harga): simpan hanya lapisan Pareto yang relevan
+    cell_cols = ['_quota', '_band'] if band_limited else ['_quota']
+    keep = np.zeros(len(cands), dtype=bool)
+    for cell, idx in cands.groupby(cell_cols, observed=True, sort=False).indices.items():
+        quota = cell[0] if isinstance(cell, tuple) else cell
+        depth = quotas[quota][1] + n_baskets - 1
+        keep[idx] = _frontier_layers(cands[price_col].to_numpy(dtype=np.float64)[idx], cands['_value'].to_numpy()[idx], depth)
+    return cands[keep]
+
+
+def optimize_fleet(df, spec=None, objective=None, n_baskets=5, price_col='price', fuel_col='fuelType'):
+    """
+    Memilih basket mobil terbaik (dan runner-up) dengan Integer Linear Programming.
+
+    Listing dikelompokkan ke kuota fuelType, salinan identik dibatasi, lalu dipangkas ke kandidat Pareto
+    (tidak ada pilihan lain yang lebih murah dan bernilai lebih tinggi). ILP (HiGHS via
+    scipy.optimize.milp) memaksimalkan total objective dengan batasan budget, kuota, dan
+    batas kategori harga. Runner-up diperoleh dengan menambahkan no-good cut untuk setiap
+    basket yang sudah ditemukan lalu menyelesaikan ulang ILP.
+
+    Parameters:
+    df: DataFrame
+        Data listing (kolom price dan fuelType, plus kolom yang dibutuhkan objective).
+    spec: FleetSpec, optional, default=None
+        Batasan pembelian. Default FleetSpec() sesuai README.
+    objective: str, callable, or None, optional, default=None
+        Nama kolom atau fungsi df -> Series nilai per listing yang dimaksimalkan.
+        Default expected_residual_value.
+    n_baskets: int, optional, default=5
+        Jumlah basket yang dikembalikan (terbaik + runner-up).
+
+    Returns:
+    FleetSolution dengan best (DataFrame listing terpilih), runners_up (list DataFrame),
+    dan summary (total harga dan nilai per basket).
+    """
+    spec = FleetSpec() if spec is None else spec
+
+    if objective is None:
+        value = expected_residual_value(df)
+    elif callable(objective):
+        value = objective(df)
+    else:
+        value = df[objective]
+
+    cands = df.assign(_value=np.asarray(value, dtype=np.float64))
+    cands = cands[cands['_value'].notna() & cands[price_col].notna() & (cands[price_col] <= spec.budget)]
+
+    # Kuota fuelType
+    fuel_to_quota = {fuel: name for name, (fuels, _) in spec.quotas.items() for fuel in fuels}
+    cands = cands.assign(_quota=cands[fuel_col].astype(object).map(fuel_to_quota))
+    cands = cands[cands['_quota'].notna()]
+
+    # Kategori harga
+    if spec.bands is not None:
+        band = pd.cut(cands[price_col], bins=spec.bands, labels=spec.band_labels, include_lowest=True)
+        cands = cands.assign(_band=band.astype(object))
+        if spec.exclude_outside_bands:
+            cands = cands[cands['_band'].notna()]
+    else:
+        cands = cands.assign(_band=None)
+    band_limited = bool(spec.band_limits)
+
+    n_listings = len(df)
+
+    # Listing identik (kuota, kategori, harga, nilai) tetap mobil yang berbeda: simpan paling banyak
+    # sejumlah kuota salinan, karena satu basket bisa membutuhkan beberapa di antaranya
+    dup_key = ['_quota', '_band', price_col, '_value']
+    copy_no = cands.groupby(dup_key, sort=False, dropna=False).cumcount().to_numpy()
+    quota_size = cands['_quota'].map({name: count for name, (_, count) in spec.quotas.items()}).to_numpy()
+    cands = cands[copy_no < quota_size]
+    cands = _prune_candidates(cands, spec.quotas, band_limited, n_baskets, price_col)
+
+    price = cands[price_col].to_numpy(dtype=np.float64)
+    val = cands['_value'].to_numpy(dtype=np.float64)
+    n = len(cands)
+
+    rows, lower, upper = [price], [-np.inf], [spec.budget]
+    for name, (_, count) in spec.quotas.items():
+        rows.append((cands['_quota'] == name).to_numpy(dtype=np.float64))
+        lower.append(count)
+        upper.append(count)
+    if band_limited:
+        for label, limit in spec.band_limits.items():
+            rows.append((cands['_band'] == label).to_numpy(dtype=np.float64))
+            lower.append(0)
+            upper.append(limit)
+
+    # Pemecah simetri salinan identik: salinan berikutnya hanya dipilih jika salinan sebelumnya
+    # dipilih, sehingga basket yang sama tidak muncul lagi sebagai runner-up lewat salinan lain
+    codes = cands.groupby(dup_key, sort=False, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    same = codes[order][1:] == codes[order][:-1]
+    for first, second in zip(order[:-1][same], order[1:][same]):
+        row = np.zeros(n)
+        row[first], row[second] = 1, -1
+        rows.append(row)
+        lower.append(0)
+        upper.append(np.inf)
+
+    baskets = []
+    size = sum(count for _, count in spec.quotas.values())
+    for _ in range(n_baskets):
+        if n == 0:
+            break
+        constraints = LinearConstraint(np.vstack(rows), lower, upper)
+        # mip_rel_gap=0: basket terbaik harus optimal, bukan hanya dalam toleransi gap default HiGHS
+        res = milp(-val, constraints=constraints, integrality=np.ones(n), bounds=Bounds(0, 1),
+                   options={'mip_rel_gap': 0})
+        if res.x is None:
+            break
+        chosen = np.flatnonzero(res.x > 0.5)
+        baskets.append(chosen)
+
+        # No-good cut: basket yang sama tidak boleh dipilih lagi
+        cut = np.zeros(n)
+        cut[chosen] = 1
+        rows.append(cut)
+        lower.append(-np.inf)
+        upper.append(size - 1)
+
+    frames = []
+    for rank, chosen in enumerate(baskets, 1):
+        basket = cands.iloc[chosen].rename(columns={'_value': 'expected_value', '_quota': 'quota', '_band': 'band'})
+        basket = basket.sort_values(['quota', price_col]).assign(basket=rank)
+        frames.append(basket)
+
+    summary = pd.DataFrame({
+        'basket': [basket['basket'].iloc[0] for basket in frames],
+        'total_price': [basket[price_col].sum() for basket in frames],
+        'total_expected_value': [basket['expected_value'].sum() for basket in frames],
+    })
+
+    return FleetSolution(
+        best=frames[0] if frames else cands.iloc[:0],
+        runners_up=frames[1:],
+        summary=summary,
+        n_listings=n_listings,
+        n_candidates=n,
+    )
@@ -0,0 +1,252 @@
+import os
+import pickle
+import warnings
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from scipy.spatial import cKDTree
+
+
+# Index listing serupa: partisi exact pada kolom kategorikal (model, fuelType), lalu KD-tree di atas
+# fitur numerik yang diskalakan di dalam setiap partisi. Dipakai untuk menilai apakah harga kandidat
+# wajar dibandingkan k listing paling mirip.
+DEFAULT_KEYS = ('model', 'fuelType')
+DEFAULT_FEATURES = ('year', 'mileage', 'engineSize')
+
+
+@dataclass
+class ListingIndex:
+    """
+    Hasil build_listing_index.
+
+    keys: list
+        Kolom partisi (dicocokkan exact).
+    features: list
+        Kolom numerik untuk jarak (setelah dibagi scale).
+    scale: dict
+        Pembagi per fitur; jarak 1 = selisih satu 'scale' pada satu fitur.
+    partitions: pd.Index
+        Nilai kunci setiap partisi (MultiIndex jika lebih dari satu kolom kunci).
+    starts, stops: ndarray
+        Slice [start, stop) setiap partisi pada data yang sudah diurutkan per partisi.
+    trees: list
+        cKDTree per partisi.
+    data: DataFrame
+        Kolom listing yang disimpan (urut per partisi), untuk hasil neighbours dan price_benchmark.
+    """
+    keys: list
+    features: list
+    scale: dict
+    partitions: pd.Index
+    starts: np.ndarray
+    stops: np.ndarray
+    trees: list
+    data: pd.DataFrame
+
+    @property
+    def n_rows(self):
+        return len(self.data)
+
+    def _partition_codes(self, candidates):
+        # Partisi setiap kandidat, -1 jika kombinasi kunci tidak ada di index
+        if len(self.keys) == 1:
+            return self.partitions.get_indexer(candidates[self.keys[0]].astype(object))
+        return self.partitions.get_indexer(pd.MultiIndex.from_frame(candidates[self.keys].astype(object)))
+
+    def _scaled(self, frame):
+        return np.column_stack([frame[col].to_numpy(dtype=np.float64) / self.scale[col] for col in self.features])
+
+    def query(self, candidates, k=10, exclude_self=False, n_jobs=1):
+        """
+        k listing terdekat untuk setiap kandidat, dalam batch (satu query KD-tree per partisi).
+
+        Parameters:
+        candidates: DataFrame
+            Listing yang dinilai; butuh kolom keys dan features.
+        k: int, optional, default=10
+            Jumlah tetangga.
+        exclude_self: bool, optional, default=False
+            True jika kandidat berasal dari data index: listing dengan label index yang sama dilewati.
+        n_jobs: int, optional, default=1
+            Worker thread KD-tree (-1 untuk semua core).
+
+        Returns:
+        (distances, positions): array (n_kandidat, k). positions adalah baris pada index.data;
+        -1 dan jarak inf jika partisi tidak dikenal, fitur kandidat tidak finite, atau partisi
+        berisi kurang dari k listing.
+        """
+        n = len(candidates)
+        extra = 1 if exclude_self else 0
+        distances = np.full((n, k + extra), np.inf)
+        positions = np.full((n, k + extra), -1, dtype=np.int64)
+
+        codes = self._partition_codes(candidates)
+        points = self._scaled(candidates)
+        # Fitur missing / tak hingga diperlakukan seperti partisi tidak dikenal
+        codes[~np.isfinite(points).all(axis=1)] = -1
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        for block in np.split(order, bounds):
+            code = codes[block[0]]
+            if code < 0:
+                continue
+            size = self.stops[code] - self.starts[code]
+            kk = min(k + extra, size)
+            dist, idx = self.trees[code].query(points[block], k=kk, workers=n_jobs)
+            dist, idx = dist.reshape(len(block), kk), idx.reshape(len(block), kk)
+            distances[block, :kk] = dist
+            positions[block, :kk] = idx + self.starts[code]
+
+        if exclude_self:
+            labels = self.data.index.to_numpy()
+            own = (positions >= 0) & (labels[np.maximum(positions, 0)] == candidates.index.to_numpy()[:, None])
+            # Geser tetangga lain ke depan: urutkan stabil dengan listing sendiri di belakang
+            shift = np.argsort(own, axis=1, kind='stable')
+            distances = np.take_along_axis(distances, shift, axis=1)[:, :k]
+            positions = np.take_along_axis(positions, shift, axis=1)[:, :k]
+        return distances, positions
+
+    def neighbours(self, candidates, k=10, exclude_self=False, n_jobs=1):
+        """
+        Tabel panjang tetangga: satu baris per (kandidat, rank) dengan kolom listing tetangga.
+        """
+        distances, positions = self.query(candidates, k, exclude_self, n_jobs)
+        found = positions >= 0
+        rows = self.data.iloc[positions[found]]
+        table = rows.reset_index(names='listing')
+        table.insert(0, 'candidate', np.repeat(candidates.index.to_numpy(), found.sum(axis=1)))
+        table.insert(1, 'rank', np.nonzero(found)[1] + 1)
+        table.insert(2, 'distance', distances[found])
+        return table
+
+    def price_benchmark(self, candidates, k=10, price_col='price', exclude_self=False, n_jobs=1):
+        """
+        Menilai harga setiap kandidat terhadap k listing paling mirip.
+
+        Returns:
+        DataFrame (index sama dengan candidates): n_neighbours, median_price, mean_price, q25, q75,
+        price_ratio (harga kandidat / median tetangga), cheaper_share (fraksi tetangga yang lebih murah)
+        dan max_distance.
+        """
+        distances, positions = self.query(candidates, k, exclude_self, n_jobs)
+        found = positions >= 0
+        prices = np.where(found, self.data[price_col].to_numpy(dtype=np.float64)[np.maximum(positions, 0)], np.nan)
+        own = candidates[price_col].to_numpy(dtype=np.float64)
+        n_found = found.sum(axis=1)
+        q25, median, q75 = _row_quantiles(prices, n_found, [0.25, 0.5, 0.75])
+        # Kandidat tanpa tetangga menghasilkan NaN (warning 'Mean of empty slice' diabaikan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            result = pd.DataFrame({
+                'n_neighbours': n_found,
+                'median_price': median,
+                'mean_price': np.nanmean(prices, axis=1),
+                'q25': q25,
+                'q75': q75,
+                'price_ratio': own / median,
+                'cheaper_share': (prices < own[:, None]).sum(axis=1) / np.maximum(n_found, 1),
+                'max_distance': np.where(found, distances, -np.inf).max(axis=1),
+            }, index=candidates.index)
+        result.loc[result['n_neighbours'] == 0, ['cheaper_share', 'max_distance']] = np.nan
+        return result
+
+    def save(self, path):
+        """
+        Menyimpan index (termasuk KD-tree) ke file pickle (ditulis ke file sementara lalu di-rename).
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Membaca index yang disimpan dengan save().
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, cls):
+            raise ValueError(f"File '{path}' tidak berisi {cls.__name__}.")
+        return state
+
+
+def _row_quantiles(values, counts, quantiles):
+    # Kuantil (interpolasi linear, seperti np.percentile) per baris untuk array berisi NaN di ekor,
+    # tanpa nanpercentile yang berjalan per baris
+    ordered = np.sort(values, axis=1)  # NaN terurut ke belakang
+    rows = np.arange(len(values))
+    last = np.maximum(counts - 1, 0)
+    result = []
+    for q in quantiles:
+        position = q * last
+        lo = np.floor(position).astype(np.int64)
+        hi = np.minimum(lo + 1, last)
+        frac = position - lo
+        value = ordered[rows, lo] * (1 - frac) + ordered[rows, hi] * frac
+        result.append(np.where(counts > 0, value, np.nan))
+    return result
+
+
+def build_listing_index(df, keys=DEFAULT_KEYS, features=DEFAULT_FEATURES, scale=None, columns=None, leafsize=32):
+    """
+    Membangun ListingIndex: partisi exact pada keys, KD-tree atas features yang diskalakan per partisi.
+
+    Parameters:
+    df: DataFrame
+        Basis listing.
+    keys: sequence, optional, default=('model', 'fuelType')
+        Kolom kategorikal yang harus sama persis.
+    features: sequence, optional, default=('year', 'mileage', 'engineSize')
+        Kolom numerik untuk jarak Euclidean.
+    scale: dict, optional, default=None
+        Pembagi per fitur. Default standar deviasi fitur di seluruh df (fitur yang tidak disebut juga
+        memakai standar deviasi).
+    columns: list, optional, default=None
+        Kolom yang disimpan untuk hasil. Default keys + features + price (jika ada).
+    leafsize: int, optional, default=32
+        Ukuran daun KD-tree.
+
+    Returns:
+    ListingIndex
+    """
+    keys, features = list(keys), list(features)
+    if columns is None:
+        columns = keys + features + (['price'] if 'price' in df.columns and 'price' not in features else [])
+    columns = list(dict.fromkeys(keys + features + list(columns)))
+
+    # Baris dengan kunci kosong atau fitur tidak finite tidak bisa dicari
+    valid = (df[keys].notna().all(axis=1).to_numpy()
+             & np.isfinite(df[features].to_numpy(dtype=np.float64)).all(axis=1))
+    base = df.loc[valid, columns]
+
+    scale = dict(scale or {})
+    for col in features:
+        if col not in scale:
+            std = float(base[col].astype(np.float64).std())
+            scale[col] = std if std > 0 else 1.0
+
+    # Partisi sekali: urutkan baris per partisi, setiap partisi menjadi slice [start, stop)
+    grouped = base.groupby(keys, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    sizes = grouped.size()
+    partitions = sizes.index
+    if isinstance(partitions, pd.MultiIndex):
+        partitions = pd.MultiIndex.from_arrays([partitions.get_level_values(i).astype(object)
+                                                for i in range(partitions.nlevels)], names=partitions.names)
+    else:
+        partitions = partitions.astype(object)
+    order = np.argsort(codes, kind='stable')
+    base = base.iloc[order]
+    counts = sizes.to_numpy()
+    stops = np.cumsum(counts)
+    starts = stops - counts
+
+    index = ListingIndex(keys=keys, features=features, scale=scale, partitions=partitions,
+                         starts=starts, stops=stops, trees=[], data=base)
+    points = index._scaled(base)
+    index.trees = [cKDTree(points[start:stop], leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+                   for start, stop in zip(starts, stops)]
+    return index
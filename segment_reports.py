@@ -0,0 +1,333 @@
+import hashlib
+import html
+import json
+import os
+import re
+import time
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import eda_package as ep
+
+
+# Laporan EDA per segmen (mis. model x fuelType) sebagai task graph: statistik (CPU-bound) dan render
+# figure berjalan di process pool dengan backend Agg, jumlah task yang berjalan dibatasi, lalu setiap
+# laporan ditulis ke HTML dan JSON segera setelah semua task segmennya selesai.
+DEFAULT_SEGMENT_KEYS = ('model', 'fuelType')
+DEFAULT_ANALYSES = ('describe', 'outliers', 'correlation', 'figures')
+
+
+@dataclass
+class Task:
+    """
+    Satu node task graph: func(*args, **hasil_dependensi) dijalankan di worker.
+    """
+    name: str
+    func: object
+    args: tuple = ()
+    deps: list = field(default_factory=list)
+    # True untuk task ringan yang dijalankan di proses utama (mis. menulis laporan)
+    local: bool = False
+
+
+@dataclass
+class ReportRun:
+    segments: pd.DataFrame
+    reports: dict
+    failures: dict
+    seconds: float
+    out_dir: str
+
+
+def _worker_init():
+    # Worker: tanpa display / plt.show, backend non-interaktif
+    import matplotlib
+    matplotlib.use('Agg')
+    ep.set_headless(True)
+
+
+def run_task_graph(tasks, n_jobs=None, max_pending=None):
+    """
+    Menjalankan task graph di process pool. Task baru disubmit begitu semua dependensinya selesai,
+    dengan paling banyak max_pending task berjalan/antre sekaligus (membatasi memori data segmen).
+
+    Parameters:
+    tasks: list of Task
+        Node graph; nama harus unik dan dependensi harus merujuk ke task lain di list.
+    n_jobs: int or None, optional, default=None
+        Jumlah proses worker (None = os.cpu_count()). 1 menjalankan semuanya di proses ini.
+    max_pending: int or None, optional, default=None
+        Batas task yang disubmit tapi belum selesai. Default 2 * n_jobs.
+
+    Returns:
+    (results, failures): dict nama task -> hasil, dan dict nama task -> pesan error. Task yang
+    dependensinya gagal ikut masuk failures tanpa dijalankan.
+    """
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("Nama task harus unik.")
+    missing = {dep for task in tasks for dep in task.deps if dep not in by_name}
+    if missing:
+        raise ValueError(f"Dependensi tidak dikenal: {sorted(missing)}")
+
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    max_pending = 2 * n_jobs if max_pending is None else max_pending
+    waiting = {task.name: set(task.deps) for task in tasks}
+    dependents = {}
+    for task in tasks:
+        for dep in task.deps:
+            dependents.setdefault(dep, []).append(task.name)
+    ready = [task.name for task in tasks if not task.deps]
+    results, failures = {}, {}
+
+    def finish(name, value=None, error=None):
+        # Catat hasil dan lepaskan task yang menunggu task ini
+        if error is None:
+            results[name] = value
+        else:
+            failures[name] = error
+        for child in dependents.get(name, []):
+            waiting[child].discard(name)
+            if error is not None:
+                failures.setdefault(child, f"dependency '{name}' failed")
+            if not waiting[child] and child not in failures:
+                ready.append(child)
+            elif not waiting[child]:
+                finish_skipped(child)
+
+    def finish_skipped(name):
+        for child in dependents.get(name, []):
+            waiting[child].discard(name)
+            failures.setdefault(child, f"dependency '{name}' failed")
+            if not waiting[child]:
+                finish_skipped(child)
+
+    def call(task):
+        return task.func(*task.args, **{dep: results[dep] for dep in task.deps})
+
+    if n_jobs == 1:
+        while ready:
+            task = by_name[ready.pop(0)]
+            try:
+                value = call(task)
+            except Exception as exc:  # dicatat, task lain tetap jalan
+                finish(task.name, error=f'{type(exc).__name__}: {exc}')
+            else:
+                finish(task.name, value)
+        return results, failures
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_worker_init) as pool:
+        pending = {}
+        while ready or pending:
+            while ready and (len(pending) < max_pending or by_name[ready[0]].local):
+                task = by_name[ready.pop(0)]
+                if task.local:
+                    try:
+                        value = call(task)
+                    except Exception as exc:
+                        finish(task.name, error=f'{type(exc).__name__}: {exc}')
+                    else:
+                        finish(task.name, value)
+                    continue
+                future = pool.submit(task.func, *task.args, **{dep: results[dep] for dep in task.deps})
+                pending[future] = task.name
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception as exc:
+                    finish(name, error=f'{type(exc).__name__}: {exc}')
+                else:
+                    finish(name, value)
+    return results, failures
+
+
+# -- analisis per segmen (dijalankan di worker) ---------------------------------------------------
+def _describe(frame):
+    return ep.descriptive_statistics(frame, headless=True)
+
+
+def _outliers(frame):
+    return ep.check_outlier(frame.select_dtypes(include='number'), plot=False, headless=True)
+
+
+def _correlation(frame):
+    return ep.correlation_analysis(frame, headless=True)
+
+
+def _figures(frame, fig_dir, slug, x_col, numeric, categorical):
+    # Figure dari agregat (jalur pre-aggregated) langsung ke file
+    figures = {f'{slug}_distributions': ep.distribution_aggregates(frame, numeric, plot_type='numeric', kde=True)}
+    if categorical:
+        figures[f'{slug}_categories'] = ep.distribution_aggregates(frame, categorical, plot_type='categorical')
+    if x_col in frame.columns:
+        figures[f'{slug}_{x_col}'] = [agg for col in numeric if col != x_col
+                                      for agg in _mean_by_x(frame, x_col, col)]
+    return ep.render_plot_files(figures, fig_dir, n_jobs=1, n_cols=3, panel_size=(5, 3.5))
+
+
+def _mean_by_x(frame, x_col, col):
+    # Mean + CI kolom numerik per nilai x (mis. price per year) dalam format PlotAggregate 'line'
+    grouped = frame.groupby(x_col, sort=True, observed=True)[col].agg(['mean', 'std', 'count'])
+    half = 1.96 * grouped['std'].fillna(0) / np.sqrt(grouped['count'])
+    table = pd.DataFrame({'group': col, 'x': grouped.index.to_numpy(), 'mean': grouped['mean'].to_numpy(),
+                          'lower': (grouped['mean'] - half).to_numpy(), 'upper': (grouped['mean'] + half).to_numpy(),
+                          'count': grouped['count'].to_numpy()})
+    return [ep.PlotAggregate(kind='line', table=table, n_rows=len(frame), title=f'Mean {col} per {x_col}',
+                             xlabel=x_col, ylabel=col, legend=False)]
+
+
+# -- penulisan laporan (proses utama) -------------------------------------------------------------
+def _table_json(table):
+    return json.loads(table.to_json(orient='split', default_handler=str))
+
+
+def _write_report(out_dir, slug, segment, n_rows, **parts):
+    report = {'segment': segment, 'n_rows': n_rows}
+    sections = []
+    if 'describe' in parts:
+        report['describe'] = _table_json(parts['describe'])
+        sections.append(('Descriptive statistics', parts['describe'].round(3).to_html()))
+    if 'outliers' in parts:
+        report['outliers'] = _table_json(parts['outliers'])
+        sections.append(('Outliers', parts['outliers'].round(3).to_html(index=False)))
+    if 'correlation' in parts:
+        corr = parts['correlation']
+        report['correlation'] = {'normal_cols': corr.normal_cols, 'skewed_cols': corr.skewed_cols,
+                                 'object_cols': corr.object_cols}
+        for method in ('pearson', 'spearman', 'kendall'):
+            matrix = getattr(corr, method)
+            if matrix is not None:
+                report['correlation'][method] = _table_json(matrix)
+                report['correlation'][f'{method}_pvalues'] = _table_json(getattr(corr, f'{method}_pvalues'))
+                sections.append((f'Correlation ({method})', matrix.round(3).to_html()))
+    if 'figures' in parts:
+        report['figures'] = [os.path.relpath(path, out_dir) for path in parts['figures']]
+        sections.append(('Figures', ''.join(f'<img src="{html.escape(path)}" style="max-width:100%"><br>'
+                                            for path in report['figures'])))
+
+    title = ' / '.join(f'{key}={value}' for key, value in segment.items())
+    body = ''.join(f'<h2>{html.escape(name)}</h2>{content}' for name, content in sections)
+    with open(os.path.join(out_dir, f'{slug}.json'), 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    with open(os.path.join(out_dir, f'{slug}.html'), 'w') as f:
+        f.write(f'<html><head><meta charset="utf-8"><title>{html.escape(title)}</title></head><body>'
+                f'<h1>{html.escape(title)}</h1><p>{n_rows:,} listings</p>{body}</body></html>')
+    # Path relatif terhadap out_dir, sehingga folder laporan bisa dipindahkan utuh
+    return f'{slug}.html'
+
+
+def _slug(values, used=None):
+    # Nama file segmen; jika sudah dipakai segmen lain (mis. '1 Series' dan '1_Series') diberi suffix hash key
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', '_'.join(str(value).strip() for value in values)).strip('_') or 'segment'
+    if used is None:
+        return slug
+    base, salt = slug, 0
+    while slug in used:
+        digest = hashlib.sha1(repr((tuple(str(value) for value in values), salt)).encode()).hexdigest()[:8]
+        slug, salt = f'{base}_{digest}', salt + 1
+    used.add(slug)
+    return slug
+
+
+def generate_reports(df, out_dir, by=DEFAULT_SEGMENT_KEYS, analyses=DEFAULT_ANALYSES, n_jobs=None,
+                     max_pending=None, min_rows=10, x_col='year', numeric=None, categorical=None):
+    """
+    Membuat satu laporan EDA (HTML + JSON) per segmen secara paralel.
+
+    Data dipartisi sekali per segmen. Untuk setiap segmen dibuat task describe, outliers, correlation
+    dan figures (render ke PNG dengan Agg di worker), plus task report yang menunggu semuanya dan
+    menulis laporan. Task dijadwalkan lewat run_task_graph, sehingga waktu total turun sebanding
+    jumlah core.
+
+    Parameters:
+    df: DataFrame
+        Data listing.
+    out_dir: str
+        Folder output; figure masuk ke out_dir/figures.
+    by: sequence, optional, default=('model', 'fuelType')
+        Kolom segmen.
+    analyses: sequence, optional, default=DEFAULT_ANALYSES
+        Subset dari 'describe', 'outliers', 'correlation', 'figures'.
+    n_jobs: int or None, optional, default=None
+        Jumlah proses worker (None = semua core, 1 = serial di proses ini).
+    max_pending: int or None, optional, default=None
+        Batas task yang sedang berjalan/antre (default 2 * n_jobs).
+    min_rows: int, optional, default=10
+        Segmen dengan listing lebih sedikit dilewati.
+    x_col: str, optional, default='year'
+        Sumbu x untuk plot mean per x.
+    numeric, categorical: list, optional
+        Kolom untuk figure distribusi. Default kolom numerik / kategorikal di luar `by`.
+
+    Returns:
+    ReportRun dengan tabel segmen (termasuk path laporan relatif terhadap out_dir), reports,
+    failures dan durasi.
+    """
+    unknown = set(analyses) - set(DEFAULT_ANALYSES)
+    if unknown:
+        raise ValueError(f"Analisis tidak dikenal: {sorted(unknown)}")
+    by = list(by)
+    fig_dir = os.path.join(out_dir, 'figures')
+    os.makedirs(fig_dir, exist_ok=True)
+    if numeric is None:
+        numeric = [col for col in df.select_dtypes(include='number').columns if col not in by]
+    if categorical is None:
+        categorical = [col for col in df.select_dtypes(include=['object', 'category', 'string']).columns
+                       if col not in by]
+
+    start = time.perf_counter()
+    functions = {'describe': (_describe, ()), 'outliers': (_outliers, ()), 'correlation': (_correlation, ())}
+    tasks, segments, used = [], [], set()
+    for key, frame in df.groupby(by, sort=True, observed=True):
+        if len(frame) < min_rows:
+            continue
+        key = key if isinstance(key, tuple) else (key,)
+        slug = _slug(key, used)
+        segment = dict(zip(by, [str(value).strip() for value in key]))
+        deps = []
+        for name in analyses:
+            task_name = f'{slug}:{name}'
+            if name == 'figures':
+                tasks.append(Task(task_name, _figures, (frame, fig_dir, slug, x_col, numeric, categorical)))
+            else:
+                func, extra = functions[name]
+                tasks.append(Task(task_name, func, (frame,) + extra))
+            deps.append(task_name)
+        tasks.append(Task(f'{slug}:report', _report_task(deps), (out_dir, slug, segment, len(frame)),
+                          deps=deps, local=True))
+        segments.append({**segment, 'n_rows': len(frame), 'slug': slug})
+
+    results, failures = run_task_graph(tasks, n_jobs=n_jobs, max_pending=max_pending)
+
+    table = pd.DataFrame(segments)
+    table['report'] = [results.get(f'{slug}:report') for slug in table['slug']] if len(table) else []
+    reports = {slug: path for slug, path in zip(table.get('slug', []), table.get('report', [])) if path}
+    _write_index(out_dir, table, failures)
+    return ReportRun(segments=table, reports=reports, failures=failures,
+                     seconds=time.perf_counter() - start, out_dir=out_dir)
+
+
+def _report_task(deps):
+    # Task report menerima hasil dependensi dengan nama '<slug>:<analisis>' -> kwargs '<analisis>'
+    def write(out_dir, slug, segment, n_rows, **results):
+        parts = {name.split(':', 1)[1]: value for name, value in results.items() if name in deps}
+        return _write_report(out_dir, slug, segment, n_rows, **parts)
+    return write
+
+
+def _write_index(out_dir, table, failures):
+    with open(os.path.join(out_dir, 'index.json'), 'w') as f:
+        json.dump({'segments': table.to_dict(orient='records'), 'failures': failures}, f, indent=2, default=str)
+    rows = ''.join(
+        f'<tr><td><a href="{html.escape(row.report)}">{html.escape(row.slug)}</a></td>'
+        f'<td>{row.n_rows:,}</td></tr>' for row in table.itertuples() if row.report)
+    with open(os.path.join(out_dir, 'index.html'), 'w') as f:
+        f.write(f'<html><head><meta charset="utf-8"><title>Segment reports</title></head><body>'
+                f'<h1>Segment reports</h1><table><tr><th>segment</th><th>listings</th></tr>{rows}</table>'
+                f'<p>{len(failures)} failed tasks</p></body></html>')
@@ -0,0 +1,28 @@
+import os
+
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BMW_CSV = os.path.join(ROOT, 'bmw.csv')
+
+
+@pytest.fixture(autouse=True)
+def _headless():
+    # Tanpa figure / print selama test
+    previous = ep.HEADLESS
+    ep.set_headless(True)
+    yield
+    ep.set_headless(previous)
+
+
+@pytest.fixture(scope='session')
+def bmw_raw():
+    return pd.read_csv(BMW_CSV, skipinitialspace=True)
+
+
+@pytest.fixture(scope='session')
+def bmw():
+    return ep.load_listing(BMW_CSV, headless=True)
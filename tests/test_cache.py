@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture
+def cache():
+    cache = ep.enable_cache(maxsize=4)
+    yield cache
+    ep.disable_cache()
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    return bmw_raw.head(2000).copy()
+
+
+def test_hit_returns_equal_result(cache, listing):
+    first = ep.data_explore(listing)
+    second = ep.data_explore(listing)
+    assert ep.cache_stats()['misses'] == 1 and ep.cache_stats()['hits'] == 1
+    pd.testing.assert_frame_equal(first.summary, second.summary)
+    # Hasil dari cache adalah salinan: mengubahnya tidak merusak entry
+    second.summary.loc[0, 'Column'] = 'rusak'
+    assert ep.data_explore(listing).summary.loc[0, 'Column'] == first.summary.loc[0, 'Column']
+
+
+def test_in_place_change_misses(cache, listing):
+    before = ep.check_outlier(listing[['price', 'mileage']], plot=False)
+    listing.loc[listing.index[0], 'price'] = 10 ** 7
+    after = ep.check_outlier(listing[['price', 'mileage']], plot=False)
+    assert cache.stats()['hits'] == 0 and cache.stats()['misses'] == 2
+    assert not before.equals(after)
+
+
+def test_arguments_are_part_of_the_key(cache, listing):
+    ep.correlation_analysis(listing, nilai_skew=0.5)
+    ep.correlation_analysis(listing, nilai_skew=5.0)
+    assert cache.stats()['misses'] == 2
+
+
+def test_invalidate_one_frame(cache, listing, bmw_raw):
+    other = bmw_raw.tail(500)
+    ep.data_explore(listing)
+    ep.data_explore(other)
+    assert ep.invalidate_cache(listing) == 1
+    ep.data_explore(other)
+    ep.data_explore(listing)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 3
+
+
+def test_lru_eviction(cache, bmw_raw):
+    frames = [bmw_raw.iloc[i * 100:(i + 1) * 100] for i in range(5)]
+    for frame in frames:
+        ep.data_explore(frame)
+    assert cache.stats()['size'] == 4 and cache.stats()['evictions'] == 1
+    ep.data_explore(frames[0])
+    assert cache.stats()['misses'] == 6
+
+
+def test_disk_cache_survives_new_session(tmp_path, listing):
+    ep.enable_cache(cache_dir=str(tmp_path))
+    expected = ep.data_explore(listing)
+    cache = ep.enable_cache(cache_dir=str(tmp_path))
+    try:
+        result = ep.data_explore(listing)
+        assert cache.stats()['disk_hits'] == 1
+        pd.testing.assert_frame_equal(result.summary, expected.summary)
+        assert ep.invalidate_cache() == 2
+        assert not list(tmp_path.iterdir())
+    finally:
+        ep.disable_cache()
+
+
+def test_disabled_cache_is_silent(listing):
+    assert ep.cache_stats() is None
+    assert ep.invalidate_cache() == 0
+    assert ep.data_explore(listing) is not None
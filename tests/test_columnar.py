@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import eda_package as ep
+from tests.conftest import BMW_CSV
+
+pytest.importorskip('pyarrow')
+
+
+def test_round_trip_without_partitions_equals_load_listing(tmp_path, bmw):
+    # Beberapa chunk (beberapa file) tanpa partisi: urutan baris ikut CSV
+    ep.convert_listing(BMW_CSV, str(tmp_path / 'listing'), chunksize=3000, partition_cols=[])
+    pd.testing.assert_frame_equal(ep.load_listing_columnar(str(tmp_path / 'listing')), bmw)
+
+
+def test_round_trip_partitioned_equals_load_listing(tmp_path, bmw):
+    assert ep.convert_listing(BMW_CSV, str(tmp_path / 'listing')) == len(bmw)
+    result = ep.load_listing_columnar(str(tmp_path / 'listing'))
+    pd.testing.assert_series_equal(result.dtypes, bmw.dtypes)
+    columns = list(bmw.columns)
+    pd.testing.assert_frame_equal(result.sort_values(columns, kind='stable').reset_index(drop=True),
+                                  bmw.sort_values(columns, kind='stable').reset_index(drop=True))
+
+
+def test_filters_prune_partitions(tmp_path, bmw):
+    ep.convert_listing(BMW_CSV, str(tmp_path / 'listing'))
+    result = ep.load_listing_columnar(str(tmp_path / 'listing'), columns=['price', 'fuelType', 'year'],
+                                      filters=[('fuelType', 'in', ['Hybrid']), ('year', '>=', 2017)])
+    expected = bmw.loc[(bmw['fuelType'] == 'Hybrid') & (bmw['year'] >= 2017), 'price']
+    assert sorted(result['price']) == sorted(expected)
+    assert str(result['year'].dtype) == ep.LISTING_DTYPES['year']
+
+
+@pytest.mark.parametrize('partition_cols', [[], None])
+def test_round_trip_with_missing_values(tmp_path, partition_cols):
+    with open(BMW_CSV) as f:
+        text = f.read().rstrip('\n')
+    csv_path = tmp_path / 'gaps.csv'
+    csv_path.write_text(text + '\n2 Series,2018,,Manual,1000,Petrol,145,50.0,1.5\n3 Series,,12000,Manual,,,,60.0,2.0\n')
+    ep.convert_listing(str(csv_path), str(tmp_path / 'listing'), chunksize=3000, partition_cols=partition_cols)
+    result = ep.load_listing_columnar(str(tmp_path / 'listing'))
+    expected = ep.load_listing(str(csv_path), headless=True)
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(result.sort_values(columns, kind='stable').reset_index(drop=True),
+                                  expected.sort_values(columns, kind='stable').reset_index(drop=True))
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+from tests.conftest import BMW_CSV, ROOT
+
+
+def test_compact_listing_categorizes_string_columns(bmw_raw):
+    compact = ep.compact_listing(bmw_raw, headless=True)
+    for col in ('model', 'transmission', 'fuelType'):
+        assert isinstance(compact[col].dtype, pd.CategoricalDtype)
+        assert not compact[col].cat.categories.str.startswith(' ').any()
+    assert compact.memory_usage(deep=True).sum() * 3 < bmw_raw.memory_usage(deep=True).sum()
+    for col in bmw_raw.columns:
+        expected = bmw_raw[col].str.strip() if col in ('model', 'transmission', 'fuelType') else bmw_raw[col]
+        if pd.api.types.is_float_dtype(expected):
+            # Downcast ke float32: sama sampai presisi float32
+            assert np.allclose(compact[col].to_numpy(np.float64), expected.to_numpy(), rtol=1e-6), col
+        else:
+            assert (compact[col].astype(expected.dtype).to_numpy() == expected.to_numpy()).all(), col
+
+
+def test_load_listing_uses_listing_dtypes(bmw_raw):
+    df = ep.load_listing(BMW_CSV, headless=True)
+    assert list(df.columns) == ep.LISTING_COLUMNS
+    for col, dtype in ep.LISTING_DTYPES.items():
+        assert str(df[col].dtype) == dtype, col
+    assert (df['model'].astype(str) == bmw_raw['model'].str.strip()).all()
+    assert (df['price'].to_numpy() == bmw_raw['price'].to_numpy()).all()
+
+
+def test_benchmark_frames_use_listing_dtypes():
+    # bench_suite menjanjikan frame dengan LISTING_DTYPES; baseline bergantung pada itu
+    sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+    try:
+        import bench_suite
+    finally:
+        sys.path.pop(0)
+    df = bench_suite.synthetic_listing(1000, BMW_CSV)
+    for col, dtype in ep.LISTING_DTYPES.items():
+        assert str(df[col].dtype) == dtype, col
+
+
+@pytest.fixture
+def csv_with_gaps(tmp_path):
+    # Baris dengan price kosong dan baris dengan year/mileage/tax/fuelType kosong
+    with open(BMW_CSV) as f:
+        text = f.read().rstrip('\n')
+    path = tmp_path / 'gaps.csv'
+    path.write_text(text + '\n2 Series,2018,,Manual,1000,Petrol,145,50.0,1.5'
+                           '\n3 Series,,12000,Manual,,,,60.0,2.0\n')
+    return str(path)
+
+
+def test_load_listing_keeps_rows_with_missing_numbers(csv_with_gaps, bmw_raw):
+    df = ep.load_listing(csv_with_gaps, headless=True)
+    assert len(df) == len(bmw_raw) + 2
+    for col in ('year', 'price', 'mileage', 'tax'):
+        assert df[col].dtype == np.float64 and df[col].isna().sum() == 1
+    np.testing.assert_array_equal(df['price'].to_numpy()[:len(bmw_raw)], bmw_raw['price'].to_numpy())
+    assert str(df['engineSize'].dtype) == 'float32'
+
+
+def test_listing_chunks_downcast_per_chunk(csv_with_gaps, bmw_raw):
+    chunks = list(ep.read_listing_chunks(csv_with_gaps, chunksize=5000))
+    assert sum(len(chunk) for chunk in chunks) == len(bmw_raw) + 2
+    assert [str(chunk['price'].dtype) for chunk in chunks] == ['int32', 'int32', 'float64']
+    assert ep.stream_statistics(iter(chunks)).describe().loc['price', 'count'] == len(bmw_raw) + 1
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+def _loop_reference(df, confidence=0.95, min_count=3):
+    # Referensi per grup dengan loop Python: t-interval scipy dan aturan min_count per fuelType
+    rows = {}
+    for (fuel, model, year), group in df.groupby(['fuelType', 'model', 'year'], observed=True):
+        values = group['price'].to_numpy(dtype=np.float64)
+        if len(values) < ep.MIN_COUNT_BY_FUEL.get(fuel, min_count):
+            continue
+        if len(values) > 1:
+            lower, upper = stats.t.interval(confidence, len(values) - 1, loc=values.mean(), scale=stats.sem(values))
+        else:
+            lower = upper = np.nan
+        rows[(fuel, model, year)] = (len(values), values.mean(), lower, upper)
+    return rows
+
+
+def test_t_intervals_match_loop(bmw_raw):
+    result = ep.segment_confidence_intervals(bmw_raw, n_boot=0, top_n=None)
+    expected = _loop_reference(bmw_raw)
+    assert len(result) == len(expected)
+    for row in result.itertuples(index=False):
+        count, mean, lower, upper = expected[(row.fuelType, row.model, row.year)]
+        assert row.count == count
+        np.testing.assert_allclose([row.mean, row.t_lower, row.t_upper], [mean, lower, upper], rtol=1e-10)
+    assert result['boot_lower'].isna().all()
+
+
+def test_ranking_is_top_mean_per_fuel(bmw_raw):
+    result = ep.segment_confidence_intervals(bmw_raw, n_boot=0, top_n=3)
+    reference = _loop_reference(bmw_raw)
+    for fuel, group in result.groupby('fuelType', observed=True):
+        assert group['rank'].tolist() == list(range(1, len(group) + 1))
+        assert group['mean'].is_monotonic_decreasing
+        best = sorted((value[1] for key, value in reference.items() if key[0] == fuel), reverse=True)[:3]
+        np.testing.assert_allclose(group['mean'].to_numpy(), best)
+
+
+def test_bootstrap_means_match_loop_with_same_draws():
+    rng = np.random.default_rng(0)
+    counts = np.array([5, 1, 12, 3])
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    values = rng.normal(size=counts.sum())
+    n_boot = 7
+    # chunk_size kecil: beberapa chunk harus memberi hasil yang sama dengan satu chunk
+    result = ep._bootstrap_means(values, starts, counts, n_boot, np.random.default_rng(1), chunk_size=40)
+    draws = np.random.default_rng(1).random((n_boot, counts.sum()))
+    expected = np.empty((n_boot, len(counts)))
+    for r in range(n_boot):
+        for g, (start, count) in enumerate(zip(starts, counts)):
+            picks = (draws[r, start:start + count] * count).astype(np.int64)
+            expected[r, g] = values[start + picks].mean()
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+def test_bootstrap_interval_close_to_t_interval(bmw_raw):
+    result = ep.segment_confidence_intervals(bmw_raw, n_boot=2000, top_n=None)
+    large = result[result['count'] >= 100]
+    assert len(large) > 0
+    width = large['t_upper'] - large['t_lower']
+    np.testing.assert_allclose(large['boot_lower'], large['t_lower'], atol=0, rtol=0.02)
+    assert ((large['boot_upper'] - large['boot_lower']) / width).between(0.85, 1.15).all()
+    assert (large['boot_lower'] < large['mean']).all() and (large['mean'] < large['boot_upper']).all()
+    # Seed tetap: hasil dapat direproduksi
+    again = ep.segment_confidence_intervals(bmw_raw, n_boot=2000, top_n=None)
+    np.testing.assert_array_equal(result['boot_lower'].to_numpy(), again['boot_lower'].to_numpy())
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+@pytest.fixture(params=['raw', 'compact'])
+def listing(request, bmw_raw, bmw):
+    df = (bmw_raw if request.param == 'raw' else bmw).copy()
+    df.loc[df.index[::50], 'transmission'] = np.nan
+    return df
+
+
+def _crosstab(df, target, feature):
+    return pd.crosstab(ep._observed(df[target]), ep._observed(df[feature]))
+
+
+@pytest.mark.parametrize('target, feature', [('fuelType', 'transmission'), ('transmission', 'model')])
+def test_chi_square_analysis_matches_crosstab(listing, target, feature):
+    result = ep.chi_square_analysis(listing, target, feature)
+    expected_table = _crosstab(listing, target, feature)
+    expected = stats.chi2_contingency(expected_table)
+    np.testing.assert_array_equal(result.details['observed'].to_numpy(), expected_table.to_numpy())
+    assert list(result.details['observed'].index) == list(expected_table.index)
+    assert list(result.details['observed'].columns) == list(expected_table.columns)
+    np.testing.assert_allclose([result.statistic, result.p_value], expected[:2], rtol=1e-10)
+    assert result.details['dof'] == expected[2]
+
+
+def test_contingency_tests_match_scipy(listing):
+    result = ep.contingency_tests(listing, 'fuelType', ['transmission', 'model']).table.set_index('Feature')
+    for feature in ['transmission', 'model']:
+        chi2, pval, dof, _ = stats.chi2_contingency(_crosstab(listing, feature, 'fuelType'))
+        np.testing.assert_allclose(result.loc[feature, ['Chi2', 'p_value']].to_numpy(dtype=float),
+                                   [chi2, pval], rtol=1e-10)
+        assert result.loc[feature, 'dof'] == dof
@@ -0,0 +1,47 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+import eda_package as ep
+
+
+def test_correlation_pvalues_match_scipy(bmw_raw):
+    df = bmw_raw[['price', 'mileage', 'mpg', 'engineSize']].copy()
+    df.loc[df.index[::7], 'mpg'] = np.nan
+    for method, scipy_test in [('pearson', stats.pearsonr), ('spearman', stats.spearmanr)]:
+        corr = df.corr(method=method)
+        pval = ep.correlation_pvalues(corr, ep._pairwise_counts(df))
+        for a, b in [('price', 'mileage'), ('price', 'mpg'), ('mpg', 'engineSize')]:
+            pair = df[[a, b]].dropna()
+            expected = scipy_test(pair[a], pair[b])
+            np.testing.assert_allclose(corr.loc[a, b], expected[0], rtol=1e-9)
+            np.testing.assert_allclose(pval.loc[a, b], expected[1], rtol=1e-6, atol=1e-300)
+
+
+def test_correlation_pvalues_accepts_arrays():
+    r = np.array([[1.0, 0.3], [0.3, 1.0]])
+    pval = ep.correlation_pvalues(r, 50)
+    assert isinstance(pval, np.ndarray)
+    np.testing.assert_allclose(pval[0, 1], stats.pearsonr(*_sample_with_r(0.3, 50))[1], rtol=1e-6)
+
+
+def _sample_with_r(r, n):
+    # Dua kolom dengan korelasi sampel tepat r
+    rng = np.random.default_rng(0)
+    x, z = rng.normal(size=(2, n))
+    x = (x - x.mean()) / x.std()
+    z = z - z.mean() - (z @ x) / n * x
+    z /= z.std()
+    return x, r * x + np.sqrt(1 - r ** 2) * z
+
+
+def test_text_columns_detected_without_deprecation_warning(bmw_raw):
+    # pandas 3 membaca teks sebagai dtype 'str'; select_dtypes tidak boleh lewat fallback 'object'
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result = ep.correlation_analysis(bmw_raw)
+        features = ep.contingency_tests(bmw_raw, 'fuelType').table['Feature'].tolist()
+    assert result.object_cols == ['model', 'transmission', 'fuelType']
+    assert features == ['model', 'transmission']
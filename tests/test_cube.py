@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture(scope='module')
+def listing(bmw_raw):
+    df = bmw_raw.copy()
+    df['kategori_harga'] = pd.cut(df['price'], bins=ep.PRICE_BANDS, labels=ep.PRICE_BAND_LABELS,
+                                  include_lowest=True)
+    return df
+
+
+@pytest.fixture(scope='module')
+def cube(bmw_raw):
+    return ep.SegmentCube.from_frame(bmw_raw)
+
+
+def _groupby(df, by):
+    grouped = df.groupby(by, sort=True, observed=True, dropna=False)
+    expected = grouped.size().rename('count').to_frame()
+    for m in ep.CUBE_MEASURES:
+        stats = grouped[m].agg(['mean', 'std', 'min', 'max'])
+        expected[[f'{m}_{s}' for s in stats.columns]] = stats.to_numpy()
+    return expected.reset_index()
+
+
+def _assert_rollup_equal(result, expected, by):
+    assert list(result.columns) == list(expected.columns)
+    for col in by:
+        assert result[col].astype(object).tolist() == expected[col].astype(object).tolist()
+    np.testing.assert_array_equal(result['count'].to_numpy(), expected['count'].to_numpy())
+    values = [col for col in expected.columns if col not in by and col != 'count']
+    np.testing.assert_allclose(result[values].to_numpy(dtype=np.float64),
+                               expected[values].to_numpy(dtype=np.float64), rtol=1e-7, equal_nan=True)
+
+
+def test_price_band_matches_pd_cut(listing):
+    bands = ep.price_band(listing['price'])
+    assert bands.astype(object).tolist() == listing['kategori_harga'].astype(object).tolist()
+
+
+@pytest.mark.parametrize('by', [['fuelType'], ['kategori_harga', 'model', 'year'], ['transmission', 'year']])
+def test_rollup_matches_groupby(cube, listing, by):
+    _assert_rollup_equal(cube.rollup(by), _groupby(listing, by), by)
+
+
+def test_rollup_where_matches_filtered_groupby(cube, listing):
+    by = ['kategori_harga', 'model', 'year']
+    result = cube.rollup(by, where={'fuelType': 'Diesel'})
+    _assert_rollup_equal(result, _groupby(listing[listing['fuelType'] == 'Diesel'], by), by)
+
+
+def test_batched_update_and_merge_equal_single_build(cube, bmw_raw):
+    half = len(bmw_raw) // 2
+    batched = ep.SegmentCube().update(bmw_raw.iloc[:half // 2]).update(bmw_raw.iloc[half // 2:half])
+    batched.merge(ep.SegmentCube.from_frame(bmw_raw.iloc[half:]))
+    assert batched.n_partitions == 3
+    pd.testing.assert_frame_equal(batched.rollup(['fuelType', 'model']), cube.rollup(['fuelType', 'model']))
+    assert batched.n_rows == len(bmw_raw)
+
+
+def test_constant_segments_have_zero_variance(bmw_raw):
+    # Nilai konstan yang tidak exact di float, tersebar di beberapa sel (model / tahun berbeda):
+    # sumsq - sum * mean hasil roll-up menyisakan galat pembulatan positif
+    df = bmw_raw.head(30).copy()
+    df['fuelType'] = ['Diesel'] * 29 + ['Hybrid']
+    df[ep.CUBE_MEASURES] = 49.6
+    result = ep.SegmentCube.from_frame(df).rollup('fuelType', stats=('var', 'std')).set_index('fuelType')
+    for m in ep.CUBE_MEASURES:
+        assert result.loc['Diesel', f'{m}_var'] == 0 and result.loc['Diesel', f'{m}_std'] == 0
+        # Segmen satu baris: std tidak terdefinisi, sama seperti groupby().std()
+        assert np.isnan(result.loc['Hybrid', f'{m}_var'])
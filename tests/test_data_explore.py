@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture(params=['raw', 'compact'])
+def listing(request, bmw_raw, bmw):
+    df = (bmw_raw if request.param == 'raw' else bmw).copy()
+    df.loc[df.index[::40], 'model'] = np.nan
+    df.loc[df.index[::55], 'mpg'] = np.nan
+    df.loc[df.index[::70], 'tax'] = np.nan
+    # Duplikat, termasuk baris yang mengandung NaN
+    extra = df.iloc[[0, 40, 55, 70, 70]]
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def test_profile_matches_full_explore(listing):
+    full = ep.data_explore(listing).summary.set_index('Column')
+    profile = ep.data_explore(listing, profile=True, top_k=5).summary.set_index('Column')
+    for col in ['Missing Value Count', 'Missing Value Percentage', 'Unique Value Count']:
+        np.testing.assert_allclose(profile[col].to_numpy(dtype=float), full[col].to_numpy(dtype=float))
+    for col in listing.columns:
+        expected = listing[col].value_counts().iloc[:5]
+        assert profile.loc[col, 'Top Unique Items'] == expected.index.tolist(), col
+        np.testing.assert_allclose(profile.loc[col, 'Top Coverage (%)'], expected.sum() / len(listing) * 100)
+
+
+def test_profile_duplicates_match_pandas(listing):
+    profile = ep.data_explore(listing, profile=True).duplicates
+    assert profile.loc[0, 'Count'] == listing.duplicated().sum() == ep.data_explore(listing).duplicates.loc[0, 'Count']
+    assert profile.loc[1, 'Count'] == len(listing)
+
+
+def test_row_hash_ignores_nan_payload_and_signed_zero():
+    df = pd.DataFrame({'x': [0.0, -0.0, np.nan, float('nan') * -1], 'y': pd.array([1, 1, None, None], dtype='Int64')})
+    h = ep._row_hash(df)
+    assert h[0] == h[1] and h[2] == h[3]
+    assert ep._data_explore_profile(df, top_k=3).duplicates.loc[0, 'Count'] == df.duplicated().sum() == 2
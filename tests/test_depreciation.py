@@ -0,0 +1,52 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from depreciation import MILEAGE_UNIT, fit_depreciation
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    df = bmw_raw.copy()
+    df.loc[df.index[::30], 'fuelType'] = np.nan
+    df.loc[df.index[::45], 'model'] = np.nan
+    return df
+
+
+def _ols(frame, reference_year):
+    X = np.column_stack([np.ones(len(frame)), reference_year - frame['year'].to_numpy(dtype=float),
+                         frame['mileage'].to_numpy(dtype=float) / MILEAGE_UNIT])
+    return np.linalg.lstsq(X, np.log(frame['price'].to_numpy(dtype=float)), rcond=None)[0]
+
+
+def test_nan_keys_only_feed_coarser_levels(listing):
+    model = fit_depreciation(listing, prior_strength=0.0)
+    # Level global memakai semua baris, level model hanya baris dengan model diketahui
+    assert model.n[0][0] == len(listing)
+    assert model.n[1].sum() == listing['model'].notna().sum()
+    assert model.n[2].sum() == listing[['model', 'fuelType']].notna().all(axis=1).sum()
+    assert not model.keys[2].isna().any().any()
+
+
+def test_unshrunk_segments_equal_ols(listing):
+    model = fit_depreciation(listing, prior_strength=0.0)
+    np.testing.assert_allclose(model.coef[0][0], _ols(listing, model.reference_year), rtol=1e-8)
+    table = model.coefficients(level=1).set_index('model')
+    for name, frame in listing.dropna(subset=['model']).groupby('model'):
+        if frame['year'].nunique() > 2:
+            np.testing.assert_allclose(table.loc[name, ['intercept', 'age', 'mileage']].to_numpy(dtype=float),
+                                       _ols(frame, model.reference_year), rtol=1e-6, atol=1e-9)
+
+
+def test_small_segments_get_finite_predictions(bmw_raw):
+    # Segmen dengan baris <= jumlah parameter tidak punya derajat bebas untuk varians
+    df = pd.concat([bmw_raw[bmw_raw['model'] == '3 Series'].head(3),
+                    bmw_raw[bmw_raw['model'] == 'i8'].head(3)], ignore_index=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        model = fit_depreciation(df, prior_strength=0.0)
+        prediction = model.predict(df)
+    assert np.isfinite(prediction).all()
+    assert np.isfinite(model.sigma2[-1]).all()
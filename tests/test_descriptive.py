@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+def _expected(frame, columns):
+    grouped = frame.groupby('fuelType')[columns]
+    return {
+        'count': grouped.count(), 'mean': grouped.mean(), 'median': grouped.median(), 'std': grouped.std(),
+        'min': grouped.min(), 'max': grouped.max(), 'skew': grouped.skew(),
+        'q1': grouped.quantile(0.25), 'q3': grouped.quantile(0.75),
+    }
+
+
+@pytest.mark.parametrize('with_nan_key', [False, True])
+def test_descriptive_table_matches_groupby(bmw_raw, with_nan_key):
+    df = bmw_raw.copy()
+    columns = ['price', 'mileage', 'mpg']
+    if with_nan_key:
+        df.loc[df.index[::50], 'fuelType'] = np.nan
+        df.loc[df.index[::70], 'price'] = np.nan
+    table = ep.descriptive_table(df, by='fuelType', columns=columns)
+    for stat, frame in _expected(df, columns).items():
+        for col in columns:
+            got = table.xs(col, level='column')[stat]
+            np.testing.assert_allclose(got.to_numpy(dtype=np.float64),
+                                       frame[col].reindex(got.index).to_numpy(dtype=np.float64),
+                                       rtol=1e-9, err_msg=f'{stat} {col}')
+
+
+def test_descriptive_statistics_by_with_nan_key(bmw_raw):
+    df = bmw_raw.copy()
+    df.loc[df.index[:10], 'fuelType'] = np.nan
+    result = ep.descriptive_statistics(df, by='fuelType', headless=True)
+    assert set(result.index.get_level_values('fuelType')) == set(df['fuelType'].dropna())
@@ -0,0 +1,61 @@
+import collections
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fleet_optimizer as fo
+
+
+def _brute_force_values(df, spec, n_baskets):
+    # Semua basket yang memenuhi kuota dan budget; salinan identik dihitung sebagai satu basket
+    value = fo.expected_residual_value(df).to_numpy()
+    quota_of = {fuel: name for name, (fuels, _) in spec.quotas.items() for fuel in fuels}
+    quota = df['fuelType'].map(quota_of).to_numpy()
+    price = df['price'].to_numpy()
+    size = sum(count for _, count in spec.quotas.values())
+    seen = {}
+    for combo in itertools.combinations(range(len(df)), size):
+        combo = list(combo)
+        if price[combo].sum() > spec.budget:
+            continue
+        counts = collections.Counter(quota[combo])
+        if any(counts.get(name, 0) != count for name, (_, count) in spec.quotas.items()):
+            continue
+        key = tuple(sorted((quota[i], price[i], value[i]) for i in combo))
+        seen[key] = value[combo].sum()
+    return sorted(seen.values(), reverse=True)[:n_baskets]
+
+
+def _random_listing(seed, n=14):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'model': rng.choice(['1 Series', '3 Series', 'X5'], n),
+        'year': rng.choice([2016, 2018], n),
+        'price': rng.choice(np.arange(8_000, 44_000, 3_000), n),
+        'fuelType': rng.choice(['Petrol', 'Diesel', 'Hybrid', 'Electric'], n, p=[0.35, 0.35, 0.15, 0.15]),
+    })
+    # Beberapa listing identik
+    return pd.concat([df, df.iloc[:3]], ignore_index=True)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_brute_force(seed):
+    df = _random_listing(seed)
+    spec = fo.FleetSpec(budget=110_000)
+    expected = _brute_force_values(df, spec, 4)
+    solution = fo.optimize_fleet(df, spec, n_baskets=4)
+    assert np.allclose(solution.summary['total_expected_value'].to_numpy(), expected)
+
+
+def test_identical_listings_fill_a_quota():
+    df = pd.DataFrame({
+        'model': ['3 Series'] * 3 + ['1 Series', 'i3', 'i8'],
+        'year': [2018] * 3 + [2017, 2016, 2016],
+        'price': [10_000] * 3 + [12_000, 20_000, 20_000],
+        'fuelType': ['Diesel'] * 3 + ['Petrol', 'Electric', 'Hybrid'],
+    })
+    solution = fo.optimize_fleet(df, n_baskets=3)
+    assert solution.summary['total_price'].tolist() == [72_000, 70_000]
+    assert (solution.runners_up[0]['fuelType'] == 'Diesel').sum() == 3
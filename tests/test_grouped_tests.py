@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+def _scipy_reference(df, by, test, x, y):
+    # Satu uji scipy per segmen (loop groupby biasa)
+    rows = {}
+    for key, seg in df.dropna(subset=[x, y]).groupby(by):
+        if len(seg) < 3:
+            continue
+        if test == 'spearman':
+            res = stats.spearmanr(seg[x], seg[y])
+        elif test == 't-test':
+            groups = [g[x].to_numpy() for _, g in seg.groupby(y)]
+            if len(groups) != 2 or min(map(len, groups)) < 2:
+                continue
+            res = stats.ttest_ind(*groups, equal_var=False)
+        else:
+            groups = [g[x].to_numpy() for _, g in seg.groupby(y)]
+            if len(groups) < 2 or len(seg) <= len(groups):
+                continue
+            res = stats.f_oneway(*groups)
+        rows[key] = (res[0], res[1])
+    return rows
+
+
+@pytest.mark.parametrize('test,x,y', [('spearman', 'price', 'mileage'),
+                                      ('t-test', 'price', 'fuelType'),
+                                      ('anova', 'price', 'transmission')])
+@pytest.mark.parametrize('with_nan_key', [False, True])
+def test_grouped_tests_match_scipy(bmw_raw, test, x, y, with_nan_key):
+    df = bmw_raw.copy()
+    if with_nan_key:
+        df.loc[df.index[::40], 'model'] = np.nan
+    if test == 't-test':
+        df = df[df['fuelType'].isin(['Petrol', 'Diesel'])]
+    result = ep.grouped_tests(df, 'model', test, x, y, correction=None).set_index('model')
+    expected = _scipy_reference(df, 'model', test, x, y)
+    assert expected
+    assert set(result.index) == set(df['model'].dropna())
+    for key, (statistic, p_value) in expected.items():
+        assert result.loc[key, 'statistic'] == pytest.approx(statistic, nan_ok=True)
+        assert result.loc[key, 'p_value'] == pytest.approx(p_value, nan_ok=True)
+
+
+def test_adjust_pvalues_bonferroni_and_bh():
+    p = np.array([0.01, 0.04, np.nan, 0.03])
+    assert np.allclose(ep.adjust_pvalues(p, 'bonferroni'), [0.03, 0.12, np.nan, 0.09], equal_nan=True)
+    assert np.allclose(ep.adjust_pvalues(p, 'fdr_bh'), [0.03, 0.04, np.nan, 0.04], equal_nan=True)
@@ -0,0 +1,76 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    df = bmw_raw.copy()
+    df['Status'] = (df['price'] > df['price'].median()).astype(int)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def _close_figures():
+    plt.close('all')
+    yield
+    plt.close('all')
+
+
+def _calls(df):
+    return {
+        'data_explore': lambda: ep.data_explore(df),
+        'descriptive_statistics': lambda: ep.descriptive_statistics(df[['price', 'mileage']]),
+        'check_outlier': lambda: ep.check_outlier(df[['price', 'mileage', 'mpg']]),
+        'correlation_analysis': lambda: ep.correlation_analysis(df.drop(columns='Status')),
+        't_test': lambda: ep.t_test_analysis_with_input(df, 'Status', 'mileage'),
+        'anova': lambda: ep.anova_analysis_with_input(df, 'fuelType', 'price'),
+        'chi_square': lambda: ep.chi_square_analysis(df, 'fuelType', 'transmission'),
+        'value_percentage': lambda: ep.calculate_value_percentage(df, 'fuelType'),
+    }
+
+
+@pytest.mark.parametrize('name', list(_calls(pd.DataFrame())))
+def test_headless_returns_results_without_output(listing, capsys, name):
+    result = _calls(listing)[name]()
+    assert result is not None
+    assert capsys.readouterr().out == ''
+    assert plt.get_fignums() == []
+
+
+def test_results_are_structured(listing):
+    explore = ep.data_explore(listing)
+    assert isinstance(explore, ep.DataExploreResult)
+    assert explore.duplicates.loc[0, 'Count'] == listing.duplicated().sum()
+
+    anova = ep.anova_analysis_with_input(listing, 'fuelType', 'price')
+    groups = [group['price'].to_numpy() for _, group in listing.groupby('fuelType')]
+    expected = stats.f_oneway(*groups)
+    assert isinstance(anova, ep.HypothesisTestResult) and anova.test == 'anova'
+    np.testing.assert_allclose([anova.statistic, anova.p_value], [expected.statistic, expected.pvalue])
+    assert anova.significant == (expected.pvalue < anova.alpha)
+
+
+def test_per_call_argument_overrides_global(listing, capsys):
+    ep.set_headless(False)
+    assert ep.data_explore(listing, headless=True) is not None
+    assert capsys.readouterr().out == ''
+
+    ep.descriptive_statistics(listing[['price']])
+    assert 'Descriptive Statistics for column ====> price' in capsys.readouterr().out
+
+    ep.set_headless(True)
+    assert ep.descriptive_statistics(listing[['price']], headless=False) is None
+    assert 'Mean' in capsys.readouterr().out
+
+
+def test_interactive_mode_draws_figures(listing, capsys):
+    ep.chi_square_analysis(listing, 'fuelType', 'transmission', headless=False)
+    assert 'Hasil Uji Chi-Square' in capsys.readouterr().out
+    assert len(plt.get_fignums()) > 0
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    df = bmw_raw.copy()
+    df.loc[df.index[::37], 'fuelType'] = np.nan
+    return df
+
+
+def _state(df, n_batches=3):
+    acc = ep.IncrementalStats(by=['fuelType'], columns=['price', 'mileage'], pairs=[('price', 'mileage')])
+    for bounds in np.array_split(np.arange(len(df)), n_batches):
+        acc.update(df.iloc[bounds])
+    return acc
+
+
+def test_update_with_nan_keys_matches_groupby(listing):
+    acc = _state(listing)
+    table = acc.describe()
+    for col in ('price', 'mileage'):
+        got = table.xs(col, level='column')
+        expected = listing.groupby('fuelType')[col].agg(['count', 'mean', 'std', 'max']).reindex(got.index)
+        for stat in expected.columns:
+            np.testing.assert_allclose(got[stat].to_numpy(np.float64), expected[stat].to_numpy(np.float64),
+                                       err_msg=f'{stat} {col}')
+
+
+def test_retract_restores_previous_state(listing):
+    head, tail = listing.iloc[:6000], listing.iloc[6000:]
+    acc = _state(listing)
+    acc.retract(tail)
+    means = acc.means()['price'].dropna()
+    expected = head.groupby('fuelType')['price'].mean()
+    np.testing.assert_allclose(means.to_numpy(), expected.reindex(means.index.get_level_values(0)).to_numpy())
+    assert len(means) == len(expected)
+
+
+def test_pearson_matches_scipy(listing):
+    result = _state(listing).correlations('pearson').set_index('fuelType')
+    for fuel, seg in listing.dropna(subset=['fuelType']).groupby('fuelType'):
+        if len(seg) < 3:
+            continue
+        ref = stats.pearsonr(seg['price'], seg['mileage'])
+        assert result.loc[fuel, 'r'] == pytest.approx(ref.statistic)
+        assert result.loc[fuel, 'p_value'] == pytest.approx(ref.pvalue, rel=1e-6, abs=1e-300)
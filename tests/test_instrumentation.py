@@ -0,0 +1,90 @@
+import json
+import logging
+
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    return bmw_raw.head(500).copy()
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    yield
+    ep.disable_instrumentation()
+
+
+def test_memory_sink_records_nested_spans(listing):
+    inst = ep.enable_instrumentation()
+    ep.correlation_analysis(listing)
+    summary = inst.sink.summary()
+    assert 'correlation_analysis' in summary.index
+    assert 'correlation_analysis/compute/kendall' in summary.index
+    assert (summary['count'] >= 1).all()
+    depth = {r['span']: r['depth'] for r in inst.sink.records}
+    assert depth['correlation_analysis'] == 0
+    assert depth['correlation_analysis/compute/kendall'] == 2
+    # Span induk mencakup seluruh span anaknya
+    assert summary.loc['correlation_analysis', 'total_s'] >= summary.loc['correlation_analysis/compute', 'total_s']
+
+
+def test_track_memory_adds_peak_column(listing):
+    inst = ep.enable_instrumentation(track_memory=True)
+    ep.correlation_analysis(listing)
+    summary = inst.sink.summary()
+    assert 'peak_mb' in summary.columns
+    assert (summary['peak_mb'] >= 0).all()
+
+
+def test_error_is_recorded():
+    inst = ep.enable_instrumentation()
+    with pytest.raises(RuntimeError):
+        with ep.span('outer'):
+            with ep.span('inner'):
+                raise RuntimeError('gagal')
+    errors = {r['span']: r['error'] for r in inst.sink.records}
+    assert errors == {'outer/inner': 'RuntimeError', 'outer': 'RuntimeError'}
+
+
+def test_logging_sink(caplog):
+    ep.enable_instrumentation(sink='logging')
+    with caplog.at_level(logging.INFO, logger='eda_package'):
+        with ep.span('fase'):
+            pass
+    assert any(r.getMessage().startswith('span fase ') for r in caplog.records)
+
+
+def test_jsonl_sink_appends(tmp_path):
+    path = str(tmp_path / 'spans.jsonl')
+    for _ in range(2):
+        ep.enable_instrumentation(sink=path)
+        with ep.span('fase', rows=10):
+            pass
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [r['span'] for r in records] == ['fase', 'fase']
+    assert records[0]['attrs'] == {'rows': 10}
+
+
+def test_callable_sink_and_invalid_sink():
+    received = []
+    ep.enable_instrumentation(sink=received.append)
+    with ep.span('a'):
+        with ep.span('b'):
+            pass
+    assert [r['span'] for r in received] == ['a/b', 'a']
+    with pytest.raises(ValueError):
+        ep.enable_instrumentation(sink='spans.txt')
+
+
+def test_disabled_span_is_noop(listing):
+    ep.disable_instrumentation()
+    assert ep.span('apa saja') is ep.span('lain')
+    received = []
+    inst = ep.enable_instrumentation(sink=received.append)
+    ep.disable_instrumentation()
+    ep.correlation_analysis(listing)
+    assert received == [] and inst.stack == []
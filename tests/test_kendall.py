@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+def _scipy(x, y):
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return stats.kendalltau(x[valid], y[valid], method='asymptotic')
+
+
+@pytest.fixture(scope='module')
+def pairs():
+    rng = np.random.default_rng(0)
+    n = 3000
+    x_ties = rng.integers(0, 8, n).astype(np.float64)
+    y_ties = np.where(rng.random(n) < 0.6, x_ties, rng.integers(0, 8, n))
+    x_cont = rng.normal(size=n)
+    y_cont = x_cont + rng.normal(size=n)
+    x_nan, y_nan = x_ties.copy(), y_cont.copy()
+    x_nan[::17] = np.nan
+    y_nan[::23] = np.nan
+    return {'ties': (x_ties, y_ties), 'continuous': (x_cont, y_cont), 'nan': (x_nan, y_nan),
+            'ties_vs_continuous': (x_ties, y_cont)}
+
+
+@pytest.mark.parametrize('method', ['table', 'mergesort'])
+@pytest.mark.parametrize('case', ['ties', 'continuous', 'nan', 'ties_vs_continuous'])
+def test_kendall_tau_matches_scipy(pairs, case, method):
+    x, y = pairs[case]
+    tau, pval = ep.kendall_tau(x, y, method=method)
+    expected = _scipy(x, y)
+    np.testing.assert_allclose(tau, expected.statistic, rtol=1e-10)
+    np.testing.assert_allclose(pval, expected.pvalue, rtol=1e-8, atol=1e-300)
+
+
+def test_kendall_correlation_matches_scipy(pairs):
+    df = pd.DataFrame({'a': pairs['nan'][0], 'b': pairs['ties'][1], 'c': pairs['nan'][1]})
+    tau, pval = ep.kendall_correlation(df)
+    for i, j in [('a', 'b'), ('a', 'c'), ('b', 'c')]:
+        expected = _scipy(df[i], df[j])
+        np.testing.assert_allclose(tau.loc[i, j], expected.statistic, rtol=1e-10)
+        np.testing.assert_allclose(pval.loc[j, i], expected.pvalue, rtol=1e-8, atol=1e-300)
+    np.testing.assert_allclose(tau.to_numpy(), df.corr(method='kendall').to_numpy(), rtol=1e-10)
+
+
+def test_constant_column_gives_nan():
+    assert np.isnan(ep.kendall_tau(np.ones(50), np.arange(50))[0])
+
+
+def test_correlation_analysis_encoding_matches_ordinal_encoder(bmw_raw, bmw):
+    # Kode ordinal tanpa sklearn harus sama dengan OrdinalEncoder, untuk kolom str maupun category
+    encoder = pytest.importorskip('sklearn.preprocessing').OrdinalEncoder
+    for df in (bmw_raw.copy(), bmw.copy()):
+        df.loc[df.index[::13], 'model'] = np.nan
+        cols = ['model', 'transmission', 'fuelType']
+        frame = df[cols].astype(object).where(df[cols].notna(), np.nan)
+        expected = encoder().fit_transform(frame)
+        result = np.column_stack([ep._ordinal_codes(df[col]) for col in cols])
+        np.testing.assert_array_equal(result, expected)
+        tau, pval = ep.kendall_correlation(pd.DataFrame(expected, columns=cols))
+        analysis = ep.correlation_analysis(df)
+        pd.testing.assert_frame_equal(analysis.kendall, tau)
+        pd.testing.assert_frame_equal(analysis.kendall_pvalues, pval)
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import ROOT
+
+# pyarrow sendiri sudah di-import oleh pandas; yang ditunda adalah pyarrow.parquet
+HEAVY_MODULES = ('scipy', 'seaborn', 'matplotlib.pyplot', 'sklearn', 'IPython', 'pyarrow.parquet')
+
+
+def _loaded_after(code):
+    script = (
+        'import sys\n'
+        f'{code}\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(filter(None, out.stdout.strip().split(',')))
+
+
+def test_import_does_not_load_heavy_dependencies():
+    assert _loaded_after('import eda_package') == set()
+
+
+def test_light_functions_stay_light():
+    code = (
+        'import pandas as pd, eda_package as ep\n'
+        'df = pd.DataFrame({"a": [1.0, None, 3.0], "b": ["x", "y", None]})\n'
+        'ep.set_headless(True)\n'
+        'ep.persentase_missing_value(df, df, ["a", "b"])\n'
+        'ep.descriptive_statistics(df[["a"]])'
+    )
+    assert _loaded_after(code) == set()
+
+
+@pytest.mark.parametrize('attr, module', [('stats', 'scipy'), ('pq', 'pyarrow.parquet')])
+def test_attribute_access_loads_module(attr, module):
+    code = f'import eda_package as ep\nep.{attr}.__name__'
+    assert module in _loaded_after(code)
+
+
+def test_repr_reports_state():
+    lazy = __import__('eda_package')._LazyModule('json')
+    assert 'not loaded' in repr(lazy)
+    lazy.dumps
+    assert '(loaded)' in repr(lazy)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from listing_index import build_listing_index
+
+
+@pytest.fixture(scope='module')
+def index(bmw_raw):
+    return build_listing_index(bmw_raw)
+
+
+def _brute_force(index, candidates, k):
+    # Jarak ke semua listing pada partisi yang sama, tanpa KD-tree
+    points = index._scaled(index.data)
+    query = index._scaled(candidates)
+    keys = index.data[index.keys].astype(object).to_numpy()
+    result = []
+    for row, key in zip(query, candidates[index.keys].astype(object).to_numpy()):
+        same = np.flatnonzero((keys == key).all(axis=1))
+        dist = np.sqrt(((points[same] - row) ** 2).sum(axis=1))
+        result.append(np.sort(dist)[:k])
+    return np.array(result)
+
+
+def test_query_matches_brute_force(index, bmw_raw):
+    candidates = bmw_raw.sample(200, random_state=0)
+    distances, positions = index.query(candidates, k=5)
+    np.testing.assert_allclose(distances, _brute_force(index, candidates, 5), rtol=1e-10, atol=1e-12)
+    assert (positions >= 0).all()
+
+
+def test_non_finite_candidates_are_masked(index, bmw_raw):
+    candidates = bmw_raw.head(6).copy()
+    candidates.loc[candidates.index[1], 'mileage'] = np.nan
+    candidates.loc[candidates.index[3], 'engineSize'] = np.inf
+    distances, positions = index.query(candidates, k=3)
+    bad = np.array([False, True, False, True, False, False])
+    assert (positions[bad] == -1).all() and np.isinf(distances[bad]).all()
+    assert (positions[~bad] >= 0).all()
+
+
+def test_build_skips_non_finite_rows(bmw_raw):
+    df = bmw_raw.astype({'year': np.float64})
+    df.loc[df.index[:3], 'year'] = np.inf
+    assert build_listing_index(df).n_rows == len(df) - 3
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+def _check_outlier_loop(X_train_num):
+    # Implementasi check_outlier per kolom sebelum engine vectorized (referensi)
+    rows = []
+    for col in X_train_num.columns:
+        skew_val = round(X_train_num[col].skew(), 1)
+        distrib = 'normal' if -0.5 <= skew_val <= 0.5 else 'skewed'
+        if distrib == 'skewed':
+            Q1 = X_train_num[col].quantile(0.25)
+            Q3 = X_train_num[col].quantile(0.75)
+            IQR = Q3 - Q1
+            lower, upper = Q1 - 3 * IQR, Q3 + 3 * IQR
+        else:
+            mean, std = X_train_num[col].mean(), X_train_num[col].std()
+            lower, upper = mean - 3 * std, mean + 3 * std
+        n_upper = (X_train_num[col] > upper).sum()
+        n_lower = (X_train_num[col] < lower).sum()
+        rows.append({
+            'column': col,
+            'Skewness Value': skew_val,
+            'Distribusi': distrib,
+            'lower_boundary': round(lower, 2),
+            'upper_boundary': round(upper, 2),
+            'percentage_total_outlier (%)': (n_upper + n_lower) / len(X_train_num) * 100,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='module')
+def numeric(bmw_raw):
+    num = bmw_raw.select_dtypes(include='number').astype(np.float64)
+    # Sisipkan NaN agar jalur nan-aware ikut teruji
+    num.iloc[::37, 0] = np.nan
+    num.iloc[::53, 2] = np.nan
+    return num
+
+
+def test_matches_loop_reference(numeric):
+    result = ep.check_outlier(numeric, plot=False)
+    pd.testing.assert_frame_equal(result, _check_outlier_loop(numeric), check_dtype=False)
+
+
+def test_matches_loop_reference_without_nan(bmw_raw):
+    num = bmw_raw.select_dtypes(include='number')
+    result = ep.check_outlier(num, plot=False)
+    pd.testing.assert_frame_equal(result, _check_outlier_loop(num), check_dtype=False)
+
+
+def test_row_mask_matches_manual_masks(numeric):
+    result = ep.detect_outliers(numeric)
+    bounds = result.bounds
+    manual = pd.DataFrame({
+        col: (numeric[col] < lo) | (numeric[col] > hi)
+        for col, lo, hi in zip(bounds.columns, bounds.lower, bounds.upper)
+    })
+    pd.testing.assert_frame_equal(result.column_mask, manual)
+    pd.testing.assert_series_equal(result.row_mask, manual.any(axis=1), check_names=False)
+
+
+def test_bounds_apply_to_new_batch(numeric):
+    train, batch = numeric.iloc[:6000], numeric.iloc[6000:]
+    bounds = ep.fit_outlier_bounds(train)
+    result = ep.apply_outlier_bounds(batch, bounds)
+    assert result.row_mask.index.equals(batch.index)
+    expected = (batch[bounds.columns] > bounds.upper).to_numpy() | (batch[bounds.columns] < bounds.lower).to_numpy()
+    np.testing.assert_array_equal(result.column_mask.to_numpy(), expected)
+
+
+def test_stream_bounds_match_in_memory(numeric):
+    # compression > jumlah baris: sketch belum terkompresi sehingga kuantil exact
+    data = numeric.iloc[:1500]
+    chunks = [data.iloc[i:i + 400] for i in range(0, len(data), 400)]
+    streamed = ep.stream_outlier_bounds(iter(chunks), compression=5000)
+    in_memory = ep.fit_outlier_bounds(data)
+    assert streamed.columns == in_memory.columns
+    assert streamed.distribution == in_memory.distribution
+    np.testing.assert_allclose(streamed.lower, in_memory.lower, rtol=1e-9)
+    np.testing.assert_allclose(streamed.upper, in_memory.upper, rtol=1e-9)
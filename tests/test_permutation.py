@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+import eda_package as ep
+
+
+def test_exact_spearman_matches_scipy():
+    x = np.array([1.0, 2, 3, 4, 5, 6])
+    y = np.array([2.0, 1, 4, 3, 6, 5])
+    res = ep.permutation_test('spearman', x, y)
+    expected = stats.permutation_test((y,), lambda v: stats.spearmanr(x, v).statistic,
+                                      permutation_type='pairings')
+    assert res.exact and res.n_permutations == 720
+    assert res.statistic == pytest.approx(stats.spearmanr(x, y).statistic)
+    assert res.p_value == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize('test', ['t-test', 'anova'])
+def test_exact_group_tests_match_scipy(test):
+    rng = np.random.default_rng(1)
+    n_groups = 2 if test == 't-test' else 3
+    labels = np.repeat(np.arange(n_groups), 4 if test == 't-test' else 3)
+    a = rng.normal(size=len(labels)) + labels
+    groups = [a[labels == g] for g in range(n_groups)]
+    if test == 't-test':
+        statistic = lambda *s, axis: stats.ttest_ind(*s, equal_var=False, axis=axis).statistic
+        observed = stats.ttest_ind(*groups, equal_var=False).statistic
+    else:
+        statistic = lambda *s, axis: stats.f_oneway(*s, axis=axis).statistic
+        observed = stats.f_oneway(*groups).statistic
+    alternative = 'two-sided' if test == 't-test' else 'greater'
+    expected = stats.permutation_test(groups, statistic, permutation_type='independent',
+                                      alternative=alternative, n_resamples=np.inf)
+    res = ep.permutation_test(test, a, labels)
+    assert res.exact
+    assert res.statistic == pytest.approx(observed)
+    assert res.p_value == pytest.approx(expected.pvalue)
+
+
+def test_random_permutations_close_to_asymptotic():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=60)
+    y = x + rng.normal(size=60) * 3
+    res = ep.permutation_test('spearman', x, y, n_permutations=20_000)
+    assert not res.exact
+    assert res.p_value == pytest.approx(stats.spearmanr(x, y).pvalue, abs=0.01)
+
+
+def test_permutation_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(ep, 'PERMUTATION_CACHE_BYTES', 4 * 1024 ** 2)
+    ep._PERMUTATION_CACHE.clear()
+    rng = np.random.default_rng(3)
+    for n in range(100, 140):
+        ep.permutation_test('t-test', rng.normal(size=n), np.arange(n) % 2)
+        assert sum(v.nbytes for v in ep._PERMUTATION_CACHE.values()) <= 4 * 1024 ** 2
+    ep._PERMUTATION_CACHE.clear()
@@ -0,0 +1,78 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture(scope='module')
+def listing(bmw_raw):
+    return bmw_raw.head(3000).copy()
+
+
+def test_line_means_match_groupby(listing):
+    (agg,) = ep.relationship_aggregates(listing, 'year', ['engineSize'], kind='line')
+    table = agg.table.set_index(['group', 'x']).sort_index()
+    expected = listing.groupby(['engineSize', 'year'])['engineSize'].agg(['mean', 'count'])
+    np.testing.assert_allclose(table['mean'], expected['mean'])
+    np.testing.assert_array_equal(table['count'], expected['count'])
+    assert (table['lower'] <= table['mean']).all() and (table['mean'] <= table['upper']).all()
+    assert agg.n_rows == len(listing)
+
+
+def test_box_quartiles_match_groupby(listing):
+    (agg,) = ep.relationship_aggregates(listing, 'transmission', ['price'], kind='box')
+    table = agg.table.set_index('level')
+    expected = listing.groupby('transmission')['price'].quantile([0.25, 0.5, 0.75]).unstack()
+    np.testing.assert_allclose(table[['q1', 'med', 'q3']].to_numpy(), expected.to_numpy())
+    np.testing.assert_array_equal(table['count'], listing['transmission'].value_counts().sort_index())
+    assert (table['whislo'] >= table['q1'] - 1.5 * (table['q3'] - table['q1'])).all()
+
+
+def test_count_matches_value_counts(listing):
+    (agg,) = ep.relationship_aggregates(listing, None, ['fuelType'], kind='count')
+    counts = agg.table.set_index('group')['count']
+    pd.testing.assert_series_equal(counts.sort_index(), listing['fuelType'].value_counts().sort_index(),
+                                   check_names=False, check_index_type=False)
+
+
+def test_unknown_kind_raises(listing):
+    with pytest.raises(ValueError):
+        ep.relationship_aggregates(listing, 'year', ['price'], kind='pie')
+
+
+def test_numeric_histogram_matches_numpy(listing):
+    (agg,) = ep.distribution_aggregates(listing, ['price'], plot_type='numeric', kde=True)
+    counts, edges = np.histogram(listing['price'].to_numpy(dtype=np.float64), bins='auto')
+    np.testing.assert_array_equal(agg.table['count'], counts)
+    np.testing.assert_allclose(agg.table['left'], edges[:-1])
+    np.testing.assert_allclose(agg.table['right'], edges[1:])
+    assert agg.curve is not None and len(agg.curve[0]) == len(agg.curve[1])
+
+
+def test_weighted_histogram(listing):
+    weights = np.full(len(listing), 2.5)
+    (agg,) = ep.distribution_aggregates(listing, ['mileage'], plot_type='numeric', weights=weights)
+    assert agg.table['count'].sum() == pytest.approx(2.5 * len(listing))
+
+
+def test_categorical_counts(listing):
+    (agg,) = ep.distribution_aggregates(listing, ['transmission'])
+    assert agg.kind == 'count'
+    assert dict(zip(agg.table['group'], agg.table['count'])) == listing['transmission'].value_counts().to_dict()
+
+
+def test_render_plot_files_writes_files(listing, tmp_path):
+    figures = {
+        'relasi': ep.relationship_aggregates(listing, 'year', ['engineSize'], kind='line'),
+        'distribusi': ep.distribution_aggregates(listing, ['price', 'mileage'], plot_type='numeric'),
+    }
+    # Agregat harus bisa di-pickle agar bisa dikirim ke process pool
+    pickle.loads(pickle.dumps(figures))
+    out_dir = str(tmp_path / 'plots')
+    paths = ep.render_plot_files(figures, out_dir, fmt='svg', n_cols=2)
+    assert paths == [os.path.join(out_dir, 'relasi.svg'), os.path.join(out_dir, 'distribusi.svg')]
+    assert all(os.path.getsize(path) > 0 for path in paths)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import eda_package as ep
+
+
+@pytest.fixture
+def listing(bmw_raw):
+    df = bmw_raw.copy()
+    df.loc[df.index[::30], 'fuelType'] = np.nan
+    df.loc[df.index[::45], 'model'] = np.nan
+    return df
+
+
+def test_nan_keys_form_their_own_stratum(listing):
+    sample = ep.stratified_sample(listing, 2000)
+    assert sample.population.sum() == len(listing)
+    assert sample.data['fuelType'].isna().any()
+    assert (sample.sampled <= sample.population).all()
+
+
+def test_full_sample_means_equal_groupby(listing):
+    sample = ep.stratified_sample(listing, len(listing))
+    result = ep.sample_means(sample, ['price'], by='fuelType').set_index('fuelType')
+    expected = listing.groupby('fuelType', dropna=False)['price'].agg(['mean', 'size'])
+    np.testing.assert_allclose(result['mean'].to_numpy(), expected['mean'].to_numpy())
+    np.testing.assert_array_equal(result['n_population'].to_numpy(), expected['size'].to_numpy())
+    assert (result['std_error'] == 0).all()
+
+
+def test_sample_mean_interval_covers_population_mean(listing):
+    sample = ep.stratified_sample(listing, 2000)
+    result = ep.sample_means(sample, ['price', 'mileage'])
+    truth = listing[['price', 'mileage']].mean().to_numpy()
+    assert ((result['lower'] <= truth) & (truth <= result['upper'])).all()
+    assert (result['n_population'] == len(listing)).all()
+
+
+def test_correlation_analysis_approx_with_nan_keys(listing):
+    result = ep.correlation_analysis(listing, approx=3000, headless=True)
+    assert result.population_size == len(listing)
+    assert result.sample_size < len(listing)
+    lower, upper = result.bounds['spearman']
+    full = listing.select_dtypes('number').corr('spearman')
+    inside = ((lower.to_numpy() <= full.to_numpy() + 1e-12) & (full.to_numpy() <= upper.to_numpy() + 1e-12))
+    assert inside.mean() > 0.8
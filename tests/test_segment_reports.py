@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+import segment_reports as sr
+
+
+def _value(x):
+    return x
+
+
+def _add(a, b):
+    return a + b
+
+
+def _boom():
+    raise RuntimeError('gagal')
+
+
+def _graph():
+    return [
+        sr.Task('a', _value, (1,)),
+        sr.Task('b', _value, (2,)),
+        sr.Task('sum', lambda a, b: a + b, deps=['a', 'b'], local=True),
+        sr.Task('bad', _boom),
+        sr.Task('child', _value, (3,), deps=['bad']),
+        sr.Task('grandchild', lambda child, sum: child + sum, deps=['child', 'sum'], local=True),
+    ]
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_failure_propagates_to_dependents(n_jobs):
+    results, failures = sr.run_task_graph(_graph(), n_jobs=n_jobs, max_pending=1)
+    assert results == {'a': 1, 'b': 2, 'sum': 3}
+    assert failures['bad'] == 'RuntimeError: gagal'
+    assert failures['child'] == "dependency 'bad' failed"
+    assert failures['grandchild'] == "dependency 'child' failed"
+
+
+def test_invalid_graph_raises():
+    with pytest.raises(ValueError):
+        sr.run_task_graph([sr.Task('a', _value, (1,)), sr.Task('a', _value, (2,))], n_jobs=1)
+    with pytest.raises(ValueError):
+        sr.run_task_graph([sr.Task('a', _add, deps=['x'])], n_jobs=1)
+
+
+@pytest.fixture(scope='module')
+def run(bmw_raw, tmp_path_factory):
+    df = bmw_raw[bmw_raw['model'].isin(['1 Series', 'X3', 'i3'])]
+    out_dir = str(tmp_path_factory.mktemp('reports'))
+    return df, sr.generate_reports(df, out_dir, n_jobs=1, min_rows=20)
+
+
+def test_generate_reports_writes_every_segment(run):
+    df, result = run
+    sizes = df.groupby(['model', 'fuelType']).size()
+    expected = {key for key, size in sizes.items() if size >= 20}
+    assert len(expected) >= 3
+    assert {(row.model, row.fuelType) for row in result.segments.itertuples()} == expected
+    assert result.failures == {}
+    for slug, path in result.reports.items():
+        assert os.path.exists(os.path.join(result.out_dir, path))
+        with open(os.path.join(result.out_dir, f'{slug}.json')) as f:
+            report = json.load(f)
+        assert report['n_rows'] == sizes[(report['segment']['model'], report['segment']['fuelType'])]
+        assert {'describe', 'outliers', 'correlation', 'figures'} <= set(report)
+        assert all(os.path.exists(os.path.join(result.out_dir, fig)) for fig in report['figures'])
+
+
+def test_index_lists_reports(run):
+    _, result = run
+    with open(os.path.join(result.out_dir, 'index.json')) as f:
+        index = json.load(f)
+    assert [row['slug'] for row in index['segments']] == list(result.segments['slug'])
+    assert os.path.exists(os.path.join(result.out_dir, 'index.html'))
+
+
+def test_unknown_analysis_raises(bmw_raw, tmp_path):
+    with pytest.raises(ValueError):
+        sr.generate_reports(bmw_raw.head(100), str(tmp_path), analyses=('describe', 'plot'))
+
+
+def test_colliding_slugs_get_distinct_reports(bmw_raw, tmp_path):
+    df = bmw_raw[bmw_raw['model'] == '1 Series'].head(40).copy()
+    df.loc[df.index[20:], 'model'] = '1_Series'
+    result = sr.generate_reports(df, str(tmp_path), by=('model',), analyses=('describe',), n_jobs=1)
+    slugs = list(result.segments['slug'])
+    assert len(set(slugs)) == 2 and slugs[0] == '1_Series'
+    for slug in slugs:
+        with open(os.path.join(result.out_dir, f'{slug}.json')) as f:
+            assert json.load(f)['n_rows'] == 20
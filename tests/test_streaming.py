@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+import eda_package as ep
+
+
+def test_chunked_describe_matches_pandas(bmw_raw):
+    chunks = [bmw_raw.iloc[start:start + 2500] for start in range(0, len(bmw_raw), 2500)]
+    result = ep.stream_statistics(chunks).describe()
+    numeric = bmw_raw.select_dtypes(include='number')
+    assert list(result.index) == list(numeric.columns)
+    np.testing.assert_array_equal(result['count'].to_numpy(), numeric.count().to_numpy())
+    for stat, expected in [('mean', numeric.mean()), ('std', numeric.std()), ('skew', numeric.skew()),
+                           ('kurtosis', numeric.kurt()), ('min', numeric.min()), ('max', numeric.max())]:
+        np.testing.assert_allclose(result[stat].to_numpy(), expected.to_numpy(), rtol=1e-9, err_msg=stat)
+
+
+def test_quantiles_exact_for_discrete_columns(bmw_raw):
+    # year, tax dan engineSize punya sedikit nilai unik: sketch tetap exact
+    acc = ep.stream_statistics([bmw_raw.iloc[:5000], bmw_raw.iloc[5000:]])
+    for col in ['year', 'tax', 'engineSize']:
+        assert acc.sketches[col].exact
+        np.testing.assert_allclose(acc.sketches[col].quantile([0.1, 0.25, 0.5, 0.75, 0.9]),
+                                   bmw_raw[col].quantile([0.1, 0.25, 0.5, 0.75, 0.9]).to_numpy())
+        assert acc.sketches[col].mode() == bmw_raw[col].mode().iloc[0]
+
+
+def test_category_counts_match_value_counts(bmw_raw):
+    acc = ep.stream_statistics([bmw_raw.iloc[:4000], bmw_raw.iloc[4000:]])
+    expected = bmw_raw['model'].value_counts()
+    result = acc.value_counts('model')
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_names=False,
+                                   check_index_type=False)